@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: EvaluationSystem persistence overhead.
+
+Measures the per-task cost of record_task_result() as the number of
+agents and the recorded history grow, with write-through saves
+(save_delay=None, one snapshot rewrite per task) and coalesced saves
+(save_delay set, one write per burst).
+
+Usage:
+    python benchmarks/bench_evaluation_persistence.py [--agents 10 100 1000] [--history 0 20000]
+"""
+
+from pathlib import Path
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from macds.core.evaluation import EvaluationSystem, ScoreCategory
+
+
+def populate(evaluation: EvaluationSystem, agents: int, history: int, rng: random.Random) -> None:
+    """Create agents and pre-existing score history without timing it."""
+    for i in range(agents):
+        evaluation.get_scorecard(f"agent-{i}")
+    for _ in range(history):
+        card = evaluation.get_scorecard(f"agent-{rng.randrange(agents)}")
+        evaluation._add_score(card, rng.choice(list(ScoreCategory)), rng.random() * 100)
+    evaluation.flush()
+
+
+def measure(agents: int, history: int, tasks: int, save_delay) -> dict:
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as td:
+        evaluation = EvaluationSystem(storage_path=Path(td), save_delay=save_delay)
+        populate(evaluation, agents, history, rng)
+
+        start = time.perf_counter()
+        for _ in range(tasks):
+            evaluation.record_task_result(
+                agent_name=f"agent-{rng.randrange(agents)}",
+                success=rng.random() > 0.2,
+                scores={
+                    ScoreCategory.CORRECTNESS: rng.random() * 100,
+                    ScoreCategory.EFFICIENCY: rng.random() * 100
+                }
+            )
+        elapsed = time.perf_counter() - start
+
+        flush_start = time.perf_counter()
+        evaluation.flush()
+        flush_s = time.perf_counter() - flush_start
+
+    return {"per_task_us": elapsed / tasks * 1e6, "final_flush_ms": flush_s * 1000}
+
+
+def run(agent_counts: list[int], histories: list[int], tasks: int, save_delay: float) -> list[dict]:
+    rows = []
+    for agents in agent_counts:
+        for history in histories:
+            row = {"agents": agents, "history": history, "tasks": tasks}
+            for mode, delay in (("write_through", None), ("coalesced", save_delay)):
+                result = measure(agents, history, tasks, delay)
+                row[f"{mode}_per_task_us"] = result["per_task_us"]
+                row[f"{mode}_final_flush_ms"] = result["final_flush_ms"]
+            rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--agents", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--history", type=int, nargs="+", default=[0, 20_000])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--save-delay", type=float, default=60.0,
+                        help="Coalescing delay (longer than the run, so one write happens at flush)")
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = run(args.agents, args.history, args.tasks, args.save_delay)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    for row in rows:
+        print(
+            f"{row['agents']:>5} agents {row['history']:>7,} scores  "
+            f"write-through {row['write_through_per_task_us']:9.1f} us/task  "
+            f"coalesced {row['coalesced_per_task_us']:7.1f} us/task "
+            f"(+{row['coalesced_final_flush_ms']:.1f} ms flush)"
+        )
+
+
+if __name__ == "__main__":
+    main()
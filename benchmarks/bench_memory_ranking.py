@@ -0,0 +1,115 @@
+"""
+Micro-benchmark: memory strength ranking.
+
+Compares the per-entry ranking previously used by MemoryStore.retrieve()
+(get_current_strength() while filtering, again in the sort key, then a
+full sort) with StrengthColumns.top_k() in NumPy and pure-Python mode.
+
+Usage:
+    python benchmarks/bench_memory_ranking.py [--sizes 10000 100000 1000000] [--limit 100]
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import json
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from macds.core.memory import MemoryEntry, MemoryScope, DecayPolicy, DECAY_RATES
+from macds.core.memory_scoring import StrengthColumns, np
+
+
+def make_entries(count: int, seed: int = 7) -> list[MemoryEntry]:
+    rng = random.Random(seed)
+    policies = list(DecayPolicy)
+    now = datetime.now()
+    entries = []
+    for i in range(count):
+        entries.append(MemoryEntry(
+            id=f"e{i}",
+            content=None,
+            scope=MemoryScope.PROJECT,
+            source="bench",
+            confidence=rng.random(),
+            decay_policy=rng.choice(policies),
+            last_accessed=now - timedelta(seconds=rng.random() * 7 * 86400),
+            access_count=rng.randint(0, 20)
+        ))
+    return entries
+
+
+def legacy_rank(entries: list[MemoryEntry], limit: int, min_strength: float) -> list[str]:
+    results = [e for e in entries if e.get_current_strength() >= min_strength]
+    results.sort(key=lambda e: e.get_current_strength(), reverse=True)
+    return [e.id for e in results[:limit]]
+
+
+def build_columns(entries: list[MemoryEntry], use_numpy: bool) -> StrengthColumns:
+    columns = StrengthColumns(use_numpy=use_numpy)
+    for e in entries:
+        columns.set(
+            e.id,
+            last_accessed=e.last_accessed.timestamp(),
+            half_life=DECAY_RATES[e.decay_policy],
+            confidence=e.confidence,
+            access_count=e.access_count
+        )
+    return columns
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: list[int], limit: int, min_strength: float, repeat: int) -> list[dict]:
+    rows = []
+    for size in sizes:
+        entries = make_entries(size)
+        row = {"entries": size, "limit": limit}
+        row["legacy_s"] = best_of(lambda: legacy_rank(entries, limit, min_strength), repeat)
+
+        modes = [("python", False)] + ([("numpy", True)] if np is not None else [])
+        for mode, use_numpy in modes:
+            columns = build_columns(entries, use_numpy)
+            row[f"{mode}_s"] = best_of(
+                lambda: columns.top_k(None, limit, min_strength), repeat
+            )
+            row[f"{mode}_speedup"] = row["legacy_s"] / row[f"{mode}_s"]
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--min-strength", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Emit JSON instead of a table")
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.limit, args.min_strength, args.repeat)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    for row in rows:
+        line = f"{row['entries']:>9,} entries  legacy {row['legacy_s'] * 1000:9.1f} ms"
+        line += f"  python {row['python_s'] * 1000:8.1f} ms ({row['python_speedup']:5.1f}x)"
+        if "numpy_s" in row:
+            line += f"  numpy {row['numpy_s'] * 1000:7.1f} ms ({row['numpy_speedup']:5.1f}x)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
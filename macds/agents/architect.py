@@ -68,7 +68,7 @@ Never output unstructured text outside the contract schema."""
         )
         
         # Build architecture components from requirements
-        components = self._design_components(input_data.requirements)
+        components = await self.run_cpu_bound(self._design_components, input_data.requirements)
         invariants = self._define_invariants(components)
         decisions = self._make_design_decisions(input_data)
         api_contracts = self._define_api_contracts(components)
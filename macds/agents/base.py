@@ -15,6 +15,7 @@ from macds.core.contracts import (
 )
 from macds.core.memory import MemoryStore, AgentMemory, MemoryScope
 from macds.core.evaluation import EvaluationSystem, ScoreCategory
+from macds.core import tracing
 
 
 @dataclass
@@ -27,6 +28,10 @@ class AgentConfig:
     max_tokens: int = 4096
     requires_approval_above: int = 0  # Authority threshold for auto-approval
     owned_artifacts: list[str] = field(default_factory=list)
+    execution_mode: str = "inline"  # inline, process (CPU-bound helpers run in a worker pool)
+
+
+EXECUTION_MODES = ("inline", "process")
 
 
 T_Input = TypeVar("T_Input", bound=ContractInput)
@@ -49,6 +54,7 @@ class BaseAgent(ABC, Generic[T_Input, T_Output]):
     authority_level: int = 1
     description: str = "Base agent"
     owned_artifacts: list[str] = []
+    execution_mode: str = "inline"
     
     def __init__(
         self,
@@ -60,8 +66,14 @@ class BaseAgent(ABC, Generic[T_Input, T_Output]):
         self.config = config or AgentConfig(
             name=self.name,
             authority_level=self.authority_level,
-            owned_artifacts=self.owned_artifacts
+            owned_artifacts=self.owned_artifacts,
+            execution_mode=self.execution_mode
         )
+        if self.config.execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution mode: {self.config.execution_mode} "
+                f"(expected one of {', '.join(EXECUTION_MODES)})"
+            )
         
         self._memory_store = memory_store or MemoryStore()
         self._memory = AgentMemory(self.config.name, self._memory_store)
@@ -72,6 +84,15 @@ class BaseAgent(ABC, Generic[T_Input, T_Output]):
         self._current_task_id: Optional[str] = None
         self._task_start_time: Optional[datetime] = None
     
+    def __getstate__(self) -> dict:
+        # Pickled when a bound helper is sent to the process pool; memory
+        # and evaluation stay with the parent process.
+        state = self.__dict__.copy()
+        state["_memory_store"] = None
+        state["_memory"] = None
+        state["_evaluation"] = None
+        return state
+    
     @property
     def memory(self) -> AgentMemory:
         """Get agent's memory interface."""
@@ -123,44 +144,64 @@ class BaseAgent(ABC, Generic[T_Input, T_Output]):
         
         Validates contracts before and after execution.
         """
-        self._current_task_id = input_data.request_id
-        self._task_start_time = datetime.now()
-        
-        # Validate input
-        input_violations = self.validate_input(input_data)
-        if any(v.severity == "error" for v in input_violations):
-            raise ContractViolationError(
-                f"Input contract violation: {[v.message for v in input_violations]}"
-            )
-        
-        # Store task in working memory
-        self._memory.remember(
-            content={"task_id": input_data.request_id, "input_type": type(input_data).__name__},
-            scope=MemoryScope.WORKING,
-            tags=["task", "current"]
-        )
-        
-        try:
-            # Execute the actual work
-            self._log(f"Executing task {input_data.request_id}")
-            output = await self._execute_impl(input_data)
+        with tracing.span("agent.execute", agent=self.config.name, request_id=input_data.request_id):
+            self._current_task_id = input_data.request_id
+            self._task_start_time = datetime.now()
             
-            # Validate output
-            output_violations = self.validate_output(output)
-            if any(v.severity == "error" for v in output_violations):
-                self._record_failure("output_validation_failed")
+            # Validate input
+            with tracing.span("contract.validate", direction="input"):
+                input_violations = self.validate_input(input_data)
+            if any(v.severity == "error" for v in input_violations):
                 raise ContractViolationError(
-                    f"Output contract violation: {[v.message for v in output_violations]}"
+                    f"Input contract violation: {[v.message for v in input_violations]}"
                 )
             
-            # Record success
-            self._record_success()
-            
-            return output
+            # Store task in working memory
+            self._memory.remember(
+                content={"task_id": input_data.request_id, "input_type": type(input_data).__name__},
+                scope=MemoryScope.WORKING,
+                tags=["task", "current"]
+            )
             
-        except Exception as e:
-            self._record_failure(str(e))
-            raise
+            try:
+                # Execute the actual work
+                self._log(f"Executing task {input_data.request_id}")
+                output = await self._execute_impl(input_data)
+                
+                # Validate output
+                with tracing.span("contract.validate", direction="output"):
+                    output_violations = self.validate_output(output)
+                if any(v.severity == "error" for v in output_violations):
+                    self._record_failure("output_validation_failed")
+                    raise ContractViolationError(
+                        f"Output contract violation: {[v.message for v in output_violations]}"
+                    )
+                
+                # Record success
+                self._record_success()
+                
+                return output
+                
+            except Exception as e:
+                self._record_failure(str(e))
+                raise
+    
+    async def run_cpu_bound(self, fn, *args, **kwargs):
+        """
+        Run a CPU-heavy helper according to the agent's execution mode.
+        
+        Inline mode calls fn directly. Process mode runs it in the shared
+        process pool so the event loop stays free; fn (a bound method of
+        this agent is fine), its arguments and its result must be picklable,
+        and fn must not use memory or evaluation.
+        """
+        if self.config.execution_mode != "process":
+            return fn(*args, **kwargs)
+        
+        from macds.execution.pool import run_in_process
+        
+        with tracing.span("agent.offload", agent=self.config.name, function=fn.__name__):
+            return await run_in_process(fn, *args, **kwargs)
     
     @abstractmethod
     async def _execute_impl(self, input_data: T_Input) -> T_Output:
@@ -245,8 +286,13 @@ class BaseAgent(ABC, Generic[T_Input, T_Output]):
         scope: Optional[MemoryScope] = None,
         limit: int = 10
     ) -> list[dict]:
-        """Recall memories relevant to a query."""
-        entries = self._memory.store.search(query, scope=scope, limit=limit)
+        """
+        Recall memories relevant to a query.
+        
+        Ranked by semantic relevance x current strength when the memory
+        store has a semantic index, otherwise by keyword match.
+        """
+        entries = self._memory.store.semantic_search(query, scope=scope, limit=limit)
         return [e.to_dict() for e in entries]
     
     def get_scorecard(self) -> dict:
@@ -1,13 +1,14 @@
 from typing import Optional
 from datetime import datetime
-import subprocess
 import asyncio
+import sys
 
 from macds.agents.base import BaseAgent, AgentConfig, AgentRegistry
 from macds.core.contracts import (
     BuildTestInput, BuildTestOutput, Violation
 )
 from macds.core.memory import MemoryScope
+from macds.execution.process import run_command
 
 
 class BuildTestAgent(BaseAgent[BuildTestInput, BuildTestOutput]):
@@ -196,18 +197,19 @@ Provide detailed metrics and logs."""
     async def run_quick_check(self, file_path: str) -> dict:
         """Quick syntax check on a single file."""
         try:
-            # Check Python syntax
-            result = subprocess.run(
-                ["python", "-m", "py_compile", file_path],
-                capture_output=True,
-                text=True,
+            # Check Python syntax (killed if the stage is cancelled)
+            result = await run_command(
+                [sys.executable, "-m", "py_compile", file_path],
                 timeout=10
             )
+            valid = result.returncode == 0 and not result.timed_out
             return {
                 "file": file_path,
-                "valid": result.returncode == 0,
-                "error": result.stderr if result.returncode != 0 else None
+                "valid": valid,
+                "error": None if valid else (result.stderr or "Syntax check timed out")
             }
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             return {
                 "file": file_path,
@@ -88,7 +88,8 @@ Report all file changes via the contract schema."""
                 files_modified.append(modification)
         else:
             # Create new files
-            new_files = self._generate_new_files(
+            new_files = await self.run_cpu_bound(
+                self._generate_new_files,
                 input_data.task_description,
                 input_data.architecture,
                 input_data.api_contract
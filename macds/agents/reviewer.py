@@ -61,34 +61,12 @@ Verdict must be: pass, fail, needs_revision, or escalate."""
     async def _execute_impl(self, input_data: CodeReviewInput) -> CodeReviewOutput:
         """Perform code review."""
         
-        violations = []
-        security_concerns = []
-        suggested_patches = []
-        quality_score = 100.0
-        
-        # Analyze the diff
-        diff_analysis = self._analyze_diff(input_data.code_diff)
-        
-        # Check coding standards
-        standard_violations = self._check_standards(
-            input_data.code_diff,
-            input_data.coding_standards
-        )
-        violations.extend(standard_violations)
-        quality_score -= len(standard_violations) * 5
-        
-        # Check architecture constraints
-        constraint_violations = self._check_constraints(
-            input_data.code_diff,
-            input_data.architecture_constraints
+        # Line-by-line scanning is the CPU-heavy part; in process mode it
+        # runs in the worker pool
+        violations, security_concerns, quality_score = await self.run_cpu_bound(
+            self._review_diff, input_data
         )
-        violations.extend(constraint_violations)
-        quality_score -= len(constraint_violations) * 10
-        
-        # Security analysis
-        security_issues = self._analyze_security(input_data.code_diff)
-        security_concerns.extend(security_issues)
-        quality_score -= len(security_issues) * 15
+        suggested_patches = []
         
         # Generate suggested fixes
         for violation in violations:
@@ -130,17 +108,32 @@ Verdict must be: pass, fail, needs_revision, or escalate."""
             comments=self._generate_summary(violations, security_concerns, verdict)
         )
     
-    def _analyze_diff(self, diff: str) -> dict:
-        """Analyze diff structure."""
-        lines = diff.split('\n')
-        additions = sum(1 for l in lines if l.startswith('+') and not l.startswith('+++'))
-        deletions = sum(1 for l in lines if l.startswith('-') and not l.startswith('---'))
+    def _review_diff(self, input_data: CodeReviewInput) -> tuple[list[Violation], list[str], float]:
+        """Scan the diff: violations, security concerns and quality score."""
+        violations = []
+        quality_score = 100.0
+        
+        # Check coding standards
+        standard_violations = self._check_standards(
+            input_data.code_diff,
+            input_data.coding_standards
+        )
+        violations.extend(standard_violations)
+        quality_score -= len(standard_violations) * 5
+        
+        # Check architecture constraints
+        constraint_violations = self._check_constraints(
+            input_data.code_diff,
+            input_data.architecture_constraints
+        )
+        violations.extend(constraint_violations)
+        quality_score -= len(constraint_violations) * 10
+        
+        # Security analysis
+        security_concerns = self._analyze_security(input_data.code_diff)
+        quality_score -= len(security_concerns) * 15
         
-        return {
-            "additions": additions,
-            "deletions": deletions,
-            "total_changes": additions + deletions
-        }
+        return violations, security_concerns, quality_score
     
     def _check_standards(self, diff: str, standards: str) -> list[Violation]:
         """Check code against standards."""
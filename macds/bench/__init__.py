@@ -0,0 +1,25 @@
+"""
+Orchestration benchmarks for MACDS.
+
+Runs generated workflow DAGs with stub agents (fixed latency, CPU burn,
+output size) through a real Orchestrator, so the numbers isolate
+scheduling overhead from LLM, build and artifact I/O. Used by
+``macds bench``.
+"""
+
+from macds.bench.agents import BenchAgent, StubAgentSpec
+from macds.bench.dags import SHAPES, build_workflow, critical_path_length
+from macds.bench.runner import BenchmarkConfig, percentile, run_benchmark, run_suite
+
+
+__all__ = [
+    "BenchAgent",
+    "StubAgentSpec",
+    "SHAPES",
+    "build_workflow",
+    "critical_path_length",
+    "BenchmarkConfig",
+    "percentile",
+    "run_benchmark",
+    "run_suite",
+]
@@ -0,0 +1,53 @@
+"""Stub agents for orchestration benchmarks."""
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+import asyncio
+import time
+
+from macds.core.contracts import Verdict
+
+
+@dataclass
+class StubAgentSpec:
+    """Cost model of a stub agent."""
+    latency_ms: float = 10.0  # Awaited (I/O-like: other stages keep running)
+    cpu_ms: float = 0.0  # Busy loop on the event loop thread (blocks other stages)
+    output_bytes: int = 1024  # Size of the generated file content
+
+
+class BenchAgent:
+    """
+    Agent stand-in with a fixed cost and a canned output.
+
+    The output carries every attribute the orchestrator reads when
+    preparing downstream inputs, so any stage can be served by a
+    BenchAgent.
+    """
+
+    authority_level = 1
+
+    def __init__(self, name: str, spec: StubAgentSpec):
+        self.name = name
+        self.spec = spec
+        self.calls = 0
+        self._output = SimpleNamespace(
+            requirements=[{"id": "R1", "description": "benchmark"}],
+            constraints=[],
+            components=[{"name": "bench", "responsibility": "benchmark"}],
+            invariants=[],
+            api_contracts=[],
+            files_created=[{"path": "bench.py", "content": "x" * spec.output_bytes}],
+            verdict=Verdict.PASS,
+            build_success=True
+        )
+
+    async def execute(self, input_data) -> SimpleNamespace:
+        self.calls += 1
+        if self.spec.cpu_ms:
+            deadline = time.perf_counter() + self.spec.cpu_ms / 1000
+            while time.perf_counter() < deadline:
+                pass
+        if self.spec.latency_ms:
+            await asyncio.sleep(self.spec.latency_ms / 1000)
+        return self._output
@@ -0,0 +1,56 @@
+"""
+Generated workflow shapes.
+
+Workflows are keyed by WorkflowStage, so a DAG has at most one node per
+stage (seven). Shapes:
+
+- chain: stages one after another (``size`` stages, up to 7)
+- fanout: requirements -> ``size`` parallel stages (up to 5) -> final approval
+- diamond: two stacked diamonds, requirements -> 2 -> review -> 2 -> final approval
+"""
+
+from macds.core.orchestrator import WorkflowStage as S
+
+
+_ORDER = list(S)
+_MIDDLE = _ORDER[1:-1]
+
+SHAPES = ("chain", "fanout", "diamond")
+
+
+def agent_name(stage: S) -> str:
+    """Name of the bench agent serving a stage."""
+    return f"bench-{stage.value}"
+
+
+def build_workflow(shape: str, size: int = 0) -> list:
+    """Workflow definition [(stage, agent, deps)] for a named shape."""
+    if shape == "chain":
+        stages = _ORDER[:size or len(_ORDER)]
+        edges = [(stage, [stages[i - 1]] if i else []) for i, stage in enumerate(stages)]
+    elif shape == "fanout":
+        middle = _MIDDLE[:size or len(_MIDDLE)]
+        edges = [(S.REQUIREMENTS, [])]
+        edges += [(stage, [S.REQUIREMENTS]) for stage in middle]
+        edges.append((S.FINAL_APPROVAL, list(middle)))
+    elif shape == "diamond":
+        edges = [
+            (S.REQUIREMENTS, []),
+            (S.ARCHITECTURE, [S.REQUIREMENTS]),
+            (S.IMPLEMENTATION, [S.REQUIREMENTS]),
+            (S.REVIEW, [S.ARCHITECTURE, S.IMPLEMENTATION]),
+            (S.BUILD_TEST, [S.REVIEW]),
+            (S.INTEGRATION, [S.REVIEW]),
+            (S.FINAL_APPROVAL, [S.BUILD_TEST, S.INTEGRATION])
+        ]
+    else:
+        raise ValueError(f"Unknown shape: {shape} (expected one of {', '.join(SHAPES)})")
+    return [(stage, agent_name(stage), deps) for stage, deps in edges]
+
+
+def critical_path_length(workflow: list) -> int:
+    """Number of stages on the longest dependency path."""
+    depth: dict = {}
+    for stage, _, deps in workflow:
+        depth[stage] = 1 + max((depth[d] for d in deps), default=0)
+    return max(depth.values(), default=0)
@@ -0,0 +1,137 @@
+"""Benchmark runner: throughput, latency percentiles and scheduling overhead."""
+
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import asyncio
+import math
+import platform
+import tempfile
+import time
+
+from macds.bench.agents import BenchAgent, StubAgentSpec
+from macds.bench.dags import build_workflow, critical_path_length
+
+
+@dataclass
+class BenchmarkConfig:
+    """One benchmark scenario."""
+    shape: str = "chain"
+    size: int = 0  # Stages in a chain / parallel width of a fan-out (0 = maximum)
+    workflows: int = 50
+    concurrency: int = 4  # Workflows in flight at once
+    latency_ms: float = 10.0
+    cpu_ms: float = 0.0
+    output_bytes: int = 1024
+    max_parallelism: int = 4
+    max_workers: int = 8
+    warmup: int = 3
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values, default=0.0)
+    }
+
+
+async def run_benchmark(config: BenchmarkConfig, work_dir: Optional[Path] = None) -> dict:
+    """
+    Run one scenario and return its metrics.
+
+    Latency is the wall time of each run_workflow call. Overhead is
+    latency minus the ideal time, i.e. the critical path times each
+    stage's configured cost; it covers scheduling, input preparation
+    and the orchestrator's own bookkeeping (including its memory write).
+    """
+    from macds.core.artifacts import ArtifactStore
+    from macds.core.evaluation import EvaluationSystem
+    from macds.core.memory import MemoryStore
+    from macds.core.orchestrator import Orchestrator
+    from macds.core.scheduler import StageScheduler
+
+    workflow = build_workflow(config.shape, config.size)
+    spec = StubAgentSpec(config.latency_ms, config.cpu_ms, config.output_bytes)
+    ideal_ms = critical_path_length(workflow) * (config.latency_ms + config.cpu_ms)
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as td:
+        root = Path(td)
+        orchestrator = Orchestrator(
+            memory_store=MemoryStore(root / "memory"),
+            evaluation=EvaluationSystem(root / "evaluation", save_delay=60.0),
+            artifact_store=ArtifactStore(root),
+            max_parallelism=config.max_parallelism,
+            scheduler=StageScheduler(max_workers=config.max_workers)
+        )
+        for _, name, _ in workflow:
+            orchestrator.register_agent(BenchAgent(name, spec))
+
+        for _ in range(config.warmup):
+            await orchestrator.run_workflow("benchmark", workflow=workflow)
+
+        latencies: list[float] = []
+        failures = 0
+        gate = asyncio.Semaphore(max(1, config.concurrency))
+
+        async def one() -> None:
+            nonlocal failures
+            async with gate:
+                start = time.perf_counter()
+                result = await orchestrator.run_workflow("benchmark", workflow=workflow)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not result.success:
+                    failures += 1
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(config.workflows)))
+        wall = time.perf_counter() - wall_start
+
+        queue = orchestrator.get_queue_status()
+        orchestrator.memory_store.close()
+
+    overheads = [latency - ideal_ms for latency in latencies]
+    return {
+        "config": asdict(config),
+        "stages": len(workflow),
+        "critical_path_stages": critical_path_length(workflow),
+        "ideal_latency_ms": ideal_ms,
+        "wall_seconds": wall,
+        "throughput_wps": config.workflows / wall if wall else 0.0,
+        "latency_ms": _summary(latencies),
+        "overhead_ms": _summary(overheads),
+        "overhead_per_stage_ms": _summary(overheads)["p50"] / len(workflow),
+        "scheduler_avg_wait_ms": queue["avg_wait_seconds"] * 1000,
+        "failures": failures
+    }
+
+
+def run_suite(configs: list[BenchmarkConfig], work_dir: Optional[Path] = None) -> dict:
+    """Run scenarios in order and wrap the results with environment metadata."""
+    try:
+        from importlib.metadata import version
+        macds_version = version("macds")
+    except Exception:
+        macds_version = "unknown"
+
+    results = [asyncio.run(run_benchmark(config, work_dir)) for config in configs]
+    return {
+        "benchmark": "orchestration",
+        "timestamp": datetime.now().isoformat(),
+        "macds_version": macds_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
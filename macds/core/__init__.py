@@ -26,8 +26,17 @@ from macds.core.memory import (
     MemoryScope,
     DecayPolicy,
     AgentMemory,
+    MemoryBudget,
 )
 
+from macds.core.memory_backends import (
+    MemoryBackend,
+    JSONMemoryBackend,
+    SQLiteMemoryBackend,
+)
+
+from macds.core.memory_semantic import SemanticIndex
+
 from macds.core.artifacts import (
     ArtifactStore,
     Artifact,
@@ -53,6 +62,34 @@ from macds.core.orchestrator import (
     TaskStatus,
 )
 
+from macds.core.scheduler import (
+    StageScheduler,
+    Priority,
+)
+
+from macds.core.stage_cache import StageCache
+from macds.core.checkpoint import CheckpointStore, WorkflowCheckpoint
+from macds.core.retention import WorkflowRetention, WorkflowArchive
+from macds.core.work_queue import WorkQueue, Job, JobFailedError
+from macds.core.queue_worker import QueueWorker, start_workers
+
+from macds.core.tracing import (
+    Span,
+    Tracer,
+    InMemoryExporter,
+    JSONLinesExporter,
+    ChromeTraceExporter,
+    get_tracer,
+    set_tracer,
+)
+
+from macds.core.events import (
+    EventType,
+    WorkflowEvent,
+    EventBus,
+    EventChannel,
+)
+
 from macds.core.schema_loader import (
     SchemaLoader,
     ValidationResult,
@@ -87,6 +124,11 @@ __all__ = [
     "MemoryScope",
     "DecayPolicy",
     "AgentMemory",
+    "MemoryBudget",
+    "MemoryBackend",
+    "JSONMemoryBackend",
+    "SQLiteMemoryBackend",
+    "SemanticIndex",
     # Artifacts
     "ArtifactStore",
     "Artifact",
@@ -106,6 +148,32 @@ __all__ = [
     "WorkflowTask",
     "WorkflowResult",
     "TaskStatus",
+    "StageScheduler",
+    "Priority",
+    "StageCache",
+    "CheckpointStore",
+    "WorkflowCheckpoint",
+    "WorkflowRetention",
+    "WorkflowArchive",
+    # Work queue
+    "WorkQueue",
+    "Job",
+    "JobFailedError",
+    "QueueWorker",
+    "start_workers",
+    # Tracing
+    "Span",
+    "Tracer",
+    "InMemoryExporter",
+    "JSONLinesExporter",
+    "ChromeTraceExporter",
+    "get_tracer",
+    "set_tracer",
+    # Events
+    "EventType",
+    "WorkflowEvent",
+    "EventBus",
+    "EventChannel",
     # Schema Loader
     "SchemaLoader",
     "ValidationResult",
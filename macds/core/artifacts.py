@@ -7,6 +7,8 @@ import json
 import subprocess
 import shutil
 
+from macds.core import events
+
 
 class ArtifactType(str, Enum):
     """Types of artifacts in the system."""
@@ -253,6 +255,10 @@ class ArtifactStore:
         self._artifacts[name] = artifact
         self._save_metadata()
         
+        events.emit(
+            events.EventType.ARTIFACT_WRITTEN,
+            artifact=name, version=version.version_id, author=created_by, created=True
+        )
         return artifact
     
     def update(
@@ -304,6 +310,11 @@ class ArtifactStore:
             version.commit_sha = commit_sha
         
         self._save_metadata()
+        
+        events.emit(
+            events.EventType.ARTIFACT_WRITTEN,
+            artifact=name, version=version.version_id, author=updated_by, created=False
+        )
         return artifact
     
     def read(self, name: str) -> Optional[str]:
@@ -0,0 +1,129 @@
+"""
+Workflow checkpoints for MACDS.
+
+The orchestrator saves a checkpoint when a workflow starts and after
+every completed stage: the workflow definition, task states, stage
+outputs and the shared context. If the process dies, a new Orchestrator
+pointed at the same directory can resume the workflow without re-running
+completed stages. Finished workflows keep their checkpoint (so they can
+be revised) until more than max_finished of them exist.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import os
+import pickle
+import tempfile
+import threading
+
+
+@dataclass
+class WorkflowCheckpoint:
+    """Everything needed to continue a workflow."""
+    workflow_id: str
+    user_request: str
+    workflow_def: list  # [(stage, agent_name, [dependency stages])]
+    tasks: dict  # WorkflowStage -> WorkflowTask
+    context: dict
+    outputs: dict  # WorkflowStage -> ContractOutput
+    completed_stages: list
+    failed_stages: list = field(default_factory=list)
+    max_parallelism: int = 4
+    elapsed_seconds: float = 0.0  # Run time before this checkpoint's session
+    finished: bool = False
+
+
+class CheckpointStore:
+    """
+    One pickled checkpoint file per workflow.
+
+    Writes go to a temp file that replaces the previous checkpoint, so a
+    crash mid-write leaves the last complete checkpoint in place. Finished
+    checkpoints use their own suffix, so listing unfinished workflows does
+    not read any file; only the max_finished most recently saved are kept
+    (None keeps all).
+    """
+
+    SUFFIX = ".ckpt"
+    FINISHED_SUFFIX = ".done"
+
+    def __init__(self, checkpoint_dir: Optional[Path] = None, max_finished: Optional[int] = 100):
+        if max_finished is not None and max_finished < 0:
+            raise ValueError("max_finished must not be negative")
+        self.checkpoint_dir = Path(checkpoint_dir or Path.cwd() / ".macds" / "checkpoints")
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.max_finished = max_finished
+        self._lock = threading.Lock()
+
+    def _path(self, workflow_id: str, finished: bool = False) -> Path:
+        suffix = self.FINISHED_SUFFIX if finished else self.SUFFIX
+        return self.checkpoint_dir / f"{workflow_id}{suffix}"
+
+    @staticmethod
+    def _unlink(path: Path) -> bool:
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def save(self, checkpoint: WorkflowCheckpoint) -> None:
+        """Atomically write a checkpoint."""
+        data = pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            fd, tmp = tempfile.mkstemp(dir=self.checkpoint_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self._path(checkpoint.workflow_id, checkpoint.finished))
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            self._unlink(self._path(checkpoint.workflow_id, not checkpoint.finished))
+        if checkpoint.finished:
+            self.prune()
+
+    def load(self, workflow_id: str) -> Optional[WorkflowCheckpoint]:
+        """Read a workflow's checkpoint, or None if there is none."""
+        with self._lock:
+            for finished in (False, True):
+                try:
+                    with open(self._path(workflow_id, finished), "rb") as f:
+                        return pickle.load(f)
+                except FileNotFoundError:
+                    continue
+        return None
+
+    def delete(self, workflow_id: str) -> bool:
+        """Remove a workflow's checkpoint."""
+        with self._lock:
+            removed = [self._unlink(self._path(workflow_id, finished)) for finished in (False, True)]
+        return any(removed)
+
+    def list_workflows(self, include_finished: bool = False) -> list[str]:
+        """IDs of checkpointed workflows (unfinished only by default)."""
+        suffixes = [self.SUFFIX] + ([self.FINISHED_SUFFIX] if include_finished else [])
+        return sorted(
+            path.stem for suffix in suffixes for path in self.checkpoint_dir.glob(f"*{suffix}")
+        )
+
+    def prune(self) -> int:
+        """Delete the oldest finished checkpoints beyond max_finished. Returns the count."""
+        if self.max_finished is None:
+            return 0
+        with self._lock:
+            finished = []
+            for path in self.checkpoint_dir.glob(f"*{self.FINISHED_SUFFIX}"):
+                try:
+                    finished.append((path.stat().st_mtime_ns, path))
+                except FileNotFoundError:
+                    continue
+            finished.sort()
+            excess = finished[:max(0, len(finished) - self.max_finished)]
+            return sum(self._unlink(path) for _, path in excess)
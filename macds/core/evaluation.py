@@ -1,9 +1,17 @@
 from dataclasses import dataclass, field
 from typing import Optional
 from enum import Enum
-from datetime import datetime, timedelta
+from collections import deque
+from datetime import datetime
+import atexit
 import json
+import os
 from pathlib import Path
+import threading
+import weakref
+
+
+RECENT_SCORES = 100  # Score entries kept in memory per agent and category
 
 
 class ScoreCategory(str, Enum):
@@ -32,43 +40,81 @@ class ScoreEntry:
             "task_id": self.task_id,
             "notes": self.notes
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScoreEntry":
+        return cls(
+            category=ScoreCategory(data["category"]),
+            score=data["score"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            task_id=data.get("task_id"),
+            notes=data.get("notes", "")
+        )
 
 
 @dataclass
 class AgentScorecard:
-    """Scorecard tracking an agent's performance."""
+    """
+    Scorecard tracking an agent's performance.
+    
+    Averages come from per-category daily aggregates (``buckets``:
+    category -> day ordinal -> [sum, count]), so a window costs one lookup
+    per day, not one per score. ``scores`` only keeps the latest
+    RECENT_SCORES entries per category; the full history is in the score
+    log.
+    """
     agent_name: str
-    scores: dict[str, list[ScoreEntry]] = field(default_factory=dict)
+    scores: dict[str, deque[ScoreEntry]] = field(default_factory=dict)
+    buckets: dict[str, dict[int, list[float]]] = field(default_factory=dict)
     total_tasks: int = 0
     successful_tasks: int = 0
     failed_tasks: int = 0
     escalations: int = 0
     autonomy_level: float = 1.0  # 0.0=no autonomy, 1.0=full
     
-    def add_score(self, category: ScoreCategory, score: float, task_id: str = None, notes: str = "") -> None:
+    def add_score(self, category: ScoreCategory, score: float, task_id: str = None, notes: str = "") -> ScoreEntry:
         """Add a score entry."""
-        if category.value not in self.scores:
-            self.scores[category.value] = []
-        
-        self.scores[category.value].append(ScoreEntry(
+        entry = ScoreEntry(
             category=category,
             score=score,
             task_id=task_id,
             notes=notes
-        ))
+        )
+        self.add_entry(entry)
+        return entry
+    
+    def add_entry(self, entry: ScoreEntry) -> None:
+        """Add an existing score entry (e.g. replayed from the score log)."""
+        category = entry.category.value
+        self.scores.setdefault(category, deque(maxlen=RECENT_SCORES)).append(entry)
+        
+        bucket = self.buckets.setdefault(category, {}).setdefault(
+            entry.timestamp.toordinal(), [0.0, 0]
+        )
+        bucket[0] += entry.score
+        bucket[1] += 1
     
     def get_average(self, category: ScoreCategory, days: int = 30) -> float:
-        """Get average score for a category over recent days."""
-        if category.value not in self.scores:
+        """
+        Get average score for a category over recent days.
+        
+        The window covers the last ``days`` calendar days, today included.
+        """
+        buckets = self.buckets.get(category.value)
+        if not buckets:
             return 50.0  # Default neutral score
         
-        cutoff = datetime.now() - timedelta(days=days)
-        recent = [s for s in self.scores[category.value] if s.timestamp > cutoff]
+        first_day = datetime.now().toordinal() - days + 1
+        if len(buckets) <= days:
+            recent = [b for day, b in buckets.items() if day >= first_day]
+        else:
+            recent = [buckets[day] for day in range(first_day, first_day + days) if day in buckets]
         
-        if not recent:
+        count = sum(b[1] for b in recent)
+        if not count:
             return 50.0
         
-        return sum(s.score for s in recent) / len(recent)
+        return sum(b[0] for b in recent) / count
     
     def get_overall_score(self) -> float:
         """Get weighted overall score."""
@@ -148,18 +194,44 @@ class EvaluationSystem:
     - Performance history
     - Autonomy adjustment
     - Contract strictness adjustment
+    
+    Storage:
+    - ``scores.jsonl``: append-only log of every score recorded through
+      this class, one JSON object per line.
+    - ``scorecards.json``: snapshot of counters, autonomy levels, daily
+      aggregates and recent scores, plus the log size it covers; replaced
+      atomically (temp file + rename). On startup only log lines written
+      after the snapshot are replayed.
+    
+    Persistence: with ``save_delay=None`` every record_* call writes
+    through. With a delay, the first change schedules a save that many
+    seconds later and further changes until then are coalesced into it,
+    so a burst of results costs one log append and one snapshot. flush()
+    writes immediately; close() and interpreter exit flush pending
+    changes.
     """
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    SCORE_LOG_FILE = "scores.jsonl"
+    SCORECARDS_FILE = "scorecards.json"
+    
+    def __init__(self, storage_path: Optional[Path] = None, save_delay: Optional[float] = None):
         self.storage_path = storage_path or Path(".macds/evaluation")
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.save_delay = save_delay
         
         self._scorecards: dict[str, AgentScorecard] = {}
+        self._pending_scores: list[str] = []  # Log lines not yet appended
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._log_offset = 0  # Bytes of the score log reflected in memory
         self._load()
+        _open_systems.add(self)
     
     def _load(self) -> None:
         """Load scorecards from disk."""
-        scores_file = self.storage_path / "scorecards.json"
+        scores_file = self.storage_path / self.SCORECARDS_FILE
+        history = {}
         if scores_file.exists():
             try:
                 with open(scores_file) as f:
@@ -173,28 +245,140 @@ class EvaluationSystem:
                             escalations=card_data.get("escalations", 0),
                             autonomy_level=card_data.get("autonomy_level", 1.0)
                         )
+                    history = data.get("history", {})
+                    self._log_offset = data.get("score_log_offset", 0)
             except Exception:
                 pass
+        
+        log_file = self.storage_path / self.SCORE_LOG_FILE
+        log_size = log_file.stat().st_size if log_file.exists() else 0
+        if self._log_offset > log_size:
+            self._log_offset = 0  # The log was replaced; rebuild from it
+        elif self._log_offset:
+            self._restore_history(history)
+        
+        self._replay_score_log()
+    
+    def _restore_history(self, history: dict) -> None:
+        """Restore aggregates and recent scores from the snapshot."""
+        for name, card_history in history.items():
+            card = self.get_scorecard(name)
+            for category, buckets in card_history.get("buckets", {}).items():
+                card.buckets[category] = {int(day): list(b) for day, b in buckets.items()}
+            for category, entries in card_history.get("recent", {}).items():
+                card.scores[category] = deque(
+                    (ScoreEntry.from_dict(e) for e in entries), maxlen=RECENT_SCORES
+                )
+    
+    def _replay_score_log(self) -> None:
+        """Apply score log lines written after the snapshot."""
+        log_file = self.storage_path / self.SCORE_LOG_FILE
+        if not log_file.exists():
+            return
+        
+        with open(log_file, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                try:
+                    data = json.loads(line)
+                    entry = ScoreEntry.from_dict(data)
+                except Exception:
+                    continue  # Torn or corrupt line
+                self.get_scorecard(data["agent"]).add_entry(entry)
+            self._log_offset = f.tell()
+    
+    def _add_score(
+        self,
+        scorecard: AgentScorecard,
+        category: ScoreCategory,
+        score: float,
+        task_id: Optional[str] = None
+    ) -> None:
+        """Add a score to a scorecard and queue it for the score log."""
+        entry = scorecard.add_score(category, score, task_id)
+        self._pending_scores.append(
+            json.dumps({"agent": scorecard.agent_name, **entry.to_dict()})
+        )
+    
+    def _append_score_log(self) -> None:
+        """Append queued scores to the score log."""
+        if not self._pending_scores:
+            return
+        lines, self._pending_scores = self._pending_scores, []
+        data = ("\n".join(lines) + "\n").encode()
+        with open(self.storage_path / self.SCORE_LOG_FILE, "a+b") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data  # Don't glue onto a line torn by a crash
+            f.write(data)
+            self._log_offset = f.tell()
     
     def _save(self) -> None:
-        """Save scorecards to disk."""
-        scores_file = self.storage_path / "scorecards.json"
-        data = {
-            "version": "1.0",
-            "saved_at": datetime.now().isoformat(),
-            "scorecards": {
-                name: card.to_dict()
-                for name, card in self._scorecards.items()
+        """Save scorecards now, or schedule a coalesced save."""
+        if self.save_delay is None:
+            self.flush()
+            return
+        
+        with self._lock:
+            self._dirty = True
+            _open_systems.add(self)  # Re-arm the exit flush after close()
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def flush(self) -> None:
+        """Write pending scores and the scorecard snapshot to disk."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._append_score_log()
+            
+            data = {
+                "version": "1.0",
+                "saved_at": datetime.now().isoformat(),
+                "scorecards": {
+                    name: card.to_dict()
+                    for name, card in self._scorecards.items()
+                },
+                "history": {
+                    name: {
+                        "buckets": card.buckets,
+                        "recent": {
+                            category: [e.to_dict() for e in entries]
+                            for category, entries in card.scores.items()
+                        }
+                    }
+                    for name, card in self._scorecards.items()
+                },
+                "score_log_offset": self._log_offset
             }
-        }
-        with open(scores_file, "w") as f:
-            json.dump(data, f, indent=2)
+            scores_file = self.storage_path / self.SCORECARDS_FILE
+            tmp_file = scores_file.with_name(scores_file.name + ".tmp")
+            with open(tmp_file, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, scores_file)
+            self._dirty = False
+    
+    def close(self) -> None:
+        """Persist pending changes."""
+        with self._lock:
+            _open_systems.discard(self)
+            if self._dirty or self._pending_scores:
+                self.flush()
+            elif self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
     
     def get_scorecard(self, agent_name: str) -> AgentScorecard:
         """Get or create scorecard for an agent."""
-        if agent_name not in self._scorecards:
-            self._scorecards[agent_name] = AgentScorecard(agent_name=agent_name)
-        return self._scorecards[agent_name]
+        with self._lock:
+            if agent_name not in self._scorecards:
+                self._scorecards[agent_name] = AgentScorecard(agent_name=agent_name)
+            return self._scorecards[agent_name]
     
     def record_task_result(
         self,
@@ -204,18 +388,19 @@ class EvaluationSystem:
         task_id: Optional[str] = None
     ) -> None:
         """Record the result of a task execution."""
-        scorecard = self.get_scorecard(agent_name)
-        
-        if success:
-            scorecard.record_success()
-        else:
-            scorecard.record_failure()
-        
-        for category, score in scores.items():
-            scorecard.add_score(category, score, task_id)
-        
-        scorecard.adjust_autonomy()
-        self._save()
+        with self._lock:
+            scorecard = self.get_scorecard(agent_name)
+            
+            if success:
+                scorecard.record_success()
+            else:
+                scorecard.record_failure()
+            
+            for category, score in scores.items():
+                self._add_score(scorecard, category, score, task_id)
+            
+            scorecard.adjust_autonomy()
+            self._save()
     
     def record_build_result(
         self,
@@ -226,26 +411,27 @@ class EvaluationSystem:
         test_failed: int
     ) -> None:
         """Record build/test results."""
-        scorecard = self.get_scorecard(agent_name)
-        
-        # Calculate scores from build results
-        correctness = 100.0 if build_success else 0.0
-        if test_passed + test_failed > 0:
-            correctness = (correctness + (test_passed / (test_passed + test_failed)) * 100) / 2
-        
-        scorecard.add_score(ScoreCategory.CORRECTNESS, correctness)
-        
-        # Coverage contributes to compliance
-        if test_coverage >= 0:
-            scorecard.add_score(ScoreCategory.COMPLIANCE, min(100, test_coverage))
-        
-        if build_success and test_failed == 0:
-            scorecard.record_success()
-        else:
-            scorecard.record_failure()
-        
-        scorecard.adjust_autonomy()
-        self._save()
+        with self._lock:
+            scorecard = self.get_scorecard(agent_name)
+            
+            # Calculate scores from build results
+            correctness = 100.0 if build_success else 0.0
+            if test_passed + test_failed > 0:
+                correctness = (correctness + (test_passed / (test_passed + test_failed)) * 100) / 2
+            
+            self._add_score(scorecard, ScoreCategory.CORRECTNESS, correctness)
+            
+            # Coverage contributes to compliance
+            if test_coverage >= 0:
+                self._add_score(scorecard, ScoreCategory.COMPLIANCE, min(100, test_coverage))
+            
+            if build_success and test_failed == 0:
+                scorecard.record_success()
+            else:
+                scorecard.record_failure()
+            
+            scorecard.adjust_autonomy()
+            self._save()
     
     def record_review_result(
         self,
@@ -255,16 +441,17 @@ class EvaluationSystem:
         severity_score: float
     ) -> None:
         """Record code review results."""
-        # Score the implementation agent
-        impl_scorecard = self.get_scorecard(reviewed_agent)
-        compliance_score = max(0, 100 - (violations * 10) - severity_score)
-        impl_scorecard.add_score(ScoreCategory.COMPLIANCE, compliance_score)
-        
-        # Score the reviewer for doing their job
-        reviewer_scorecard = self.get_scorecard(reviewer_name)
-        reviewer_scorecard.add_score(ScoreCategory.CORRECTNESS, 100.0)  # Completed review
-        
-        self._save()
+        with self._lock:
+            # Score the implementation agent
+            impl_scorecard = self.get_scorecard(reviewed_agent)
+            compliance_score = max(0, 100 - (violations * 10) - severity_score)
+            self._add_score(impl_scorecard, ScoreCategory.COMPLIANCE, compliance_score)
+            
+            # Score the reviewer for doing their job
+            reviewer_scorecard = self.get_scorecard(reviewer_name)
+            self._add_score(reviewer_scorecard, ScoreCategory.CORRECTNESS, 100.0)  # Completed review
+            
+            self._save()
     
     def get_recommendations(self, agent_name: str) -> list[str]:
         """Get improvement recommendations for an agent."""
@@ -306,6 +493,20 @@ class EvaluationSystem:
         return sorted(scores, key=lambda x: x[1], reverse=True)
 
 
+# Systems that may hold unsaved changes; one exit hook serves them all
+_open_systems: "weakref.WeakSet[EvaluationSystem]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """Persist pending evaluation changes at interpreter exit."""
+    for evaluation in list(_open_systems):
+        try:
+            evaluation.close()
+        except Exception:
+            pass
+
+
 # ==================== Execution Feedback Integration ====================
 
 @dataclass
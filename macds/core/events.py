@@ -0,0 +1,217 @@
+"""
+Workflow progress events for MACDS.
+
+While a workflow runs, the orchestrator publishes typed events (stage
+started/completed/failed, retry scheduled, escalation raised, artifact
+written) to that workflow's EventBus. Each subscriber reads them from a
+bounded EventChannel. A full channel applies backpressure: the
+orchestrator waits for the consumer before launching more stages, so a
+slow reader cannot make events pile up without bound.
+
+Like tracing spans, the bus is found through a contextvar. Code running
+inside a workflow (agents, the artifact store) calls emit() without a
+reference to the orchestrator, and emit() is a no-op outside a workflow.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterator, Optional
+import asyncio
+
+
+class EventType(str, Enum):
+    """Kinds of workflow events."""
+    WORKFLOW_STARTED = "workflow_started"
+    STAGE_STARTED = "stage_started"
+    STAGE_COMPLETED = "stage_completed"
+    STAGE_FAILED = "stage_failed"
+    RETRY_SCHEDULED = "retry_scheduled"
+    ESCALATION_RAISED = "escalation_raised"
+    ARTIFACT_WRITTEN = "artifact_written"
+    WORKFLOW_FINISHED = "workflow_finished"
+
+
+@dataclass
+class WorkflowEvent:
+    """One progress event of a workflow."""
+    type: EventType
+    workflow_id: str
+    stage: Optional[str] = None
+    data: dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
+    result: Any = None  # WorkflowResult, on WORKFLOW_FINISHED
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type.value,
+            "workflow_id": self.workflow_id,
+            "stage": self.stage,
+            "data": self.data,
+            "timestamp": self.timestamp.isoformat()
+        }
+
+
+class EventChannel:
+    """
+    Bounded queue of events for one subscriber.
+
+    put() waits while maxsize events are buffered. put_nowait(), used by
+    synchronous emitters, never blocks; it can take the buffer past
+    maxsize, and the next put() then waits until the consumer catches up.
+    Iterating ends once the channel is closed and drained.
+    """
+
+    def __init__(self, maxsize: int = 100):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.closed = False
+        self._items: deque[WorkflowEvent] = deque()
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def put(self, event: WorkflowEvent) -> None:
+        while len(self._items) >= self.maxsize and not self.closed:
+            self._writable.clear()
+            await self._writable.wait()
+        self.put_nowait(event)
+
+    def put_nowait(self, event: WorkflowEvent) -> None:
+        if self.closed:
+            return
+        self._items.append(event)
+        self._readable.set()
+
+    async def get(self) -> Optional[WorkflowEvent]:
+        """Next event, or None once the channel is closed and empty."""
+        while not self._items:
+            if self.closed:
+                return None
+            self._readable.clear()
+            await self._readable.wait()
+        event = self._items.popleft()
+        if len(self._items) < self.maxsize:
+            self._writable.set()
+        return event
+
+    def close(self) -> None:
+        """Stop accepting events; buffered ones can still be read."""
+        self.closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def __aiter__(self) -> "EventChannel":
+        return self
+
+    async def __anext__(self) -> WorkflowEvent:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class EventBus:
+    """Fans out one workflow's events to its subscribers."""
+
+    def __init__(self, workflow_id: str):
+        self.workflow_id = workflow_id
+        self._channels: list[EventChannel] = []
+
+    def subscribe(self, maxsize: int = 100) -> EventChannel:
+        channel = EventChannel(maxsize)
+        self._channels.append(channel)
+        return channel
+
+    def unsubscribe(self, channel: EventChannel) -> None:
+        channel.close()
+        if channel in self._channels:
+            self._channels.remove(channel)
+
+    def _event(self, event_type: EventType, stage: Optional[str], result: Any, data: dict) -> WorkflowEvent:
+        return WorkflowEvent(
+            type=event_type, workflow_id=self.workflow_id, stage=stage, data=data, result=result
+        )
+
+    async def publish(
+        self,
+        event_type: EventType,
+        stage: Optional[str] = None,
+        result: Any = None,
+        **data: Any
+    ) -> None:
+        """Deliver an event, waiting for room in every subscriber's channel."""
+        if not self._channels:
+            return
+        event = self._event(event_type, stage, result, data)
+        for channel in list(self._channels):
+            await channel.put(event)
+
+    def publish_nowait(
+        self,
+        event_type: EventType,
+        stage: Optional[str] = None,
+        **data: Any
+    ) -> None:
+        """Deliver an event without waiting (for synchronous callers)."""
+        if not self._channels:
+            return
+        event = self._event(event_type, stage, None, data)
+        for channel in list(self._channels):
+            channel.put_nowait(event)
+
+    def close(self) -> None:
+        for channel in self._channels:
+            channel.close()
+        self._channels.clear()
+
+
+@dataclass
+class _Scope:
+    bus: EventBus
+    stage: Optional[str] = None
+
+
+_current_scope: ContextVar[Optional[_Scope]] = ContextVar("macds_event_scope", default=None)
+
+
+@contextmanager
+def scope(bus: EventBus, stage: Optional[str] = None) -> Iterator[None]:
+    """Route emit()/publish() in the enclosed block (and tasks it creates) to bus."""
+    token = _current_scope.set(_Scope(bus, stage))
+    try:
+        yield
+    finally:
+        _current_scope.reset(token)
+
+
+@contextmanager
+def stage_scope(stage: str) -> Iterator[None]:
+    """Attribute events emitted in the enclosed block to a stage."""
+    current = _current_scope.get()
+    if current is None:
+        yield
+        return
+    with scope(current.bus, stage):
+        yield
+
+
+def emit(event_type: EventType, stage: Optional[str] = None, **data: Any) -> None:
+    """Publish an event to the current workflow without waiting (no-op outside one)."""
+    current = _current_scope.get()
+    if current is not None:
+        current.bus.publish_nowait(event_type, stage=stage or current.stage, **data)
+
+
+async def publish(event_type: EventType, stage: Optional[str] = None, **data: Any) -> None:
+    """Publish an event to the current workflow with backpressure (no-op outside one)."""
+    current = _current_scope.get()
+    if current is not None:
+        await current.bus.publish(event_type, stage=stage or current.stage, **data)
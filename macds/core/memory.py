@@ -6,12 +6,25 @@ Memory scopes: Working, Project, Skill, Failure
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 from enum import Enum
 from datetime import datetime, timedelta
+import atexit
+import heapq
 import json
 from pathlib import Path
 import hashlib
+import sys
+import threading
+import time
+import weakref
+
+from macds.core.memory_backends import MemoryBackend, create_backend
+from macds.core.memory_consolidation import Consolidator, merge_entries
+from macds.core.memory_index import FieldIndex, InvertedIndex
+from macds.core.memory_scoring import ExpiryQueue, StrengthColumns, projected_expiry
+from macds.core.memory_semantic import SEMANTIC_AVAILABLE, SemanticIndex
+from macds.core.tracing import traced
 
 
 class MemoryScope(str, Enum):
@@ -48,28 +61,264 @@ SCOPE_DECAY_DEFAULTS = {
     MemoryScope.FAILURE: DecayPolicy.MEDIUM
 }
 
+# Retention weight per scope for budget eviction (higher = kept longer)
+SCOPE_PRIORITY = {
+    MemoryScope.WORKING: 1.0,
+    MemoryScope.FAILURE: 2.0,
+    MemoryScope.PROJECT: 4.0,
+    MemoryScope.SKILL: 4.0
+}
+
+# Approximate fixed per-entry overhead (metadata, indexes) in bytes
+ENTRY_OVERHEAD_BYTES = 256
+
 
 @dataclass
+class MemoryBudget:
+    """
+    Caps on memory growth.
+    
+    Per-scope caps bound each scope on its own; the optional totals bound
+    the whole store, which is where scope priority decides who goes first.
+    A missing or None cap is unbounded. Sizes are approximate (serialized
+    content plus a fixed per-entry overhead).
+    """
+    max_entries: dict[MemoryScope, Optional[int]] = field(default_factory=lambda: {
+        MemoryScope.WORKING: 2_000,
+        MemoryScope.FAILURE: 10_000,
+        MemoryScope.PROJECT: 50_000,
+        MemoryScope.SKILL: 50_000
+    })
+    max_bytes: dict[MemoryScope, Optional[int]] = field(default_factory=lambda: {
+        MemoryScope.WORKING: 8 * 1024 * 1024,
+        MemoryScope.FAILURE: 32 * 1024 * 1024,
+        MemoryScope.PROJECT: 128 * 1024 * 1024,
+        MemoryScope.SKILL: 128 * 1024 * 1024
+    })
+    total_max_entries: Optional[int] = None
+    total_max_bytes: Optional[int] = None
+    evict_fraction: float = 0.1       # Extra headroom freed per eviction pass
+    recency_half_life: float = 3600.0  # Idle time that halves the recency bonus
+    
+    @classmethod
+    def unbounded(cls) -> "MemoryBudget":
+        """A budget with no caps."""
+        return cls(max_entries={}, max_bytes={})
+    
+    def retention_score(self, scope: MemoryScope, strength: float, idle_seconds: float) -> float:
+        """Score used to pick eviction victims (lowest goes first)."""
+        recency = 0.5 ** (max(0.0, idle_seconds) / self.recency_half_life)
+        return SCOPE_PRIORITY.get(scope, 1.0) * strength * (0.5 + 0.5 * recency)
+
+
+class TagTable:
+    """
+    Interning table mapping tag strings to small integer IDs.
+    
+    Entries store tuples of tag IDs, so each distinct tag string exists
+    once per process no matter how many entries carry it.
+    """
+    
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def intern(self, tags: Iterable[str]) -> tuple[int, ...]:
+        """Tag IDs for tags (registering unseen tags)."""
+        result = []
+        for tag in tags:
+            tag_id = self._ids.get(tag)
+            if tag_id is None:
+                tag_id = len(self._names)
+                self._ids[tag] = tag_id
+                self._names.append(sys.intern(tag))
+            result.append(tag_id)
+        return tuple(result) if result else _NO_TAGS
+    
+    def names(self, tag_ids: tuple[int, ...]) -> list[str]:
+        """Tag strings for tag IDs."""
+        return [self._names[i] for i in tag_ids]
+
+
+_NO_TAGS: tuple = ()
+_TAGS = TagTable()
+_SCOPES = tuple(MemoryScope)
+_SCOPE_CODES = {scope: code for code, scope in enumerate(_SCOPES)}
+_POLICIES = tuple(DecayPolicy)
+_POLICY_CODES = {policy: code for code, policy in enumerate(_POLICIES)}
+
+
+class _RawContent:
+    """Holder for content that cannot be serialized to JSON."""
+    __slots__ = ("value",)
+    
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _encode_content(content: Any) -> Any:
+    """Serialize content to compact JSON bytes (or wrap it if not JSON-able)."""
+    try:
+        return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode()
+    except (TypeError, ValueError):
+        return _RawContent(content)
+
+
+def _to_timestamp(value: Any) -> float:
+    """Epoch seconds for a datetime, number or None (now)."""
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
 class MemoryEntry:
-    """A single memory entry with metadata."""
-    id: str
-    content: Any
-    scope: MemoryScope
-    source: str  # Agent or system that created this
-    confidence: float = 1.0  # 0.0 to 1.0
-    decay_policy: DecayPolicy = DecayPolicy.MEDIUM
-    created_at: datetime = field(default_factory=datetime.now)
-    last_accessed: datetime = field(default_factory=datetime.now)
-    access_count: int = 0
-    tags: list[str] = field(default_factory=list)
-    related_entries: list[str] = field(default_factory=list)
+    """
+    A single memory entry with metadata.
+    
+    Stored compactly: slots instead of a per-instance dict, epoch-float
+    timestamps, enum codes for scope/decay policy, interned tag IDs and
+    content kept as JSON bytes that are decoded on each access. The
+    attribute API is unchanged (``created_at``/``last_accessed`` are
+    datetimes, ``scope``/``decay_policy`` enums, ``tags`` strings), but
+    ``content``, ``tags`` and ``related_entries`` return fresh objects:
+    assign to them to change an entry, mutating the result has no effect.
+    
+    ``occurrences`` counts how many times the content was recorded,
+    including near-duplicates folded in by consolidation.
+    """
+    
+    __slots__ = (
+        "id", "source", "confidence", "access_count", "occurrences",
+        "created_at_ts", "last_accessed_ts",
+        "_scope", "_decay", "_tags", "_related", "_content"
+    )
+    
+    def __init__(
+        self,
+        id: str,
+        content: Any,
+        scope: MemoryScope,
+        source: str,  # Agent or system that created this
+        confidence: float = 1.0,  # 0.0 to 1.0
+        decay_policy: DecayPolicy = DecayPolicy.MEDIUM,
+        created_at: Optional[datetime] = None,
+        last_accessed: Optional[datetime] = None,
+        access_count: int = 0,
+        tags: Optional[list[str]] = None,
+        related_entries: Optional[list[str]] = None,
+        occurrences: int = 1
+    ):
+        self.id = id
+        self.source = sys.intern(source)
+        self.confidence = confidence
+        self.access_count = access_count
+        self.occurrences = occurrences
+        self.created_at_ts = _to_timestamp(created_at)
+        self.last_accessed_ts = (
+            self.created_at_ts if last_accessed is None and created_at is None
+            else _to_timestamp(last_accessed)
+        )
+        self._scope = _SCOPE_CODES[MemoryScope(scope)]
+        self._decay = _POLICY_CODES[DecayPolicy(decay_policy)]
+        self._tags = _TAGS.intern(tags or ())
+        self._related = tuple(related_entries) if related_entries else _NO_TAGS
+        self._content = _encode_content(content)
+    
+    @property
+    def content(self) -> Any:
+        raw = self._content
+        if isinstance(raw, _RawContent):
+            return raw.value
+        return json.loads(raw)
+    
+    @content.setter
+    def content(self, value: Any) -> None:
+        self._content = _encode_content(value)
+    
+    @property
+    def content_size(self) -> int:
+        """Serialized content size in bytes."""
+        raw = self._content
+        if isinstance(raw, _RawContent):
+            return len(json.dumps(raw.value, default=str))
+        return len(raw)
+    
+    @property
+    def scope(self) -> MemoryScope:
+        return _SCOPES[self._scope]
+    
+    @scope.setter
+    def scope(self, value: MemoryScope) -> None:
+        self._scope = _SCOPE_CODES[MemoryScope(value)]
+    
+    @property
+    def decay_policy(self) -> DecayPolicy:
+        return _POLICIES[self._decay]
+    
+    @decay_policy.setter
+    def decay_policy(self, value: DecayPolicy) -> None:
+        self._decay = _POLICY_CODES[DecayPolicy(value)]
+    
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ts)
+    
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self.created_at_ts = _to_timestamp(value)
+    
+    @property
+    def last_accessed(self) -> datetime:
+        return datetime.fromtimestamp(self.last_accessed_ts)
+    
+    @last_accessed.setter
+    def last_accessed(self, value: datetime) -> None:
+        self.last_accessed_ts = _to_timestamp(value)
+    
+    @property
+    def tags(self) -> list[str]:
+        return _TAGS.names(self._tags)
+    
+    @tags.setter
+    def tags(self, value: list[str]) -> None:
+        self._tags = _TAGS.intern(value or ())
+    
+    @property
+    def related_entries(self) -> list[str]:
+        return list(self._related)
+    
+    @related_entries.setter
+    def related_entries(self, value: list[str]) -> None:
+        self._related = tuple(value) if value else _NO_TAGS
+    
+    def _state(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MemoryEntry):
+            return NotImplemented
+        return self._state() == other._state()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (
+            f"MemoryEntry(id={self.id!r}, scope={self.scope.value!r}, "
+            f"source={self.source!r}, confidence={self.confidence!r}, "
+            f"access_count={self.access_count!r}, tags={self.tags!r})"
+        )
     
     def get_current_strength(self) -> float:
         """Calculate current memory strength based on decay."""
-        if self.decay_policy == DecayPolicy.PERMANENT:
+        if self._decay == _POLICY_CODES[DecayPolicy.PERMANENT]:
             return self.confidence
         
-        elapsed = (datetime.now() - self.last_accessed).total_seconds()
+        elapsed = time.time() - self.last_accessed_ts
         half_life = DECAY_RATES[self.decay_policy]
         decay_factor = 0.5 ** (elapsed / half_life)
         
@@ -80,7 +329,7 @@ class MemoryEntry:
     
     def access(self) -> None:
         """Record an access to this memory."""
-        self.last_accessed = datetime.now()
+        self.last_accessed_ts = time.time()
         self.access_count += 1
     
     def is_expired(self, threshold: float = 0.1) -> bool:
@@ -100,6 +349,7 @@ class MemoryEntry:
             "access_count": self.access_count,
             "tags": self.tags,
             "related_entries": self.related_entries,
+            "occurrences": self.occurrences,
             "current_strength": self.get_current_strength()
         }
     
@@ -116,7 +366,8 @@ class MemoryEntry:
             last_accessed=datetime.fromisoformat(data["last_accessed"]),
             access_count=data.get("access_count", 0),
             tags=data.get("tags", []),
-            related_entries=data.get("related_entries", [])
+            related_entries=data.get("related_entries", []),
+            occurrences=data.get("occurrences", 1)
         )
 
 
@@ -128,14 +379,137 @@ class MemoryStore:
     - Scoped memory (working, project, skill, failure)
     - Decay over time
     - Semantic search (basic)
-    - Persistence to disk
+    - Pluggable persistence (SQLite/WAL by default, legacy JSON file)
+    - Write-behind access tracking
+    - Background expiry of decayed entries
+    - Per-scope and total size budgets with scope-aware eviction
+    - Sharing one storage directory between processes (SQLite backend)
+    - Incremental consolidation of near-duplicate entries
+    
+    Durability:
+    - store(), forget() and cleanup() are write-through: the change is in
+      the backend when the call returns.
+    - Access bookkeeping from retrieve()/search() (last_accessed,
+      access_count) is buffered in memory and flushed by a background
+      thread every ``flush_interval`` seconds, or sooner once
+      ``flush_threshold`` entries are dirty. Reads never wait on disk.
+      A crash can lose at most the access updates since the last flush;
+      no entry is ever lost or resurrected by this.
+    - flush(), close() and leaving a ``with MemoryStore(...)`` block
+      persist all pending access updates. Pending updates are also
+      flushed at interpreter exit.
+    
+    Expiry: every entry's projected expiry time (when its strength will
+    cross ``expiry_threshold`` without further access) is kept in a
+    priority queue. The background thread wakes at the earlier of the next
+    flush or the next expiry and evicts due entries at O(log N) each;
+    accesses push the projected time out. Eviction counts per scope are
+    reported by get_stats().
+    
+    Budget: after each store() the entry's scope and the totals are
+    checked against ``budget`` (MemoryBudget defaults; pass
+    MemoryBudget.unbounded() to disable). When a cap is exceeded the
+    lowest-scoring entries (strength x access recency x scope priority)
+    are evicted down to ``evict_fraction`` below the cap, so eviction runs
+    once per many inserts rather than on every one.
+    
+    With ``flush_interval=None`` no thread is started: once the threshold
+    is crossed, buffered access updates are flushed by the next store(),
+    forget() or cleanup() (reads still never write), and due entries are
+    evicted inline at the start of store/retrieve/search.
+    
+    Multiple processes: with the SQLite backend several processes may open
+    the same ``storage_path``. Writes are row-level and serialized by
+    SQLite, access counts are persisted as increments, and each store
+    applies the other processes' stores/forgets from the backend's change
+    log on every maintenance round (or on sync()), without reloading the
+    table. Budgets and expiry are enforced by each process on its own
+    view; deletions propagate through the change log.
+    
+    Consolidation: consolidate() examines entries added since the previous
+    pass and merges each into an earlier entry with the same scope, source
+    and tags whose content matches once timestamps, IDs and numbers are
+    masked (exactly, or by word-bigram Jaccard >= ``consolidate_similarity``).
+    The surviving entry sums occurrences and access counts and combines
+    confidences. With ``auto_consolidate=True`` the maintenance round runs
+    a pass of up to ``consolidate_batch`` entries.
+    
+    With ``semantic=True`` (requires NumPy) a local embedding index backs
+    semantic_search(). It is saved to ``semantic_index.npz`` on close and
+    at exit; on startup only entries missing from the saved file are
+    embedded. Without NumPy, semantic_search() falls back to search().
     """
     
-    def __init__(self, storage_path: Optional[Path] = None):
+    SEMANTIC_INDEX_FILE = "semantic_index.npz"
+    
+    def __init__(
+        self,
+        storage_path: Optional[Path] = None,
+        backend: Optional[MemoryBackend] = None,
+        flush_interval: Optional[float] = 5.0,
+        flush_threshold: int = 256,
+        semantic: bool = False,
+        expiry_threshold: float = 0.1,
+        budget: Optional[MemoryBudget] = None,
+        auto_consolidate: bool = False,
+        consolidate_similarity: float = 0.85,
+        consolidate_batch: int = 1000
+    ):
         self.storage_path = storage_path or Path(".macds/memory")
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._backend = backend or create_backend(self.storage_path)
         self._entries: dict[str, MemoryEntry] = {}
+        self._text_index = InvertedIndex()
+        self._scope_index = FieldIndex()
+        self._source_index = FieldIndex()
+        self._tag_index = FieldIndex()
+        self._strengths = StrengthColumns()
+        self._semantic: Optional[SemanticIndex] = None
+        if semantic and SEMANTIC_AVAILABLE:
+            self._semantic = SemanticIndex.load(self.storage_path / self.SEMANTIC_INDEX_FILE)
+        
+        # Decay expiry
+        self.expiry_threshold = expiry_threshold
+        self._expiry = ExpiryQueue()
+        self._evictions: dict[str, int] = {}
+        
+        # Size budget
+        self.budget = budget or MemoryBudget()
+        self._sizes: dict[str, int] = {}
+        self._scope_bytes: dict[MemoryScope, int] = {}
+        self._budget_evictions: dict[str, int] = {}
+        
+        # Near-duplicate consolidation
+        self.auto_consolidate = auto_consolidate
+        self.consolidate_batch = consolidate_batch
+        self._consolidator = Consolidator(similarity=consolidate_similarity)
+        self._consolidated: dict[str, int] = {}
+        
+        # Write-behind access tracking
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._dirty: dict[str, int] = {}  # entry_id -> accesses since last flush
+        self._state_lock = threading.RLock()  # In-memory state; never held across disk I/O
+        self._write_lock = threading.RLock()  # Orders backend writes
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher: Optional[threading.Thread] = None
+        
+        # Cross-process change feed
+        self._change_seq = 0
+        self._data_version: Optional[int] = None
+        
         self._load()
+        
+        if flush_interval is not None:
+            self._flusher = threading.Thread(
+                target=_maintenance_loop,
+                args=(weakref.ref(self), self._wakeup, flush_interval),
+                name="macds-memory-maintenance",
+                daemon=True
+            )
+            self._flusher.start()
+        _open_stores.add(self)
     
     def _generate_id(self, content: Any) -> str:
         """Generate unique ID for content."""
@@ -143,30 +517,455 @@ class MemoryStore:
         return hashlib.sha256(content_str.encode()).hexdigest()[:16]
     
     def _load(self) -> None:
-        """Load memories from disk."""
-        memory_file = self.storage_path / "memories.json"
-        if memory_file.exists():
+        """Load memories from the storage backend."""
+        if self._backend.supports_change_feed:
+            # Read the feed position first so writes racing the load are replayed
+            self._data_version = self._backend.data_version()
+            self._change_seq = self._backend.latest_seq()
+        
+        expired = []
+        for entry_data in self._backend.load_all():
             try:
-                with open(memory_file) as f:
-                    data = json.load(f)
-                    for entry_data in data.get("entries", []):
-                        entry = MemoryEntry.from_dict(entry_data)
-                        if not entry.is_expired():
-                            self._entries[entry.id] = entry
+                entry = MemoryEntry.from_dict(entry_data)
             except Exception:
-                pass  # Start fresh if load fails
-    
-    def _save(self) -> None:
-        """Persist memories to disk."""
-        memory_file = self.storage_path / "memories.json"
-        data = {
-            "version": "1.0",
-            "saved_at": datetime.now().isoformat(),
-            "entries": [e.to_dict() for e in self._entries.values()]
-        }
-        with open(memory_file, "w") as f:
-            json.dump(data, f, indent=2)
+                continue  # Skip corrupt rows
+            if entry.is_expired():
+                expired.append(entry.id)
+            else:
+                self._add_entry(entry)
+        
+        if expired:
+            self._backend.delete(expired)
+        
+        if self._semantic is not None:
+            for eid in set(self._semantic.ids()) - self._entries.keys():
+                self._semantic.remove(eid)
+        
+        # Apply the budget in case it was lowered since the last run
+        for scope in MemoryScope:
+            self._enforce_budget(scope, keep="")
+    
+    def _add_entry(self, entry: MemoryEntry) -> None:
+        """Insert an entry into the in-memory map and its indexes."""
+        previous = self._entries.get(entry.id)
+        if previous is not None:
+            self._unindex(previous)
+        
+        self._entries[entry.id] = entry
+        self._text_index.add(entry.id, entry.content)
+        self._scope_index.add(entry.id, [entry.scope])
+        self._source_index.add(entry.id, [entry.source])
+        self._tag_index.add(entry.id, set(entry.tags))
+        self._strengths.set(
+            entry.id,
+            last_accessed=entry.last_accessed_ts,
+            half_life=DECAY_RATES[entry.decay_policy],
+            confidence=entry.confidence,
+            access_count=entry.access_count
+        )
+        if self._semantic is not None and entry.id not in self._semantic:
+            self._semantic.add(entry.id, entry.content)
+        self._schedule_expiry(entry)
+        self._consolidator.mark(entry.id)
+        
+        size = ENTRY_OVERHEAD_BYTES + entry.content_size
+        self._sizes[entry.id] = size
+        self._scope_bytes[entry.scope] = self._scope_bytes.get(entry.scope, 0) + size
+    
+    def _schedule_expiry(self, entry: MemoryEntry) -> None:
+        """(Re)compute an entry's projected expiry time."""
+        self._expiry.schedule(entry.id, projected_expiry(
+            last_accessed=entry.last_accessed_ts,
+            half_life=DECAY_RATES[entry.decay_policy],
+            confidence=entry.confidence,
+            access_count=entry.access_count,
+            threshold=self.expiry_threshold
+        ))
+    
+    def _unindex(self, entry: MemoryEntry) -> None:
+        """Remove an entry from all indexes."""
+        self._text_index.remove(entry.id)
+        self._scope_index.remove(entry.id, [entry.scope])
+        self._source_index.remove(entry.id, [entry.source])
+        self._tag_index.remove(entry.id, set(entry.tags))
+        self._strengths.remove(entry.id)
+        if self._semantic is not None:
+            self._semantic.remove(entry.id)
+        self._expiry.unschedule(entry.id)
+        size = self._sizes.pop(entry.id, 0)
+        self._scope_bytes[entry.scope] = self._scope_bytes.get(entry.scope, 0) - size
+    
+    def _touch(self, entries: list[MemoryEntry]) -> None:
+        """
+        Record an access on each entry.
+        
+        Updates the strength columns immediately and queues the entries
+        for the next write-behind flush; never touches disk.
+        """
+        if not entries:
+            return
+        
+        with self._state_lock:
+            for entry in entries:
+                entry.access()
+                self._strengths.touch(
+                    entry.id, entry.last_accessed_ts, entry.access_count
+                )
+                self._schedule_expiry(entry)
+            for entry in entries:
+                self._dirty[entry.id] = self._dirty.get(entry.id, 0) + 1
+            pending = len(self._dirty)
+        
+        if pending >= self.flush_threshold and self._flusher is not None:
+            self._wakeup.set()
+    
+    def _flush_if_due(self) -> None:
+        """Without a background thread, writes flush buffered accesses past the threshold."""
+        if self._flusher is None and len(self._dirty) >= self.flush_threshold:
+            self.flush()
     
+    @traced("memory.flush")
+    def flush(self) -> int:
+        """
+        Persist buffered access updates.
+        
+        Returns the number of entries written.
+        """
+        with self._write_lock:
+            with self._state_lock:
+                dirty, self._dirty = self._dirty, {}
+                rows = [
+                    dict(self._entries[eid].to_dict(), access_delta=delta)
+                    for eid, delta in dirty.items() if eid in self._entries
+                ]
+            if rows and not self._closed:
+                try:
+                    self._backend.record_access(rows)
+                except Exception:
+                    with self._state_lock:
+                        for row in rows:
+                            eid = row["id"]
+                            self._dirty[eid] = self._dirty.get(eid, 0) + row["access_delta"]
+                    raise
+            return len(rows)
+    
+    def sync(self) -> int:
+        """
+        Apply entries stored or forgotten by other processes.
+        
+        Reads only the backend's change log since the last sync (nothing
+        when ``PRAGMA data_version`` shows no foreign commit). Falls back
+        to a full reload if the log was pruned past our position.
+        Returns the number of entries added, updated or removed.
+        """
+        backend = self._backend
+        if not backend.supports_change_feed:
+            return 0
+        
+        with self._write_lock:
+            if self._closed:
+                return 0
+            version = backend.data_version()
+            if version == self._data_version:
+                return 0
+            self._data_version = version
+            
+            changes, latest, complete = backend.changes_since(self._change_seq)
+            if not complete:
+                rows = backend.load_all()
+                with self._state_lock:
+                    deleted = self._entries.keys() - {row["id"] for row in rows}
+            else:
+                last_op = {}
+                for op, eid in changes:
+                    last_op[eid] = op
+                upserted = [eid for eid, op in last_op.items() if op == "upsert"]
+                rows = backend.get_many(upserted)
+                # Upserted then deleted before we read it
+                deleted = set(last_op) - {row["id"] for row in rows}
+            
+            with self._state_lock:
+                applied = self._apply_remote(rows, deleted)
+            self._change_seq = latest
+            return applied
+    
+    def _apply_remote(self, rows: list[dict], deleted: Iterable[str]) -> int:
+        """Merge rows read from the backend into memory (caller holds the state lock)."""
+        applied = len(self._drop_entries([eid for eid in deleted if eid in self._entries]))
+        for row in rows:
+            try:
+                entry = MemoryEntry.from_dict(row)
+            except Exception:
+                continue  # Skip corrupt rows
+            
+            current = self._entries.get(entry.id)
+            if current is not None:
+                # Keep accesses made here that are not flushed yet
+                entry.access_count = max(entry.access_count, current.access_count)
+                entry.last_accessed_ts = max(entry.last_accessed_ts, current.last_accessed_ts)
+                if current == entry:
+                    continue  # Our own write, or nothing we don't already have
+            
+            if entry.is_expired(self.expiry_threshold):
+                if current is not None:
+                    self._drop_entries([entry.id])
+                    applied += 1
+                continue
+            self._add_entry(entry)
+            applied += 1
+        return applied
+    
+    def expire_due(self, now: Optional[float] = None) -> int:
+        """
+        Evict entries whose projected expiry time has passed.
+        
+        Returns the number of entries evicted.
+        """
+        with self._write_lock:
+            if self._closed:
+                return 0
+            with self._state_lock:
+                due = self._expiry.pop_due(now)
+                if not due:
+                    return 0
+                removed = self._drop_entries(due)
+                for entry in removed:
+                    scope = entry.scope.value
+                    self._evictions[scope] = self._evictions.get(scope, 0) + 1
+            self._backend.delete([e.id for e in removed])
+            return len(removed)
+    
+    def _enforce_budget(self, scope: MemoryScope, keep: str) -> None:
+        """
+        Evict entries until scope and totals fit the budget.
+        
+        Caller holds the write lock. ``keep`` (the entry just stored) is
+        never chosen.
+        """
+        budget = self.budget
+        with self._state_lock:
+            victims = self._select_victims(
+                list(self._scope_index.get(scope)),
+                budget.max_entries.get(scope),
+                budget.max_bytes.get(scope),
+                self._scope_bytes.get(scope, 0),
+                keep
+            )
+            if budget.total_max_entries is not None or budget.total_max_bytes is not None:
+                remaining = [eid for eid in self._entries if eid not in victims]
+                used = sum(self._scope_bytes.values()) - sum(self._sizes[eid] for eid in victims)
+                victims |= self._select_victims(
+                    remaining,
+                    budget.total_max_entries,
+                    budget.total_max_bytes,
+                    used,
+                    keep
+                )
+            if not victims:
+                return
+            removed = self._drop_entries(list(victims))
+            for entry in removed:
+                name = entry.scope.value
+                self._budget_evictions[name] = self._budget_evictions.get(name, 0) + 1
+        self._backend.delete([e.id for e in removed])
+    
+    def _select_victims(
+        self,
+        ids: list[str],
+        max_entries: Optional[int],
+        max_bytes: Optional[int],
+        used_bytes: int,
+        keep: str
+    ) -> set[str]:
+        """Lowest-retention entries to drop so ids fit the given caps."""
+        over_entries = max_entries is not None and len(ids) > max_entries
+        over_bytes = max_bytes is not None and used_bytes > max_bytes
+        if not (over_entries or over_bytes):
+            return set()
+        
+        # Free headroom below the cap so the next inserts don't evict again
+        headroom = 1.0 - self.budget.evict_fraction
+        target_entries = int(max_entries * headroom) if max_entries is not None else None
+        target_bytes = int(max_bytes * headroom) if max_bytes is not None else None
+        
+        now = datetime.now().timestamp()
+        strengths = self._strengths.strengths(ids, now=now)
+        idle = self._strengths.idle_seconds(ids, now=now)
+        order = sorted(
+            range(len(ids)),
+            key=lambda i: self.budget.retention_score(
+                self._entries[ids[i]].scope, strengths[i], idle[i]
+            )
+        )
+        
+        victims: set[str] = set()
+        count = len(ids)
+        for i in order:
+            fits_entries = target_entries is None or count <= target_entries
+            fits_bytes = target_bytes is None or used_bytes <= target_bytes
+            if fits_entries and fits_bytes:
+                break
+            eid = ids[i]
+            if eid == keep:
+                continue
+            victims.add(eid)
+            count -= 1
+            used_bytes -= self._sizes.get(eid, 0)
+        return victims
+    
+    def _seconds_until_next_expiry(self) -> Optional[float]:
+        """Seconds until the earliest projected expiry (None if nothing is scheduled)."""
+        with self._state_lock:
+            due = self._expiry.next_due()
+        if due is None:
+            return None
+        return max(0.0, due - datetime.now().timestamp())
+    
+    def _maybe_maintain(self) -> None:
+        """Inline sync, expiry and consolidation when no background thread is running."""
+        if self._flusher is None:
+            self.sync()
+            self.expire_due()
+            if self.auto_consolidate:
+                self.consolidate(limit=self.consolidate_batch)
+    
+    def consolidate(self, limit: Optional[int] = None) -> int:
+        """
+        Merge near-duplicates among entries added since the last pass.
+        
+        Args:
+            limit: Examine at most this many new entries (None for all)
+        
+        Returns the number of entries merged away.
+        """
+        with self._write_lock:
+            if self._closed:
+                return 0
+            with self._state_lock:
+                clusters: dict[str, list[MemoryEntry]] = {}
+                for eid in self._consolidator.take_pending(limit):
+                    entry = self._entries.get(eid)
+                    if entry is None:
+                        continue
+                    group = (entry.scope, entry.source, tuple(sorted(entry.tags)))
+                    target = self._consolidator.assign(eid, group, entry.content)
+                    if target is not None and target in self._entries:
+                        clusters.setdefault(target, []).append(entry)
+                if not clusters:
+                    return 0
+                
+                merged_ids = [e.id for members in clusters.values() for e in members]
+                removed = self._drop_entries(merged_ids)
+                rows = []
+                for target_id, members in clusters.items():
+                    target = self._entries[target_id]
+                    merge_entries(target, members)
+                    self._strengths.set(
+                        target.id,
+                        last_accessed=target.last_accessed_ts,
+                        half_life=DECAY_RATES[target.decay_policy],
+                        confidence=target.confidence,
+                        access_count=target.access_count
+                    )
+                    self._schedule_expiry(target)
+                    self._dirty.pop(target_id, None)  # Full row written below
+                    rows.append(target.to_dict())
+                for entry in removed:
+                    name = entry.scope.value
+                    self._consolidated[name] = self._consolidated.get(name, 0) + 1
+            
+            self._backend.upsert(rows)
+            self._backend.delete(merged_ids)
+            return len(removed)
+    
+    def _save_semantic_index(self) -> None:
+        """Persist the semantic index if it changed."""
+        with self._write_lock:
+            if self._semantic is not None and self._semantic.dirty and not self._closed:
+                self._semantic.save(self.storage_path / self.SEMANTIC_INDEX_FILE)
+    
+    def _drop_entries(self, entry_ids: list[str]) -> list[MemoryEntry]:
+        """Drop entries from memory and indexes (caller holds the state lock)."""
+        removed = []
+        for eid in entry_ids:
+            entry = self._entries.pop(eid, None)
+            if entry is not None:
+                self._unindex(entry)
+                self._consolidator.discard(eid)
+                removed.append(entry)
+        for eid in entry_ids:
+            self._dirty.pop(eid, None)
+        return removed
+    
+    def _remove_entries(self, entry_ids: list[str]) -> list[MemoryEntry]:
+        """Drop entries from the in-memory map, indexes and backend."""
+        with self._write_lock:
+            with self._state_lock:
+                removed = self._drop_entries(entry_ids)
+            self._backend.delete(entry_ids)
+        self._flush_if_due()
+        return removed
+    
+    def _candidates(
+        self,
+        entry_id: Optional[str] = None,
+        scope: Optional[MemoryScope] = None,
+        source: Optional[str] = None,
+        tags: Optional[list[str]] = None
+    ) -> Optional[Iterable[str]]:
+        """
+        Resolve filter criteria to candidate entry IDs using the indexes.
+        
+        Returns None when no filter applies (every entry is a candidate).
+        """
+        if entry_id:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return []
+            if scope and entry.scope != scope:
+                return []
+            if source and entry.source != source:
+                return []
+            if tags and not any(t in entry.tags for t in tags):
+                return []
+            return [entry_id]
+        
+        id_sets = []
+        if scope:
+            id_sets.append(self._scope_index.get(scope))
+        if source:
+            id_sets.append(self._source_index.get(source))
+        if tags:
+            id_sets.append(self._tag_index.get_any(tags))
+        
+        if not id_sets:
+            return None
+        
+        id_sets.sort(key=len)
+        ids = set(id_sets[0])
+        for other in id_sets[1:]:
+            ids &= other
+        return ids
+    
+    def close(self) -> None:
+        """Flush pending access updates and close the storage backend."""
+        if self._closed:
+            return
+        _open_stores.discard(self)
+        self.flush()
+        self._save_semantic_index()
+        with self._write_lock:
+            self._closed = True
+            self._wakeup.set()
+            self._backend.close()
+    
+    def __enter__(self) -> "MemoryStore":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    @traced("memory.store")
     def store(
         self,
         content: Any,
@@ -197,10 +996,25 @@ class MemoryStore:
             tags=tags or []
         )
         
-        self._entries[entry_id] = entry
-        self._save()
+        self._maybe_maintain()
+        with self._write_lock:
+            with self._state_lock:
+                previous = self._entries.get(entry_id)
+                if previous is not None:
+                    entry.occurrences = previous.occurrences + 1
+                self._add_entry(entry)
+                self._dirty.pop(entry_id, None)
+                row = entry.to_dict()
+            self._backend.upsert([row])
+            self._enforce_budget(scope, keep=entry_id)
+        
+        # A new entry may expire before the maintenance thread next wakes
+        if self._flusher is not None:
+            self._wakeup.set()
+        self._flush_if_due()
         return entry_id
     
+    @traced("memory.retrieve")
     def retrieve(
         self,
         entry_id: Optional[str] = None,
@@ -213,41 +1027,26 @@ class MemoryStore:
         """
         Retrieve memory entries matching criteria.
         
-        Results are sorted by strength (descending).
+        Candidates are resolved through the ID, scope, source and tag
+        indexes; their strengths are computed in one columnar pass and the
+        top ``limit`` are selected without a full sort. Only the returned
+        entries record an access. Results are sorted by strength
+        (descending).
         """
-        results = []
-        
-        for entry in self._entries.values():
-            # Filter by ID
-            if entry_id and entry.id != entry_id:
-                continue
-            
-            # Filter by scope
-            if scope and entry.scope != scope:
-                continue
-            
-            # Filter by source
-            if source and entry.source != source:
-                continue
-            
-            # Filter by tags
-            if tags and not any(t in entry.tags for t in tags):
-                continue
-            
-            # Filter by strength
-            if entry.get_current_strength() < min_strength:
-                continue
-            
-            # Record access
-            entry.access()
-            results.append(entry)
-        
-        # Sort by strength
-        results.sort(key=lambda e: e.get_current_strength(), reverse=True)
+        self._maybe_maintain()
+        with self._state_lock:
+            ranked = self._strengths.top_k(
+                self._candidates(entry_id, scope, source, tags),
+                k=limit,
+                min_strength=min_strength
+            )
+            results = [self._entries[eid] for eid, _ in ranked]
         
-        self._save()  # Save access updates
-        return results[:limit]
+        # Record access (persisted by the write-behind flush)
+        self._touch(results)
+        return results
     
+    @traced("memory.search")
     def search(
         self,
         query: str,
@@ -255,73 +1054,172 @@ class MemoryStore:
         limit: int = 10
     ) -> list[MemoryEntry]:
         """
-        Search memories by content (basic substring match).
+        Search memories by content using the inverted token index.
+        
+        Terms are matched as whole tokens and all must be present (AND);
+        double-quoted terms must appear adjacently (phrase). Cost depends
+        on the matching postings, not on the size of the store.
         
         For production, replace with vector similarity search.
         """
-        query_lower = query.lower()
-        results = []
-        
-        for entry in self._entries.values():
-            if scope and entry.scope != scope:
-                continue
+        self._maybe_maintain()
+        with self._state_lock:
+            matches = self._text_index.search(query)
+            if scope:
+                matches &= self._scope_index.get(scope)
             
-            if entry.is_expired():
-                continue
+            # Expired entries (strength below 0.1) are skipped
+            ranked = self._strengths.top_k(matches, k=limit, min_strength=0.1)
+            results = [self._entries[eid] for eid, _ in ranked]
+        
+        self._touch(results)
+        return results
+    
+    def semantic_search(
+        self,
+        query: str,
+        scope: Optional[MemoryScope] = None,
+        limit: int = 10,
+        min_similarity: float = 0.05
+    ) -> list[MemoryEntry]:
+        """
+        Search memories by meaning using the local semantic index.
+        
+        Results are ranked by similarity x current strength. Falls back to
+        search() when the store was created without a semantic index.
+        """
+        if self._semantic is None:
+            return self.search(query, scope=scope, limit=limit)
+        
+        self._maybe_maintain()
+        with self._state_lock:
+            candidates = self._scope_index.get(scope) if scope else None
+            hits = self._semantic.query(
+                query,
+                k=max(limit * 5, 50),
+                candidates=candidates,
+                min_similarity=min_similarity
+            )
+            strengths = self._strengths.strengths([eid for eid, _ in hits])
             
-            # Basic content matching
-            content_str = json.dumps(entry.content, default=str).lower()
-            if query_lower in content_str:
-                entry.access()
-                results.append(entry)
+            # Expired entries (strength below 0.1) are skipped
+            ranked = heapq.nlargest(
+                limit,
+                (
+                    (eid, similarity * strength)
+                    for (eid, similarity), strength in zip(hits, strengths)
+                    if strength >= 0.1
+                ),
+                key=lambda pair: pair[1]
+            )
+            results = [self._entries[eid] for eid, _ in ranked]
         
-        results.sort(key=lambda e: e.get_current_strength(), reverse=True)
-        self._save()
-        return results[:limit]
+        self._touch(results)
+        return results
     
     def forget(self, entry_id: str) -> bool:
         """Explicitly remove a memory entry."""
         if entry_id in self._entries:
-            del self._entries[entry_id]
-            self._save()
+            self._remove_entries([entry_id])
             return True
         return False
     
     def cleanup(self, threshold: float = 0.1) -> int:
         """Remove expired memories. Returns count removed."""
-        expired = [
-            eid for eid, entry in self._entries.items()
-            if entry.is_expired(threshold)
-        ]
-        for eid in expired:
-            del self._entries[eid]
+        with self._state_lock:
+            expired = [
+                eid for eid, strength in zip(self._strengths.ids(), self._strengths.strengths())
+                if strength < threshold
+            ]
+        if not expired:
+            return 0
         
-        if expired:
-            self._save()
-        return len(expired)
+        removed = self._remove_entries(expired)
+        with self._state_lock:
+            for entry in removed:
+                scope = entry.scope.value
+                self._evictions[scope] = self._evictions.get(scope, 0) + 1
+        return len(removed)
     
     def get_stats(self) -> dict:
         """Get memory store statistics."""
-        stats = {
-            "total_entries": len(self._entries),
-            "by_scope": {},
-            "by_source": {},
-            "avg_strength": 0.0
-        }
-        
-        total_strength = 0.0
-        for entry in self._entries.values():
-            scope_name = entry.scope.value
-            stats["by_scope"][scope_name] = stats["by_scope"].get(scope_name, 0) + 1
-            stats["by_source"][entry.source] = stats["by_source"].get(entry.source, 0) + 1
-            total_strength += entry.get_current_strength()
-        
-        if self._entries:
-            stats["avg_strength"] = total_strength / len(self._entries)
+        with self._state_lock:
+            stats = {
+                "total_entries": len(self._entries),
+                "by_scope": {
+                    scope.value: count
+                    for scope, count in self._scope_index.counts().items()
+                },
+                "by_source": self._source_index.counts(),
+                "avg_strength": 0.0,
+                "evictions_by_scope": dict(self._evictions),
+                "pending_expiries": len(self._expiry),
+                "bytes_by_scope": {
+                    scope.value: size
+                    for scope, size in self._scope_bytes.items()
+                    if size
+                },
+                "budget_evictions_by_scope": dict(self._budget_evictions),
+                "consolidated_by_scope": dict(self._consolidated),
+                "pending_consolidation": len(self._consolidator)
+            }
+            
+            if self._entries:
+                strengths = self._strengths.strengths()
+                stats["avg_strength"] = sum(strengths) / len(strengths)
         
         return stats
 
 
+def _maintenance_loop(
+    store_ref: "weakref.ref[MemoryStore]",
+    wakeup: threading.Event,
+    interval: float
+) -> None:
+    """
+    Background flush/sync/expiry/consolidation loop.
+    
+    Sleeps until the next flush interval or projected expiry, whichever
+    comes first. Exits once the store is closed or garbage collected.
+    """
+    timeout = interval
+    while True:
+        wakeup.wait(timeout)
+        wakeup.clear()
+        store = store_ref()
+        if store is None or store._closed:
+            return
+        try:
+            store.flush()
+            store.sync()
+            store.expire_due()
+            if store.auto_consolidate:
+                store.consolidate(limit=store.consolidate_batch)
+        except Exception:
+            pass  # Retry next round; pending updates stay in memory until then
+        
+        until_expiry = store._seconds_until_next_expiry()
+        timeout = interval if until_expiry is None else min(interval, max(0.01, until_expiry))
+        del store
+
+
+# Stores not closed yet; one exit hook serves them all
+_open_stores: "weakref.WeakSet[MemoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """Persist pending access updates at interpreter exit."""
+    for store in list(_open_stores):
+        if store._closed:
+            continue
+        try:
+            store.flush()
+            store._save_semantic_index()
+        except Exception:
+            pass
+
+
 # ==================== Agent-Specific Memory Helpers ====================
 
 class AgentMemory:
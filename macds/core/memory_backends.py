@@ -0,0 +1,380 @@
+"""
+Storage backends for the MACDS memory system.
+
+Backends persist memory entries as plain dicts (the ``MemoryEntry.to_dict``
+format) so they stay independent of the in-memory representation.
+
+Backends:
+- JSONMemoryBackend: single ``memories.json`` file, rewritten on every change
+  (single process only)
+- SQLiteMemoryBackend: embedded SQLite database in WAL mode, row-level writes,
+  safe to share between processes and exposes a change feed so each process
+  can pick up the others' writes incrementally
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+import json
+import sqlite3
+import threading
+
+
+class MemoryBackend(ABC):
+    """
+    Abstract persistence layer for MemoryStore.
+
+    Implementations receive only the rows that changed, so backends that
+    support partial writes never need to touch the full store.
+
+    Backends shared between processes set ``supports_change_feed`` and
+    implement data_version/changes_since/get_many.
+    """
+
+    supports_change_feed = False
+
+    @abstractmethod
+    def load_all(self) -> list[dict]:
+        """Load every persisted entry."""
+        pass
+
+    @abstractmethod
+    def upsert(self, entries: Iterable[dict]) -> None:
+        """Insert or replace the given entries."""
+        pass
+
+    @abstractmethod
+    def delete(self, entry_ids: Iterable[str]) -> None:
+        """Delete entries by ID."""
+        pass
+
+    def record_access(self, rows: list[dict]) -> None:
+        """
+        Persist access bookkeeping.
+        
+        Each row is a full entry dict plus ``access_delta``, the number of
+        accesses since the last flush. The default rewrites the rows.
+        """
+        self.upsert(
+            {k: v for k, v in row.items() if k != "access_delta"} for row in rows
+        )
+
+    def data_version(self) -> int:
+        """Value that changes when another process commits (change feed only)."""
+        raise NotImplementedError
+
+    def changes_since(self, seq: int) -> tuple[list[tuple[str, str]], int, bool]:
+        """
+        Changes committed after seq (change feed only).
+        
+        Returns (changes, latest_seq, complete) where changes are
+        (op, entry_id) pairs with op "upsert" or "delete". complete is
+        False when part of the range was pruned and a full reload is needed.
+        """
+        raise NotImplementedError
+
+    def get_many(self, entry_ids: Iterable[str]) -> list[dict]:
+        """Load the given entries (change feed only)."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
+
+
+class JSONMemoryBackend(MemoryBackend):
+    """
+    Legacy backend writing all entries to a single JSON file.
+
+    Every change rewrites the whole file, so write cost grows with the
+    number of entries. Kept for compatibility and debugging.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file_path = file_path
+        self._rows: dict[str, dict] = {}
+
+    def load_all(self) -> list[dict]:
+        self._rows = {}
+        if self.file_path.exists():
+            try:
+                with open(self.file_path) as f:
+                    data = json.load(f)
+                for row in data.get("entries", []):
+                    self._rows[row["id"]] = row
+            except Exception:
+                pass  # Start fresh if load fails
+        return list(self._rows.values())
+
+    def upsert(self, entries: Iterable[dict]) -> None:
+        for row in entries:
+            self._rows[row["id"]] = row
+        self._write()
+
+    def delete(self, entry_ids: Iterable[str]) -> None:
+        for eid in entry_ids:
+            self._rows.pop(eid, None)
+        self._write()
+
+    def _write(self) -> None:
+        data = {
+            "version": "1.0",
+            "saved_at": datetime.now().isoformat(),
+            "entries": list(self._rows.values())
+        }
+        with open(self.file_path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """
+    Embedded SQLite backend using write-ahead logging.
+
+    Each entry is one row, so store/forget/access updates only write the
+    rows that changed. WAL mode lets readers proceed while a write is in
+    progress, and concurrent writers from other processes wait on
+    SQLite's lock (``busy_timeout``) instead of overwriting each other.
+
+    Triggers append every insert, content change and delete to
+    ``memory_changes``; processes poll it (gated by ``PRAGMA
+    data_version``) to apply other processes' writes without reloading
+    the table. Access counters are updated with increments, so
+    concurrent readers in different processes don't lose each other's
+    accesses.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memories (
+            id TEXT PRIMARY KEY,
+            content TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            source TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            decay_policy TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            last_accessed TEXT NOT NULL,
+            access_count INTEGER NOT NULL DEFAULT 0,
+            tags TEXT NOT NULL DEFAULT '[]',
+            related_entries TEXT NOT NULL DEFAULT '[]',
+            occurrences INTEGER NOT NULL DEFAULT 1
+        )
+    """
+
+    CHANGE_FEED_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memory_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entry_id TEXT NOT NULL,
+            op TEXT NOT NULL
+        );
+        CREATE TRIGGER IF NOT EXISTS memories_after_insert AFTER INSERT ON memories
+        BEGIN
+            INSERT INTO memory_changes (entry_id, op) VALUES (NEW.id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS memories_after_update
+        AFTER UPDATE OF content, scope, source, confidence, decay_policy, tags, related_entries
+        ON memories
+        BEGIN
+            INSERT INTO memory_changes (entry_id, op) VALUES (NEW.id, 'upsert');
+        END;
+        CREATE TRIGGER IF NOT EXISTS memories_after_delete AFTER DELETE ON memories
+        BEGIN
+            INSERT INTO memory_changes (entry_id, op) VALUES (OLD.id, 'delete');
+        END;
+    """
+
+    # Change-log rows kept for lagging processes; older ones are pruned
+    CHANGE_LOG_RETENTION = 100_000
+
+    supports_change_feed = True
+
+    COLUMNS = (
+        "id", "content", "scope", "source", "confidence", "decay_policy",
+        "created_at", "last_accessed", "access_count", "tags", "related_entries",
+        "occurrences"
+    )
+
+    def __init__(self, db_path: Path, busy_timeout: float = 30.0):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(db_path), timeout=busy_timeout, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(self.SCHEMA)
+            self._migrate_columns()
+            self._conn.executescript(self.CHANGE_FEED_SCHEMA)
+        self._writes = 0
+
+    def _migrate_columns(self) -> None:
+        """Add columns introduced after a database was created."""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(memories)")}
+        if "occurrences" not in existing:
+            self._conn.execute(
+                "ALTER TABLE memories ADD COLUMN occurrences INTEGER NOT NULL DEFAULT 1"
+            )
+
+    def _to_row(self, entry: dict) -> tuple:
+        return (
+            entry["id"],
+            json.dumps(entry["content"], default=str),
+            entry["scope"],
+            entry["source"],
+            entry.get("confidence", 1.0),
+            entry.get("decay_policy", "medium"),
+            entry["created_at"],
+            entry["last_accessed"],
+            entry.get("access_count", 0),
+            json.dumps(entry.get("tags", [])),
+            json.dumps(entry.get("related_entries", [])),
+            entry.get("occurrences", 1)
+        )
+
+    def _from_row(self, row: tuple) -> dict:
+        data = dict(zip(self.COLUMNS, row))
+        data["content"] = json.loads(data["content"])
+        data["tags"] = json.loads(data["tags"])
+        data["related_entries"] = json.loads(data["related_entries"])
+        return data
+
+    def load_all(self) -> list[dict]:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM memories"
+            )
+            return [self._from_row(row) for row in cursor.fetchall()]
+
+    def upsert(self, entries: Iterable[dict]) -> None:
+        rows = [self._to_row(e) for e in entries]
+        if not rows:
+            return
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO memories ({', '.join(self.COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    rows
+                )
+            self._after_write(len(rows))
+
+    def delete(self, entry_ids: Iterable[str]) -> None:
+        ids = [(eid,) for eid in entry_ids]
+        if not ids:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("DELETE FROM memories WHERE id = ?", ids)
+            self._after_write(len(ids))
+
+    def record_access(self, rows: list[dict]) -> None:
+        """Add access deltas and keep the latest access time per row."""
+        updates = [
+            (row.get("access_delta", 0), row["last_accessed"], row["id"])
+            for row in rows
+        ]
+        if not updates:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE memories SET access_count = access_count + ?, "
+                    "last_accessed = MAX(last_accessed, ?) WHERE id = ?",
+                    updates
+                )
+
+    def _after_write(self, count: int) -> None:
+        """Prune the change log now and then."""
+        self._writes += count
+        if self._writes < 1000:
+            return
+        self._writes = 0
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM memory_changes WHERE seq <= "
+                "(SELECT MAX(seq) FROM memory_changes) - ?",
+                (self.CHANGE_LOG_RETENTION,)
+            )
+
+    def data_version(self) -> int:
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def latest_seq(self) -> int:
+        """Sequence number of the newest change-log row."""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(seq) FROM memory_changes").fetchone()
+        return row[0] or 0
+
+    def changes_since(self, seq: int) -> tuple[list[tuple[str, str]], int, bool]:
+        with self._lock:
+            oldest = self._conn.execute("SELECT MIN(seq) FROM memory_changes").fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT seq, op, entry_id FROM memory_changes WHERE seq > ? ORDER BY seq",
+                (seq,)
+            ).fetchall()
+        complete = oldest is None or oldest <= seq + 1
+        latest = rows[-1][0] if rows else seq
+        return [(op, eid) for _, op, eid in rows], latest, complete
+
+    def get_many(self, entry_ids: Iterable[str]) -> list[dict]:
+        ids = list(entry_ids)
+        results = []
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                cursor = self._conn.execute(
+                    f"SELECT {', '.join(self.COLUMNS)} FROM memories "
+                    f"WHERE id IN ({', '.join('?' for _ in chunk)})",
+                    chunk
+                )
+                results.extend(self._from_row(row) for row in cursor.fetchall())
+        return results
+
+    def count(self) -> int:
+        """Number of persisted entries."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    def migrate_from_json(self, json_path: Path) -> int:
+        """
+        One-shot import of a legacy ``memories.json`` file.
+
+        The JSON file is renamed to ``memories.json.migrated`` afterwards so
+        the import never runs twice. Returns the number of imported entries.
+        """
+        if not json_path.exists():
+            return 0
+
+        rows = JSONMemoryBackend(json_path).load_all()
+        self.upsert(rows)
+        try:
+            json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+        except FileNotFoundError:
+            pass  # Another process migrated concurrently
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_backend(storage_path: Path, kind: Optional[str] = None) -> MemoryBackend:
+    """
+    Create a memory backend rooted at storage_path.
+
+    Args:
+        storage_path: Memory directory
+        kind: "sqlite" (default) or "json"
+    """
+    kind = kind or "sqlite"
+    if kind == "json":
+        return JSONMemoryBackend(storage_path / "memories.json")
+    if kind == "sqlite":
+        backend = SQLiteMemoryBackend(storage_path / "memories.db")
+        if backend.count() == 0:
+            backend.migrate_from_json(storage_path / "memories.json")
+        return backend
+    raise ValueError(f"Unknown memory backend: {kind}")
@@ -0,0 +1,177 @@
+"""
+Near-duplicate consolidation for the MACDS memory system.
+
+Entry IDs hash the exact content, so records that differ only in volatile
+values (timestamps, task IDs, counters) are stored as separate entries.
+Consolidator clusters entries that share scope, source and tags by the
+similarity of their normalized content, and merges each cluster into one
+entry.
+
+The pass is incremental: only entries added since the previous pass are
+examined, each against the cluster representatives of its group.
+"""
+
+from typing import Any, Iterable, Optional
+import hashlib
+import re
+
+from macds.core.memory_index import content_text, tokenize
+
+
+# Volatile values replaced before comparing content
+_VOLATILE_PATTERNS = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}[t ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?([+-]\d{2}:?\d{2}|z)?"), " _ts_ "),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), " _uuid_ "),
+    (re.compile(r"\b(?=[0-9a-f]*\d)[0-9a-f]{8,}\b"), " _hex_ "),
+    (re.compile(r"\d+(\.\d+)?"), " _num_ "),
+]
+
+
+def normalize_content(content: Any) -> list[str]:
+    """Tokens of content with timestamps, IDs and numbers masked."""
+    text = content_text(content).lower()
+    for pattern, placeholder in _VOLATILE_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    return tokenize(text)
+
+
+def fingerprint(tokens: list[str]) -> str:
+    """Exact-match key for normalized tokens."""
+    return hashlib.sha1(" ".join(tokens).encode()).hexdigest()
+
+
+def shingles(tokens: list[str]) -> set[str]:
+    """Word bigrams (single tokens for one-token content)."""
+    if len(tokens) < 2:
+        return set(tokens)
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    """Jaccard similarity of two sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class Consolidator:
+    """
+    Incremental near-duplicate clustering.
+
+    Tracks entries added since the last pass and, per group
+    (scope, source, tags), the cluster representatives seen so far: an
+    exact map from normalized fingerprint to representative, plus the
+    most recent representatives for fuzzy (Jaccard) comparison.
+    """
+
+    def __init__(self, similarity: float = 0.85, max_comparisons: int = 64):
+        self.similarity = similarity
+        self.max_comparisons = max_comparisons
+        self._pending: dict[str, None] = {}  # Insertion-ordered set
+        self._exact: dict[tuple, dict[str, str]] = {}
+        self._recent: dict[tuple, dict[str, set[str]]] = {}
+        self._member_of: dict[str, tuple] = {}  # representative -> (group, fingerprint)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def mark(self, entry_id: str) -> None:
+        """Queue an added or changed entry for the next pass."""
+        self.discard(entry_id)
+        self._pending[entry_id] = None
+
+    def discard(self, entry_id: str) -> None:
+        """Forget an entry (removed, or about to be re-examined)."""
+        self._pending.pop(entry_id, None)
+        placement = self._member_of.pop(entry_id, None)
+        if placement is None:
+            return
+        group, fp = placement
+        exact = self._exact.get(group)
+        if exact is not None and exact.get(fp) == entry_id:
+            del exact[fp]
+            if not exact:
+                del self._exact[group]
+        recent = self._recent.get(group)
+        if recent is not None:
+            recent.pop(entry_id, None)
+            if not recent:
+                del self._recent[group]
+
+    def take_pending(self, limit: Optional[int] = None) -> list[str]:
+        """Remove and return up to limit queued entry IDs, oldest first."""
+        if limit is None or limit >= len(self._pending):
+            ids = list(self._pending)
+            self._pending.clear()
+            return ids
+        ids = []
+        for entry_id in self._pending:
+            if len(ids) >= limit:
+                break
+            ids.append(entry_id)
+        for entry_id in ids:
+            del self._pending[entry_id]
+        return ids
+
+    def assign(self, entry_id: str, group: tuple, content: Any) -> Optional[str]:
+        """
+        Find the representative entry_id duplicates.
+
+        Returns the representative's ID, or None after registering
+        entry_id as a new representative of its group.
+        """
+        tokens = normalize_content(content)
+        fp = fingerprint(tokens)
+
+        exact = self._exact.setdefault(group, {})
+        target = exact.get(fp)
+        if target is not None and target != entry_id:
+            return target
+
+        recent = self._recent.setdefault(group, {})
+        entry_shingles = shingles(tokens)
+        if self.similarity < 1.0:
+            for rep_id in reversed(list(recent)[-self.max_comparisons:]):
+                if rep_id != entry_id and jaccard(entry_shingles, recent[rep_id]) >= self.similarity:
+                    return rep_id
+
+        exact[fp] = entry_id
+        recent[entry_id] = entry_shingles
+        self._member_of[entry_id] = (group, fp)
+        if len(recent) > self.max_comparisons:
+            # Older representatives stay reachable through exact matches
+            oldest = next(iter(recent))
+            del recent[oldest]
+        return None
+
+    def clear(self) -> None:
+        """Drop all state."""
+        self._pending.clear()
+        self._exact.clear()
+        self._recent.clear()
+        self._member_of.clear()
+
+
+def merge_entries(target, others: Iterable) -> None:
+    """
+    Fold duplicate entries into target (MemoryEntry objects).
+
+    Occurrences and access counts add up, confidence is combined as
+    independent evidence (1 - prod(1 - c)), and the access window widens
+    to cover every member.
+    """
+    related = list(target.related_entries)
+    tags = list(target.tags)
+    merged_ids = set()
+    for other in others:
+        merged_ids.add(other.id)
+        target.occurrences += other.occurrences
+        target.access_count += other.access_count
+        target.confidence = 1.0 - (1.0 - target.confidence) * (1.0 - other.confidence)
+        target.created_at_ts = min(target.created_at_ts, other.created_at_ts)
+        target.last_accessed_ts = max(target.last_accessed_ts, other.last_accessed_ts)
+        related.extend(r for r in other.related_entries if r not in related)
+        tags.extend(t for t in other.tags if t not in tags)
+    target.confidence = min(1.0, target.confidence)
+    target.related_entries = [r for r in related if r not in merged_ids and r != target.id]
+    target.tags = tags
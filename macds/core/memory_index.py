@@ -0,0 +1,185 @@
+"""
+Indexes for the MACDS memory system.
+
+InvertedIndex maps tokens of entry content to positional postings so
+search cost depends on the postings touched, not on the store size.
+FieldIndex is a hash index from an attribute value (scope, source, tag)
+to the IDs of entries carrying it.
+"""
+
+from typing import Any, Iterable
+import json
+import re
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+_EMPTY: frozenset = frozenset()
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def content_text(content: Any) -> str:
+    """Flatten entry content to the text that gets indexed."""
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, default=str)
+
+
+class FieldIndex:
+    """
+    Hash index from attribute values to entry IDs.
+
+    An entry may be indexed under several keys (e.g. one per tag).
+    """
+
+    def __init__(self):
+        self._buckets: dict[Any, set[str]] = {}
+
+    def add(self, entry_id: str, keys: Iterable[Any]) -> None:
+        """Index an entry under each of keys."""
+        for key in keys:
+            self._buckets.setdefault(key, set()).add(entry_id)
+
+    def remove(self, entry_id: str, keys: Iterable[Any]) -> None:
+        """Remove an entry from each of keys."""
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def get(self, key: Any) -> set[str]:
+        """IDs indexed under key (do not mutate the result)."""
+        return self._buckets.get(key, _EMPTY)
+
+    def get_any(self, keys: Iterable[Any]) -> set[str]:
+        """IDs indexed under at least one of keys."""
+        result: set[str] = set()
+        for key in keys:
+            result |= self.get(key)
+        return result
+
+    def counts(self) -> dict[Any, int]:
+        """Number of entries per key."""
+        return {key: len(ids) for key, ids in self._buckets.items()}
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._buckets.clear()
+
+
+class InvertedIndex:
+    """
+    Incrementally maintained positional inverted index.
+
+    Query syntax:
+    - ``hello world``   entries containing both tokens (AND)
+    - ``"hello world"`` entries containing the tokens adjacently (phrase)
+    - both forms can be mixed: ``"build failed" timeout``
+    """
+
+    def __init__(self):
+        # token -> {entry_id: [positions]}
+        self._postings: dict[str, dict[str, list[int]]] = {}
+        # entry_id -> tokens present in that entry (for removal)
+        self._doc_terms: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._doc_terms
+
+    def add(self, entry_id: str, content: Any) -> None:
+        """Index (or re-index) an entry."""
+        if entry_id in self._doc_terms:
+            self.remove(entry_id)
+
+        terms: set[str] = set()
+        for position, token in enumerate(tokenize(content_text(content))):
+            self._postings.setdefault(token, {}).setdefault(entry_id, []).append(position)
+            terms.add(token)
+        self._doc_terms[entry_id] = terms
+
+    def remove(self, entry_id: str) -> None:
+        """Drop an entry from the index."""
+        for token in self._doc_terms.pop(entry_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(entry_id, None)
+            if not postings:
+                del self._postings[token]
+
+    def remove_many(self, entry_ids: Iterable[str]) -> None:
+        """Drop several entries from the index."""
+        for entry_id in entry_ids:
+            self.remove(entry_id)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._postings.clear()
+        self._doc_terms.clear()
+
+    def search(self, query: str) -> set[str]:
+        """
+        Return IDs of entries matching the query.
+
+        All terms and phrases must match. An empty query matches nothing.
+        """
+        phrases = [tokenize(p) for p in _PHRASE_RE.findall(query)]
+        phrases = [p for p in phrases if p]
+        terms = tokenize(_PHRASE_RE.sub(" ", query))
+
+        required = set(terms)
+        for phrase in phrases:
+            required.update(phrase)
+        if not required:
+            return set()
+
+        # Intersect starting from the rarest token
+        posting_lists = []
+        for token in required:
+            postings = self._postings.get(token)
+            if not postings:
+                return set()
+            posting_lists.append(postings)
+        posting_lists.sort(key=len)
+
+        candidates = set(posting_lists[0])
+        for postings in posting_lists[1:]:
+            candidates.intersection_update(postings.keys())
+            if not candidates:
+                return candidates
+
+        for phrase in phrases:
+            if len(phrase) > 1:
+                candidates = {
+                    eid for eid in candidates
+                    if self._has_phrase(eid, phrase)
+                }
+        return candidates
+
+    def _has_phrase(self, entry_id: str, phrase: list[str]) -> bool:
+        """Check whether the tokens of phrase appear adjacently in an entry."""
+        starts = set(self._postings[phrase[0]][entry_id])
+        for offset, token in enumerate(phrase[1:], start=1):
+            positions = self._postings[token][entry_id]
+            starts &= {p - offset for p in positions}
+            if not starts:
+                return False
+        return True
+
+    def get_stats(self) -> dict:
+        """Get index statistics."""
+        return {
+            "indexed_entries": len(self._doc_terms),
+            "unique_tokens": len(self._postings),
+            "postings": sum(len(p) for p in self._postings.values())
+        }
@@ -0,0 +1,320 @@
+"""
+Columnar strength scoring for the MACDS memory system.
+
+StrengthColumns keeps the decay inputs of every entry (last access time,
+half-life, confidence, access count) in parallel columns so strengths for
+a whole candidate set are computed in one pass and the top-k is selected
+without sorting every candidate.
+
+NumPy is used when installed (``pip install macds[perf]``); otherwise a
+pure-Python path with heap-based selection is used.
+
+ExpiryQueue orders entries by the time their strength is projected to
+cross the expiry threshold, so expired entries are found in O(log N).
+"""
+
+from typing import Iterable, Optional
+import heapq
+import math
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+
+# Below this many candidates the per-call NumPy overhead outweighs the gain
+NUMPY_MIN_BATCH = 64
+
+# Access boost: +10% per access, capped at 2x (see MemoryEntry.get_current_strength)
+ACCESS_BOOST_STEP = 0.1
+ACCESS_BOOST_MAX = 2.0
+
+
+class StrengthColumns:
+    """
+    Column store of decay parameters, addressed by entry ID.
+
+    Removal swaps the last row into the freed slot so columns stay dense.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        self.use_numpy = np is not None if use_numpy is None else (use_numpy and np is not None)
+        self._slots: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._size = 0
+
+        if self.use_numpy:
+            capacity = 1024
+            self._last_accessed = np.zeros(capacity, dtype=np.float64)
+            self._half_life = np.zeros(capacity, dtype=np.float64)
+            self._confidence = np.zeros(capacity, dtype=np.float64)
+            self._access_count = np.zeros(capacity, dtype=np.float64)
+        else:
+            self._last_accessed = []
+            self._half_life = []
+            self._confidence = []
+            self._access_count = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._slots
+
+    def _grow(self) -> None:
+        """Double column capacity (NumPy mode)."""
+        capacity = len(self._last_accessed) * 2
+        for name in ("_last_accessed", "_half_life", "_confidence", "_access_count"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=np.float64)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def set(
+        self,
+        entry_id: str,
+        last_accessed: float,
+        half_life: float,
+        confidence: float,
+        access_count: int
+    ) -> None:
+        """Insert or replace the row for an entry (timestamps in epoch seconds)."""
+        slot = self._slots.get(entry_id)
+        if slot is None:
+            slot = self._size
+            self._slots[entry_id] = slot
+            self._ids.append(entry_id)
+            self._size += 1
+            if self.use_numpy:
+                if slot >= len(self._last_accessed):
+                    self._grow()
+            else:
+                self._last_accessed.append(0.0)
+                self._half_life.append(0.0)
+                self._confidence.append(0.0)
+                self._access_count.append(0.0)
+
+        self._last_accessed[slot] = last_accessed
+        self._half_life[slot] = half_life
+        self._confidence[slot] = confidence
+        self._access_count[slot] = access_count
+
+    def touch(self, entry_id: str, last_accessed: float, access_count: int) -> None:
+        """Update access bookkeeping for an entry."""
+        slot = self._slots.get(entry_id)
+        if slot is not None:
+            self._last_accessed[slot] = last_accessed
+            self._access_count[slot] = access_count
+
+    def remove(self, entry_id: str) -> None:
+        """Remove an entry's row."""
+        slot = self._slots.pop(entry_id, None)
+        if slot is None:
+            return
+
+        last = self._size - 1
+        if slot != last:
+            moved_id = self._ids[last]
+            self._ids[slot] = moved_id
+            self._slots[moved_id] = slot
+            for column in (self._last_accessed, self._half_life,
+                           self._confidence, self._access_count):
+                column[slot] = column[last]
+
+        self._ids.pop()
+        self._size -= 1
+        if not self.use_numpy:
+            for column in (self._last_accessed, self._half_life,
+                           self._confidence, self._access_count):
+                column.pop()
+
+    def clear(self) -> None:
+        """Remove all rows."""
+        for entry_id in list(self._ids):
+            self.remove(entry_id)
+
+    def _slot_array(self, entry_ids: Optional[list[str]]):
+        """NumPy slot indices for entry_ids (None selects every row)."""
+        if entry_ids is None:
+            return np.arange(self._size, dtype=np.intp)
+        return np.fromiter(
+            (self._slots[eid] for eid in entry_ids), dtype=np.intp, count=len(entry_ids)
+        )
+
+    def strengths(
+        self,
+        entry_ids: Optional[list[str]] = None,
+        now: Optional[float] = None
+    ) -> list[float]:
+        """
+        Current strength for each of entry_ids (all must be present).
+
+        None scores every row, in the order of ``ids()``.
+        """
+        now = time.time() if now is None else now
+        count = self._size if entry_ids is None else len(entry_ids)
+        if self.use_numpy and count >= NUMPY_MIN_BATCH:
+            return self._strengths_numpy(self._slot_array(entry_ids), now).tolist()
+        if entry_ids is None:
+            return [self._strength_at(slot, now) for slot in range(self._size)]
+        return [self._strength_at(self._slots[eid], now) for eid in entry_ids]
+
+    def idle_seconds(
+        self,
+        entry_ids: list[str],
+        now: Optional[float] = None
+    ) -> list[float]:
+        """Seconds since the last access of each of entry_ids."""
+        now = time.time() if now is None else now
+        return [now - float(self._last_accessed[self._slots[eid]]) for eid in entry_ids]
+
+    def ids(self) -> list[str]:
+        """Entry IDs in slot order."""
+        return list(self._ids)
+
+    def _strength_at(self, slot: int, now: float) -> float:
+        """Scalar strength for one slot."""
+        half_life = self._half_life[slot]
+        confidence = self._confidence[slot]
+        if math.isinf(half_life):
+            return float(confidence)
+        decay = 0.5 ** ((now - self._last_accessed[slot]) / half_life)
+        boost = min(ACCESS_BOOST_MAX, 1.0 + self._access_count[slot] * ACCESS_BOOST_STEP)
+        return float(min(1.0, confidence * decay * boost))
+
+    def _strengths_numpy(self, slots, now: float):
+        """Vectorized strength for an array of slots."""
+        half_life = self._half_life[slots]
+        confidence = self._confidence[slots]
+        permanent = np.isinf(half_life)
+
+        elapsed = now - self._last_accessed[slots]
+        decay = np.power(0.5, elapsed / half_life)  # inf half-life -> 1.0
+        boost = np.minimum(ACCESS_BOOST_MAX, 1.0 + self._access_count[slots] * ACCESS_BOOST_STEP)
+        decayed = np.minimum(1.0, confidence * decay * boost)
+        return np.where(permanent, confidence, decayed)
+
+    def top_k(
+        self,
+        entry_ids: Optional[Iterable[str]],
+        k: int,
+        min_strength: float = 0.0,
+        now: Optional[float] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Select the k strongest entries with strength >= min_strength.
+
+        entry_ids=None considers every row. Returns (entry_id, strength)
+        pairs sorted by strength (descending).
+        """
+        ids = None if entry_ids is None else list(entry_ids)
+        if k <= 0 or (ids is not None and not ids) or self._size == 0:
+            return []
+        now = time.time() if now is None else now
+        count = self._size if ids is None else len(ids)
+
+        if self.use_numpy and count >= NUMPY_MIN_BATCH:
+            scores = self._strengths_numpy(self._slot_array(ids), now)
+            if ids is None:
+                ids = self._ids
+            keep = np.flatnonzero(scores >= min_strength)
+            if len(keep) > k:
+                part = np.argpartition(-scores[keep], k - 1)[:k]
+                keep = keep[part]
+            order = keep[np.argsort(-scores[keep], kind="stable")]
+            return [(ids[i], float(scores[i])) for i in order]
+
+        if ids is None:
+            scored = (
+                (eid, self._strength_at(slot, now)) for slot, eid in enumerate(self._ids)
+            )
+        else:
+            scored = (
+                (eid, self._strength_at(self._slots[eid], now)) for eid in ids
+            )
+        return heapq.nlargest(
+            k,
+            (pair for pair in scored if pair[1] >= min_strength),
+            key=lambda pair: pair[1]
+        )
+
+
+def projected_expiry(
+    last_accessed: float,
+    half_life: float,
+    confidence: float,
+    access_count: int,
+    threshold: float
+) -> float:
+    """
+    Epoch time at which an entry's strength drops below threshold.
+
+    Solves ``confidence * boost * 0.5 ** (elapsed / half_life) < threshold``
+    for elapsed, assuming no further access. Returns ``inf`` for entries
+    that never expire and ``-inf`` for entries already below threshold.
+    """
+    if math.isinf(half_life):
+        return float("inf") if confidence >= threshold else float("-inf")
+
+    boost = min(ACCESS_BOOST_MAX, 1.0 + access_count * ACCESS_BOOST_STEP)
+    peak = confidence * boost
+    if peak < threshold or threshold <= 0:
+        return float("-inf") if peak < threshold else float("inf")
+    return last_accessed + half_life * math.log2(peak / threshold)
+
+
+class ExpiryQueue:
+    """
+    Min-heap of projected expiry times with lazy invalidation.
+
+    Rescheduling pushes a new heap item and records the current due time
+    per entry; stale items are skipped when popped, and the heap is
+    rebuilt once stale items outnumber live ones.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def schedule(self, entry_id: str, due: float) -> None:
+        """Set (or move) an entry's expiry time."""
+        if math.isinf(due) and due > 0:
+            self._due.pop(entry_id, None)  # Never expires
+            return
+        self._due[entry_id] = due
+        heapq.heappush(self._heap, (due, entry_id))
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._compact()
+
+    def unschedule(self, entry_id: str) -> None:
+        """Stop tracking an entry."""
+        self._due.pop(entry_id, None)
+
+    def next_due(self) -> Optional[float]:
+        """Earliest live expiry time, or None."""
+        while self._heap:
+            due, entry_id = self._heap[0]
+            if self._due.get(entry_id) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: Optional[float] = None) -> list[str]:
+        """Remove and return every entry due at or before now."""
+        now = time.time() if now is None else now
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            due, entry_id = heapq.heappop(self._heap)
+            if self._due.get(entry_id) == due:
+                del self._due[entry_id]
+                expired.append(entry_id)
+        return expired
+
+    def _compact(self) -> None:
+        self._heap = [(due, eid) for eid, due in self._due.items()]
+        heapq.heapify(self._heap)
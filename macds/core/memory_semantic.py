@@ -0,0 +1,305 @@
+"""
+Local semantic index for the MACDS memory system.
+
+Embeds entry content with a deterministic hashed n-gram embedder (no
+model download, no network) and keeps the vectors in a NumPy matrix with
+random-hyperplane LSH tables for approximate nearest-neighbour lookup.
+
+Requires NumPy (``pip install macds[perf]``). Check ``SEMANTIC_AVAILABLE``
+before constructing a SemanticIndex.
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import math
+import os
+import zlib
+
+from macds.core.memory_index import content_text, tokenize
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None
+
+
+SEMANTIC_AVAILABLE = np is not None
+
+
+class HashedNgramEmbedder:
+    """
+    Deterministic bag-of-features embedder.
+
+    Features are word tokens plus character n-grams of each word, hashed
+    into ``dim`` buckets with CRC32 (stable across processes, unlike
+    ``hash()``). Term frequencies are sublinear (1 + log tf) and vectors
+    are L2-normalized.
+    """
+
+    def __init__(self, dim: int = 256, ngram: int = 3):
+        self.dim = dim
+        self.ngram = ngram
+
+    def features(self, text: str) -> list[str]:
+        """Extract word and character n-gram features."""
+        feats = []
+        for word in tokenize(text):
+            feats.append(word)
+            padded = f"<{word}>"
+            if len(padded) > self.ngram:
+                feats.extend(
+                    padded[i:i + self.ngram]
+                    for i in range(len(padded) - self.ngram + 1)
+                )
+        return feats
+
+    def embed(self, text: str):
+        """Embed text to a normalized float32 vector."""
+        counts: dict[int, int] = {}
+        for feat in self.features(text):
+            bucket = zlib.crc32(feat.encode()) % self.dim
+            counts[bucket] = counts.get(bucket, 0) + 1
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for bucket, count in counts.items():
+            vector[bucket] = 1.0 + math.log(count)
+
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector /= norm
+        return vector
+
+
+class SemanticIndex:
+    """
+    Incrementally updated approximate nearest-neighbour index.
+
+    - Vectors live in a dense matrix; removal swaps the last row in.
+    - L LSH tables of b random hyperplanes bucket the vectors; a query
+      scores only the union of its buckets.
+    - Below ``exact_threshold`` vectors, or when LSH returns too few
+      candidates, the query falls back to an exact matrix product.
+    - Document frequencies per bucket are tracked so queries are
+      IDF-weighted (rare features count more).
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        dim: int = 256,
+        ngram: int = 3,
+        n_tables: int = 8,
+        n_bits: int = 10,
+        seed: int = 1337,
+        exact_threshold: int = 4096
+    ):
+        if np is None:
+            raise ImportError("SemanticIndex requires numpy (pip install macds[perf])")
+
+        self.embedder = HashedNgramEmbedder(dim=dim, ngram=ngram)
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.seed = seed
+        self.exact_threshold = exact_threshold
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._bit_weights = (1 << np.arange(n_bits, dtype=np.int64))
+
+        self._ids: list[str] = []
+        self._slots: dict[str, int] = {}
+        self._vectors = np.zeros((256, dim), dtype=np.float32)
+        self._keys = np.zeros((256, n_tables), dtype=np.int64)
+        self._tables: list[dict[int, set[str]]] = [{} for _ in range(n_tables)]
+        self._df = np.zeros(dim, dtype=np.float64)
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._slots
+
+    @property
+    def dim(self) -> int:
+        return self.embedder.dim
+
+    def ids(self) -> list[str]:
+        """Indexed entry IDs."""
+        return list(self._ids)
+
+    def _hash(self, vectors):
+        """LSH keys, one per table, for a (n, dim) matrix."""
+        bits = (vectors @ self._planes.T) > 0
+        bits = bits.reshape(len(vectors), self.n_tables, self.n_bits)
+        return bits @ self._bit_weights
+
+    def add(self, entry_id: str, content: Any) -> None:
+        """Embed and index an entry (re-indexes if already present)."""
+        if entry_id in self._slots:
+            self.remove(entry_id)
+
+        vector = self.embedder.embed(content_text(content))
+        slot = len(self._ids)
+        if slot >= len(self._vectors):
+            self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+            self._keys = np.concatenate([self._keys, np.zeros_like(self._keys)])
+
+        keys = self._hash(vector[None, :])[0]
+        self._vectors[slot] = vector
+        self._keys[slot] = keys
+        self._ids.append(entry_id)
+        self._slots[entry_id] = slot
+        for table, key in zip(self._tables, keys.tolist()):
+            table.setdefault(key, set()).add(entry_id)
+        self._df += vector > 0
+        self.dirty = True
+
+    def remove(self, entry_id: str) -> None:
+        """Drop an entry from the index."""
+        slot = self._slots.pop(entry_id, None)
+        if slot is None:
+            return
+
+        self._df -= self._vectors[slot] > 0
+        for table, key in zip(self._tables, self._keys[slot].tolist()):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del table[key]
+
+        last = len(self._ids) - 1
+        if slot != last:
+            moved = self._ids[last]
+            self._ids[slot] = moved
+            self._slots[moved] = slot
+            self._vectors[slot] = self._vectors[last]
+            self._keys[slot] = self._keys[last]
+        self._ids.pop()
+        self.dirty = True
+
+    def _query_vector(self, text: str):
+        """IDF-weighted, normalized query embedding."""
+        vector = self.embedder.embed(text)
+        idf = np.log((1.0 + len(self._ids)) / (1.0 + self._df)) + 1.0
+        vector = vector * idf.astype(np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def query(
+        self,
+        text: str,
+        k: int = 10,
+        candidates: Optional[Iterable[str]] = None,
+        min_similarity: float = 0.0
+    ) -> list[tuple[str, float]]:
+        """
+        Find the k entries most similar to text.
+
+        Args:
+            text: Query text
+            k: Number of results
+            candidates: Restrict results to these entry IDs
+            min_similarity: Drop results below this cosine similarity
+
+        Returns (entry_id, similarity) pairs, most similar first.
+        """
+        if not self._ids or k <= 0:
+            return []
+        query = self._query_vector(text)
+        if not query.any():
+            return []
+
+        allowed = None if candidates is None else set(candidates)
+        pool = self._lsh_candidates(query) if len(self._ids) > self.exact_threshold else None
+        if pool is not None and allowed is not None:
+            pool &= allowed
+        if pool is not None and len(pool) < k:
+            pool = None  # Too few LSH hits; fall back to exact search
+
+        if pool is None:
+            if allowed is None:
+                slots = np.arange(len(self._ids))
+            else:
+                slots = np.fromiter(
+                    (self._slots[eid] for eid in allowed if eid in self._slots), dtype=np.intp
+                )
+        else:
+            slots = np.fromiter((self._slots[eid] for eid in pool), dtype=np.intp)
+
+        if len(slots) == 0:
+            return []
+
+        scores = self._vectors[slots] @ query
+        keep = np.flatnonzero(scores > min_similarity)
+        if len(keep) > k:
+            keep = keep[np.argpartition(-scores[keep], k - 1)[:k]]
+        keep = keep[np.argsort(-scores[keep], kind="stable")]
+        return [(self._ids[slots[i]], float(scores[i])) for i in keep]
+
+    def _lsh_candidates(self, query) -> set[str]:
+        """Union of the query's buckets across all tables."""
+        pool: set[str] = set()
+        for table, key in zip(self._tables, self._hash(query[None, :])[0].tolist()):
+            pool |= table.get(key, set())
+        return pool
+
+    # ==================== Persistence ====================
+
+    def _params(self):
+        return np.array([
+            self.FORMAT_VERSION, self.embedder.dim, self.embedder.ngram,
+            self.n_tables, self.n_bits, self.seed
+        ], dtype=np.int64)
+
+    def save(self, path: Path) -> None:
+        """Write the index atomically (temp file + rename)."""
+        size = len(self._ids)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                params=self._params(),
+                ids=np.array(self._ids, dtype=str),
+                vectors=self._vectors[:size],
+                keys=self._keys[:size]
+            )
+        os.replace(tmp_path, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "SemanticIndex":
+        """
+        Load an index saved with save(), or create an empty one.
+
+        A missing, unreadable or incompatible file yields an empty index
+        built with kwargs.
+        """
+        index = cls(**kwargs)
+        if not path.exists():
+            return index
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if not np.array_equal(data["params"], index._params()):
+                    return index
+                ids = data["ids"].tolist()
+                vectors = data["vectors"].astype(np.float32)
+                keys = data["keys"].astype(np.int64)
+        except Exception:
+            return index
+
+        capacity = max(256, len(ids))
+        index._vectors = np.zeros((capacity, index.dim), dtype=np.float32)
+        index._keys = np.zeros((capacity, index.n_tables), dtype=np.int64)
+        index._vectors[:len(ids)] = vectors
+        index._keys[:len(ids)] = keys
+        index._ids = ids
+        index._slots = {eid: slot for slot, eid in enumerate(ids)}
+        for slot, eid in enumerate(ids):
+            for table, key in zip(index._tables, keys[slot].tolist()):
+                table.setdefault(key, set()).add(eid)
+        index._df = (vectors > 0).sum(axis=0).astype(np.float64)
+        return index
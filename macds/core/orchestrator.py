@@ -1,12 +1,20 @@
 from dataclasses import dataclass, field
-from typing import Any, Optional, Callable
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Optional, Callable
 from enum import Enum
 from datetime import datetime
 import asyncio
 import uuid
 
+from macds.core import events, tracing
+from macds.core.events import EventBus, EventType, WorkflowEvent
 from macds.core.memory import MemoryStore, MemoryScope
 from macds.core.evaluation import EvaluationSystem
+from macds.core.scheduler import Priority, StageScheduler
+from macds.core.stage_cache import StageCache, content_hash
+from macds.core.checkpoint import CheckpointStore, WorkflowCheckpoint
+from macds.core.retention import WorkflowArchive, WorkflowRetention
+from macds.core.work_queue import WorkQueue
 from macds.core.artifacts import ArtifactStore
 from macds.core.contracts import (
     ContractInput, ContractOutput, Verdict, ConflictRecord,
@@ -30,11 +38,13 @@ class WorkflowStage(str, Enum):
 class TaskStatus(str, Enum):
     """Status of a workflow task."""
     PENDING = "pending"
+    QUEUED = "queued"        # Waiting for a scheduler slot
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
     BLOCKED = "blocked"
     ESCALATED = "escalated"
+    CANCELLED = "cancelled"  # Stopped by cancel_workflow() or the workflow timeout
 
 
 @dataclass
@@ -53,6 +63,17 @@ class WorkflowTask:
     error: Optional[str] = None
     retry_count: int = 0
     max_retries: int = 3
+    workflow_id: str = ""
+    priority: Priority = Priority.NORMAL
+    tenant: str = "default"
+    wait_seconds: float = 0.0  # Total time queued for a scheduler slot
+    cache_hits: int = 0
+    cache_misses: int = 0
+    # Fingerprints of the context keys and upstream outputs the last
+    # successful execution read ("context.<key>" / "output.<stage>")
+    read_fingerprints: dict[str, str] = field(default_factory=dict)
+    reused: bool = False  # Last completion reused output_data without executing
+    timeout: Optional[float] = None  # Seconds allowed per execution
     
     def to_dict(self) -> dict:
         return {
@@ -62,7 +83,10 @@ class WorkflowTask:
             "status": self.status.value,
             "dependencies": self.dependencies,
             "error": self.error,
-            "retry_count": self.retry_count
+            "retry_count": self.retry_count,
+            "wait_seconds": self.wait_seconds,
+            "cache_hits": self.cache_hits,
+            "reused": self.reused
         }
 
 
@@ -76,9 +100,14 @@ class WorkflowResult:
     outputs: dict[str, Any] = field(default_factory=dict)
     duration_seconds: float = 0.0
     escalations: list[dict] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+    stages_reused: list[WorkflowStage] = field(default_factory=list)
+    stages_cancelled: list[WorkflowStage] = field(default_factory=list)
+    cancel_reason: Optional[str] = None
     
     def get_summary(self) -> str:
-        status = "succeeded" if self.success else "failed"
+        status = "succeeded" if self.success else "cancelled" if self.cancel_reason else "failed"
         return f"""Workflow {self.workflow_id} {status}
 Completed: {', '.join(s.value for s in self.stages_completed)}
 Failed: {', '.join(s.value for s in self.stages_failed)}
@@ -106,6 +135,48 @@ FAILURE_ROUTING = {
 }
 
 
+class _RecordingDict(dict):
+    """Copy of a dict that records which keys are read."""
+    
+    def __init__(self, data: dict, reads: set):
+        super().__init__(data)
+        self._reads = reads
+    
+    def __getitem__(self, key):
+        self._reads.add(key)
+        return super().__getitem__(key)
+    
+    def get(self, key, default=None):
+        self._reads.add(key)
+        return super().get(key, default)
+    
+    def __contains__(self, key):
+        self._reads.add(key)
+        return super().__contains__(key)
+
+
+# Workflow whose stages are running in this context (scopes escalations)
+_current_workflow: ContextVar[Optional[str]] = ContextVar("macds_current_workflow", default=None)
+
+
+class _WorkflowControl:
+    """Cancellation state of a running workflow."""
+    
+    def __init__(self, timeout: Optional[float] = None):
+        loop = asyncio.get_running_loop()
+        self.timeout = timeout
+        self.deadline = loop.time() + timeout if timeout else None
+        self.cancel_requested = asyncio.Event()
+        self.finished: asyncio.Future = loop.create_future()
+        self.reason: Optional[str] = None
+    
+    def remaining(self) -> Optional[float]:
+        """Seconds left in the workflow budget (None if unlimited)."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - asyncio.get_running_loop().time())
+
+
 class Orchestrator:
     """
     Workflow orchestrator for MACDS.
@@ -115,6 +186,40 @@ class Orchestrator:
     - Failure routing
     - Escalation handling
     - State persistence
+    
+    Stages run as soon as all their dependencies have completed; up to
+    ``max_parallelism`` independent stages execute concurrently, so a
+    workflow takes critical-path time rather than the sum of its stages.
+    
+    Across all concurrent run_workflow calls, agent executions go through
+    a shared StageScheduler: a bounded worker pool with per-agent caps,
+    priority classes and per-tenant fair share.
+    
+    With a StageCache, a stage whose agent, agent config and prepared
+    input match an earlier execution reuses the stored output instead of
+    calling the agent.
+    
+    With a CheckpointStore, workflow state is saved after every completed
+    stage and resume_workflow() continues an interrupted workflow.
+    
+    stage_timeout / stage_timeouts bound each agent execution (a timeout
+    is a stage failure); workflow_timeout bounds a whole workflow, which
+    is then cancelled like cancel_workflow() does.
+    
+    stream_workflow() runs a workflow and yields its progress events;
+    watch_workflow() follows one that is already running.
+    
+    Workflow state and escalations are held by a WorkflowRetention:
+    finished workflows are evicted after a TTL or beyond a count limit
+    and archived (by default under the project's .macds/workflows, which
+    keeps the newest 1000 workflows for 30 days), where
+    get_workflow_status() still finds them.
+    
+    With a WorkQueue, stages are not executed in this process: each is
+    enqueued and run by QueueWorker processes serving the same queue
+    file, and the orchestrator waits for the result. The scheduler still
+    bounds how many stages this orchestrator has in flight, so size
+    max_workers for the worker fleet.
     """
     
     def __init__(
@@ -122,16 +227,39 @@ class Orchestrator:
         memory_store: Optional[MemoryStore] = None,
         evaluation: Optional[EvaluationSystem] = None,
         artifact_store: Optional[ArtifactStore] = None,
-        verbose: bool = False
+        verbose: bool = False,
+        max_parallelism: int = 4,
+        scheduler: Optional[StageScheduler] = None,
+        stage_cache: Optional[StageCache] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        stage_timeout: Optional[float] = None,
+        stage_timeouts: Optional[dict[WorkflowStage, float]] = None,
+        workflow_timeout: Optional[float] = None,
+        retention: Optional[WorkflowRetention] = None,
+        work_queue: Optional[WorkQueue] = None
     ):
         self.memory_store = memory_store or MemoryStore()
-        self.evaluation = evaluation or EvaluationSystem()
+        # Agents record results on every execution; coalesce the saves
+        self.evaluation = evaluation or EvaluationSystem(save_delay=1.0)
         self.artifact_store = artifact_store or ArtifactStore()
         self.verbose = verbose
+        self.max_parallelism = max_parallelism
+        self.scheduler = scheduler or StageScheduler()
+        self.stage_cache = stage_cache
+        self.checkpoints = checkpoints
+        self.stage_timeout = stage_timeout
+        self.stage_timeouts = dict(stage_timeouts or {})
+        self.workflow_timeout = workflow_timeout
+        if retention is None:
+            retention = WorkflowRetention(
+                archive=WorkflowArchive(self.artifact_store.project_root / ".macds" / "workflows")
+            )
+        self.retention = retention
+        self.work_queue = work_queue
         
         self._agents: dict[str, BaseAgent] = {}
-        self._active_workflows: dict[str, list[WorkflowTask]] = {}
-        self._escalations: list[ConflictRecord] = []
+        self._controls: dict[str, _WorkflowControl] = {}
+        self._event_buses: dict[str, EventBus] = {}
         
         # Initialize agents
         self._init_agents()
@@ -167,7 +295,11 @@ class Orchestrator:
     async def run_workflow(
         self,
         user_request: str,
-        workflow: Optional[list] = None
+        workflow: Optional[list] = None,
+        max_parallelism: Optional[int] = None,
+        priority: Priority = Priority.NORMAL,
+        tenant: str = "default",
+        timeout: Optional[float] = None
     ) -> WorkflowResult:
         """
         Execute a complete development workflow.
@@ -175,10 +307,87 @@ class Orchestrator:
         Args:
             user_request: Natural language request from user
             workflow: Custom workflow DAG (or use default)
+            max_parallelism: Concurrent stage limit (defaults to the orchestrator's)
+            priority: Scheduling class for this workflow's stages
+            tenant: Tenant for fair sharing of the worker pool
+            timeout: Workflow time budget in seconds (defaults to the orchestrator's)
+        """
+        checkpoint = self._new_checkpoint(user_request, workflow, max_parallelism, priority, tenant)
+        return await self._drive_workflow(checkpoint, timeout)
+    
+    async def stream_workflow(
+        self,
+        user_request: str,
+        workflow: Optional[list] = None,
+        max_parallelism: Optional[int] = None,
+        priority: Priority = Priority.NORMAL,
+        tenant: str = "default",
+        timeout: Optional[float] = None,
+        max_buffered: int = 100
+    ) -> AsyncIterator[WorkflowEvent]:
+        """
+        Execute a workflow, yielding its progress events as they happen.
+        
+        Takes the same arguments as run_workflow. The last event is
+        WORKFLOW_FINISHED, whose result is the WorkflowResult. At most
+        max_buffered events wait for the consumer; beyond that the
+        workflow pauses before starting further stages. Closing the
+        iterator early cancels the workflow.
+        
+        Example:
+            async for event in orchestrator.stream_workflow(request):
+                await websocket.send_json(event.to_dict())
         """
+        checkpoint = self._new_checkpoint(user_request, workflow, max_parallelism, priority, tenant)
+        workflow_id = checkpoint.workflow_id
+        bus = self._event_buses[workflow_id] = EventBus(workflow_id)
+        channel = bus.subscribe(max_buffered)
+        run = asyncio.create_task(self._drive_workflow(checkpoint, timeout))
+        
+        try:
+            async for event in channel:
+                yield event
+            await run  # Surface errors that ended the workflow without a result
+        finally:
+            bus.unsubscribe(channel)
+            if not run.done():
+                if await self.cancel_workflow(workflow_id, "Event stream closed") is None:
+                    run.cancel()
+                await asyncio.gather(run, return_exceptions=True)
+                self.retention.finish(workflow_id)  # In case it never started
+    
+    async def watch_workflow(
+        self,
+        workflow_id: str,
+        max_buffered: int = 100
+    ) -> AsyncIterator[WorkflowEvent]:
+        """
+        Follow the progress events of a running workflow.
+        
+        Yields events from now until the workflow finishes. Unlike
+        stream_workflow, closing the iterator leaves the workflow running.
+        """
+        bus = self._event_buses.get(workflow_id)
+        if bus is None:
+            raise ValueError(f"Workflow not running: {workflow_id}")
+        channel = bus.subscribe(max_buffered)
+        try:
+            async for event in channel:
+                yield event
+        finally:
+            bus.unsubscribe(channel)
+    
+    def _new_checkpoint(
+        self,
+        user_request: str,
+        workflow: Optional[list],
+        max_parallelism: Optional[int],
+        priority: Priority,
+        tenant: str
+    ) -> WorkflowCheckpoint:
+        """Create the tasks and initial state of a new workflow."""
         workflow_id = str(uuid.uuid4())[:8]
         workflow_def = workflow or DEFAULT_WORKFLOW
-        start_time = datetime.now()
         
         self._log(f"Starting workflow {workflow_id}")
         
@@ -189,77 +398,208 @@ class Orchestrator:
                 id=f"{workflow_id}-{stage.value}",
                 stage=stage,
                 agent_name=agent_name,
-                dependencies=[f"{workflow_id}-{d.value}" for d in deps]
+                dependencies=[f"{workflow_id}-{d.value}" for d in deps],
+                workflow_id=workflow_id,
+                priority=priority,
+                tenant=tenant,
+                timeout=self.stage_timeouts.get(stage, self.stage_timeout)
             )
             tasks[stage] = task
         
-        self._active_workflows[workflow_id] = list(tasks.values())
+        self.retention.track(workflow_id, list(tasks.values()))
         
-        # Execute workflow
-        completed_stages = []
-        failed_stages = []
-        outputs = {}
-        context = {"user_request": user_request}
+        return WorkflowCheckpoint(
+            workflow_id=workflow_id,
+            user_request=user_request,
+            workflow_def=list(workflow_def),
+            tasks=tasks,
+            context={"user_request": user_request},
+            outputs={},
+            completed_stages=[],
+            max_parallelism=max_parallelism or self.max_parallelism
+        )
+    
+    async def resume_workflow(
+        self,
+        workflow_id: str,
+        max_parallelism: Optional[int] = None
+    ) -> WorkflowResult:
+        """
+        Continue a checkpointed workflow, e.g. after the process died.
         
-        for stage, agent_name, _ in workflow_def:
-            task = tasks[stage]
-            
-            # Check dependencies
-            deps_met = all(
-                tasks[s].status == TaskStatus.COMPLETED
-                for s, _, _ in workflow_def
-                if f"{workflow_id}-{s.value}" in task.dependencies
-            )
-            
-            if not deps_met:
-                task.status = TaskStatus.BLOCKED
-                failed_stages.append(stage)
-                continue
-            
-            # Prepare input
-            task.input_data = self._prepare_input(stage, context, outputs)
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.now()
-            
-            self._log(f"Executing {stage.value} with {agent_name}")
-            
-            try:
-                agent = self._agents.get(agent_name)
-                if not agent:
-                    raise ValueError(f"Agent not found: {agent_name}")
-                
-                output = await agent.execute(task.input_data)
-                task.output_data = output
-                task.status = TaskStatus.COMPLETED
-                task.completed_at = datetime.now()
-                
-                completed_stages.append(stage)
-                outputs[stage] = output
-                
-                # Update context for next stages
-                self._update_context(stage, output, context)
-                
-            except Exception as e:
-                task.status = TaskStatus.FAILED
-                task.error = str(e)
-                task.completed_at = datetime.now()
-                
-                self._log(f"Stage {stage.value} failed: {e}")
-                
-                # Handle failure routing
-                if not await self._handle_failure(stage, task, tasks, context):
-                    failed_stages.append(stage)
-                    break  # Stop workflow on unrecoverable failure
+        Completed stages keep their outputs and are not executed again;
+        every other stage is reset to pending and runs as its
+        dependencies allow. Resuming a failed workflow retries it from
+        its first unfinished stage.
+        """
+        checkpoint = self._load_checkpoint(workflow_id)
+        
+        for task in checkpoint.tasks.values():
+            if task.status != TaskStatus.COMPLETED:
+                task.status = TaskStatus.PENDING
+                task.error = None
+        checkpoint.failed_stages.clear()
+        checkpoint.finished = False
+        if max_parallelism:
+            checkpoint.max_parallelism = max_parallelism
+        
+        self._log(f"Resuming workflow {workflow_id} after "
+                  f"{len(checkpoint.completed_stages)} completed stages")
+        self.retention.track(workflow_id, list(checkpoint.tasks.values()))
+        return await self._drive_workflow(checkpoint)
+    
+    async def revise_workflow(
+        self,
+        workflow_id: str,
+        user_request: Optional[str] = None,
+        context_updates: Optional[dict] = None,
+        max_parallelism: Optional[int] = None
+    ) -> WorkflowResult:
+        """
+        Re-run a checkpointed workflow after its request or context changed.
+        
+        Every stage is re-evaluated in DAG order, but only stages whose
+        recorded context keys or upstream outputs changed are executed;
+        the rest reuse their previous outputs.
+        """
+        checkpoint = self._load_checkpoint(workflow_id)
         
-        duration = (datetime.now() - start_time).total_seconds()
+        if user_request is not None:
+            checkpoint.user_request = user_request
+            checkpoint.context["user_request"] = user_request
+        checkpoint.context.update(context_updates or {})
+        for task in checkpoint.tasks.values():
+            task.status = TaskStatus.PENDING
+            task.error = None
+        checkpoint.completed_stages.clear()
+        checkpoint.failed_stages.clear()
+        checkpoint.finished = False
+        if max_parallelism:
+            checkpoint.max_parallelism = max_parallelism
+        
+        self._log(f"Revising workflow {workflow_id}")
+        self.retention.track(workflow_id, list(checkpoint.tasks.values()))
+        return await self._drive_workflow(checkpoint)
+    
+    def _load_checkpoint(self, workflow_id: str) -> WorkflowCheckpoint:
+        if self.checkpoints is None:
+            raise ValueError("Checkpointing is not enabled")
+        checkpoint = self.checkpoints.load(workflow_id)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint for workflow: {workflow_id}")
+        return checkpoint
+    
+    async def cancel_workflow(
+        self,
+        workflow_id: str,
+        reason: str = "Cancelled by request"
+    ) -> Optional[WorkflowResult]:
+        """
+        Cancel a running workflow.
+        
+        Running stages are cancelled (killing any subprocesses they
+        started) and release their scheduler slots; stages that had not
+        finished are marked CANCELLED. Returns the partial WorkflowResult
+        once everything has stopped, or None if the workflow is not running.
+        """
+        control = self._controls.get(workflow_id)
+        if control is None:
+            return None
+        if control.reason is None:
+            control.reason = reason
+        control.cancel_requested.set()
+        try:
+            return await asyncio.shield(control.finished)
+        except asyncio.CancelledError:
+            if control.finished.cancelled():
+                return None  # The workflow died with an error instead
+            raise
+    
+    async def _drive_workflow(
+        self,
+        checkpoint: WorkflowCheckpoint,
+        timeout: Optional[float] = None
+    ) -> WorkflowResult:
+        """Execute a workflow's unfinished stages, checkpointing progress."""
+        workflow_id = checkpoint.workflow_id
+        control = _WorkflowControl(timeout or self.workflow_timeout)
+        self._controls[workflow_id] = control
+        bus = self._event_buses.setdefault(workflow_id, EventBus(workflow_id))
+        token = _current_workflow.set(workflow_id)
+        try:
+            with tracing.span(
+                "workflow", workflow_id=workflow_id, stages=len(checkpoint.tasks)
+            ) as span, events.scope(bus):
+                await bus.publish(
+                    EventType.WORKFLOW_STARTED,
+                    stages=[s.value for s in checkpoint.tasks],
+                    completed=[s.value for s in checkpoint.completed_stages]
+                )
+                result = await self._drive_controlled(checkpoint, control)
+                span.set_attribute("success", result.success)
+                if result.cancel_reason:
+                    span.set_attribute("cancel_reason", result.cancel_reason)
+                await bus.publish(
+                    EventType.WORKFLOW_FINISHED,
+                    result=result,
+                    success=result.success,
+                    completed=[s.value for s in result.stages_completed],
+                    failed=[s.value for s in result.stages_failed],
+                    cancelled=[s.value for s in result.stages_cancelled],
+                    cancel_reason=result.cancel_reason,
+                    duration_seconds=result.duration_seconds
+                )
+            control.finished.set_result(result)
+            return result
+        finally:
+            _current_workflow.reset(token)
+            bus.close()
+            self._event_buses.pop(workflow_id, None)
+            self._controls.pop(workflow_id, None)
+            self.retention.finish(workflow_id)
+            if not control.finished.done():
+                control.finished.cancel()
+    
+    async def _drive_controlled(
+        self,
+        checkpoint: WorkflowCheckpoint,
+        control: _WorkflowControl
+    ) -> WorkflowResult:
+        workflow_id = checkpoint.workflow_id
+        tasks = checkpoint.tasks
+        start_time = datetime.now()
+        elapsed_before = checkpoint.elapsed_seconds
+        
+        def save_checkpoint() -> None:
+            if self.checkpoints is not None:
+                checkpoint.elapsed_seconds = elapsed_before + (datetime.now() - start_time).total_seconds()
+                self.checkpoints.save(checkpoint)
+        
+        save_checkpoint()
+        completed_stages, failed_stages, outputs = await self._execute_dag(
+            checkpoint.workflow_def, tasks, checkpoint.context, checkpoint.max_parallelism,
+            completed_stages=checkpoint.completed_stages,
+            failed_stages=checkpoint.failed_stages,
+            outputs=checkpoint.outputs,
+            on_stage_complete=save_checkpoint,
+            control=control
+        )
+        checkpoint.finished = True
+        save_checkpoint()
+        
+        duration = elapsed_before + (datetime.now() - start_time).total_seconds()
+        
+        cancelled = [s for s, t in tasks.items() if t.status == TaskStatus.CANCELLED]
+        success = not failed_stages and not control.reason
         
         # Store workflow result in memory
         self.memory_store.store(
             content={
                 "workflow_id": workflow_id,
-                "success": len(failed_stages) == 0,
+                "success": success,
                 "completed": [s.value for s in completed_stages],
-                "failed": [s.value for s in failed_stages]
+                "failed": [s.value for s in failed_stages],
+                "cancelled": [s.value for s in cancelled]
             },
             scope=MemoryScope.PROJECT,
             source="Orchestrator",
@@ -268,13 +608,314 @@ class Orchestrator:
         
         return WorkflowResult(
             workflow_id=workflow_id,
-            success=len(failed_stages) == 0,
+            success=success,
             stages_completed=completed_stages,
             stages_failed=failed_stages,
             outputs={s.value: o for s, o in outputs.items()},
             duration_seconds=duration,
-            escalations=[e.to_dict() for e in self._escalations]
+            escalations=[e.to_dict() for e in self.retention.escalations(workflow_id)],
+            cache_hits=sum(t.cache_hits for t in tasks.values()),
+            cache_misses=sum(t.cache_misses for t in tasks.values()),
+            stages_reused=[s for s in completed_stages if tasks[s].reused],
+            stages_cancelled=cancelled,
+            cancel_reason=control.reason
+        )
+    
+    async def _execute_dag(
+        self,
+        workflow_def: list,
+        tasks: dict[WorkflowStage, WorkflowTask],
+        context: dict,
+        max_parallelism: int,
+        completed_stages: Optional[list[WorkflowStage]] = None,
+        failed_stages: Optional[list[WorkflowStage]] = None,
+        outputs: Optional[dict[WorkflowStage, ContractOutput]] = None,
+        on_stage_complete: Optional[Callable[[], None]] = None,
+        control: Optional[_WorkflowControl] = None
+    ) -> tuple[list[WorkflowStage], list[WorkflowStage], dict]:
+        """
+        Run stages with a ready-set scheduler.
+        
+        Every pending stage whose dependencies are complete is launched,
+        up to max_parallelism at once. A failure is passed to
+        _handle_failure; if it is routed, the routing target and every
+        stage downstream of it run again. An unrecoverable failure stops
+        new launches and lets running stages finish.
+        
+        A pending stage that completed before (e.g. downstream of a routed
+        failure) is only executed again if a context key or upstream output
+        it read has changed; otherwise its previous output is reused. The
+        failed stage and the routing target always run again.
+        
+        completed_stages, failed_stages and outputs are updated in place
+        when given (stages already COMPLETED in tasks are not re-run), and
+        on_stage_complete is called after each stage completes.
+        
+        When control is cancelled or its deadline passes, running stages
+        are cancelled and every unfinished stage is marked CANCELLED
+        (control.reason says why). Running stages are also cancelled if
+        this coroutine itself is.
+        
+        Returns (completed stages, failed stages, outputs by stage).
+        """
+        order = [stage for stage, _, _ in workflow_def]
+        deps = {
+            stage: [d for d in stage_deps if d in tasks]
+            for stage, _, stage_deps in workflow_def
+        }
+        dependents = {
+            stage: [s for s in order if stage in deps[s]]
+            for stage in order
+        }
+        
+        completed_stages = completed_stages if completed_stages is not None else []
+        failed_stages = failed_stages if failed_stages is not None else []
+        outputs = outputs if outputs is not None else {}
+        running: dict[asyncio.Task, WorkflowStage] = {}
+        stale: set[WorkflowStage] = set()  # Running, but reset by a routed failure
+        forced: set[WorkflowStage] = set()  # Must execute even if inputs are unchanged
+        launch_reads: dict[WorkflowStage, dict[str, str]] = {}
+        stopped = False
+        cancel_waiter = (
+            asyncio.ensure_future(control.cancel_requested.wait()) if control else None
+        )
+        
+        try:
+            while True:
+                progressed = not stopped
+                while progressed:
+                    progressed = False
+                    for stage in order:
+                        if len(running) >= max_parallelism:
+                            break
+                        task = tasks[stage]
+                        if task.status != TaskStatus.PENDING:
+                            continue
+                        if not all(tasks[d].status == TaskStatus.COMPLETED for d in deps[stage]):
+                            continue
+                        
+                        if stage not in forced and self._reads_unchanged(task, context, outputs):
+                            self._log(f"Reusing {stage.value}: inputs unchanged")
+                            task.status = TaskStatus.COMPLETED
+                            task.reused = True
+                            completed_stages.append(stage)
+                            outputs[stage] = task.output_data
+                            self._update_context(stage, task.output_data, context)
+                            await events.publish(
+                                EventType.STAGE_COMPLETED, stage=stage.value, reused=True
+                            )
+                            progressed = True  # May unblock stages earlier in order
+                            continue
+                        
+                        forced.discard(stage)
+                        task.input_data, launch_reads[stage] = self._prepare_tracked_input(
+                            stage, context, outputs
+                        )
+                        task.status = TaskStatus.QUEUED
+                        running[asyncio.create_task(self._run_stage(task))] = stage
+                
+                if not running:
+                    break
+                
+                waiters = set(running)
+                if cancel_waiter is not None:
+                    waiters.add(cancel_waiter)
+                done, _ = await asyncio.wait(
+                    waiters,
+                    timeout=control.remaining() if control else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    if future is cancel_waiter:
+                        continue
+                    stage = running.pop(future)
+                    task = tasks[stage]
+                    task.completed_at = datetime.now()
+                    
+                    if stage in stale:
+                        stale.discard(stage)
+                        task.status = TaskStatus.PENDING
+                        continue
+                    
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        task.status = TaskStatus.FAILED
+                        task.error = str(e)
+                        self._log(f"Stage {stage.value} failed: {e}")
+                        await events.publish(
+                            EventType.STAGE_FAILED,
+                            stage=stage.value,
+                            error=task.error,
+                            retry_count=task.retry_count
+                        )
+                        
+                        # Handle failure routing
+                        if await self._handle_failure(stage, task, tasks, context):
+                            task.retry_count += 1
+                            target = FAILURE_ROUTING[stage]
+                            await events.publish(
+                                EventType.RETRY_SCHEDULED,
+                                stage=stage.value,
+                                target=target.value,
+                                retry_count=task.retry_count
+                            )
+                            rerun = self._downstream(target, dependents) | {target, stage}
+                            forced |= {target, stage}
+                            for s in rerun:
+                                if tasks[s].status in (TaskStatus.QUEUED, TaskStatus.RUNNING):
+                                    stale.add(s)
+                                elif tasks[s].status != TaskStatus.PENDING:
+                                    tasks[s].status = TaskStatus.PENDING
+                                if s in completed_stages:
+                                    completed_stages.remove(s)
+                        else:
+                            failed_stages.append(stage)
+                            stopped = True  # Stop workflow on unrecoverable failure
+                        continue
+                    
+                    task.output_data = output
+                    task.read_fingerprints = launch_reads.pop(stage, {})
+                    task.reused = False
+                    task.status = TaskStatus.COMPLETED
+                    completed_stages.append(stage)
+                    outputs[stage] = output
+                    
+                    # Update context for next stages
+                    self._update_context(stage, output, context)
+                    
+                    if on_stage_complete:
+                        on_stage_complete()
+                    
+                    await events.publish(
+                        EventType.STAGE_COMPLETED,
+                        stage=stage.value,
+                        reused=False,
+                        duration_seconds=(
+                            (task.completed_at - task.started_at).total_seconds()
+                            if task.started_at else 0.0
+                        ),
+                        wait_seconds=task.wait_seconds,
+                        verdict=getattr(getattr(output, "verdict", None), "value", None)
+                    )
+                
+                if control is not None and (
+                    control.cancel_requested.is_set() or control.remaining() == 0
+                ):
+                    if control.reason is None:
+                        control.reason = f"Workflow timed out after {control.timeout}s"
+                    self._log(f"Stopping workflow: {control.reason}")
+                    break
+        finally:
+            if cancel_waiter is not None:
+                cancel_waiter.cancel()
+            # Cancel stages still running and wait for them to clean up
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        if control is not None and control.reason:
+            for stage in order:
+                if tasks[stage].status in (TaskStatus.PENDING, TaskStatus.QUEUED, TaskStatus.RUNNING):
+                    tasks[stage].status = TaskStatus.CANCELLED
+                    tasks[stage].error = control.reason
+            return completed_stages, failed_stages, outputs
+        
+        if not stopped:
+            for stage in order:
+                if tasks[stage].status == TaskStatus.PENDING:
+                    tasks[stage].status = TaskStatus.BLOCKED
+                    failed_stages.append(stage)
+        
+        return completed_stages, failed_stages, outputs
+    
+    @staticmethod
+    def _downstream(
+        stage: WorkflowStage,
+        dependents: dict[WorkflowStage, list[WorkflowStage]]
+    ) -> set[WorkflowStage]:
+        """Stages that transitively depend on stage."""
+        found: set[WorkflowStage] = set()
+        frontier = list(dependents.get(stage, []))
+        while frontier:
+            current = frontier.pop()
+            if current not in found:
+                found.add(current)
+                frontier.extend(dependents.get(current, []))
+        return found
+    
+    async def _run_stage(self, task: WorkflowTask) -> ContractOutput:
+        """
+        Execute one stage with its agent once the scheduler grants a slot.
+        
+        Cache hits return without taking a slot.
+        """
+        with tracing.span(
+            "stage", stage=task.stage.value, agent=task.agent_name, workflow_id=task.workflow_id
+        ) as span, events.stage_scope(task.stage.value):
+            agent = self._agents.get(task.agent_name)
+            if not agent:
+                raise ValueError(f"Agent not found: {task.agent_name}")
+            
+            # Re-executions after a routed failure must not replay the cached output
+            cache_key = None
+            if self.stage_cache is not None and task.retry_count == 0:
+                cache_key, cached = self.stage_cache.lookup(
+                    task.agent_name, getattr(agent, "config", None), task.input_data
+                )
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    task.cache_hits += 1
+                    task.started_at = datetime.now()
+                    self._log(f"Cache hit for {task.stage.value}")
+                    events.emit(EventType.STAGE_STARTED, agent=task.agent_name, cached=True)
+                    return cached
+                task.cache_misses += 1
+            
+            async with self.scheduler.slot(
+                task.agent_name, task.priority, task.tenant, task.workflow_id
+            ) as ticket:
+                task.wait_seconds += ticket.wait_seconds
+                span.set_attribute("wait_seconds", ticket.wait_seconds)
+                task.status = TaskStatus.RUNNING
+                task.started_at = datetime.now()
+                self._log(f"Executing {task.stage.value} with {task.agent_name}")
+                # Not awaited: a slow consumer must not hold a scheduler slot
+                events.emit(
+                    EventType.STAGE_STARTED,
+                    agent=task.agent_name,
+                    cached=False,
+                    wait_seconds=ticket.wait_seconds
+                )
+                if self.work_queue is not None:
+                    execution = self._run_queued(task)
+                else:
+                    execution = agent.execute(task.input_data)
+                try:
+                    output = await asyncio.wait_for(execution, task.timeout)
+                except asyncio.TimeoutError:
+                    raise asyncio.TimeoutError(
+                        f"Stage {task.stage.value} timed out after {task.timeout}s"
+                    ) from None
+            
+            if cache_key is not None:
+                self.stage_cache.put(cache_key, output)
+            return output
+        
+    async def _run_queued(self, task: WorkflowTask) -> ContractOutput:
+        """Execute a stage on a queue worker and wait for its output."""
+        job_id = self.work_queue.enqueue(
+            task.agent_name, task.input_data, workflow_id=task.workflow_id, stage=task.stage.value
         )
+        span = tracing.current_span()
+        if span is not None:
+            span.set_attribute("job_id", job_id)
+        try:
+            return await self.work_queue.wait(job_id)
+        finally:
+            # Also tells a worker still running it (on cancellation) to stop
+            self.work_queue.delete(job_id)
     
     def _prepare_input(
         self,
@@ -359,6 +1000,46 @@ class Orchestrator:
         else:
             raise ValueError(f"Unknown stage: {stage}")
     
+    def _prepare_tracked_input(
+        self,
+        stage: WorkflowStage,
+        context: dict,
+        outputs: dict
+    ) -> tuple[ContractInput, dict[str, str]]:
+        """Prepare a stage's input and fingerprint everything it read."""
+        context_reads: set = set()
+        output_reads: set = set()
+        input_data = self._prepare_input(
+            stage,
+            _RecordingDict(context, context_reads),
+            _RecordingDict(outputs, output_reads)
+        )
+        return input_data, self._fingerprint_reads(
+            context, outputs,
+            [f"context.{k}" for k in context_reads] +
+            [f"output.{s.value}" for s in output_reads]
+        )
+    
+    @staticmethod
+    def _fingerprint_reads(context: dict, outputs: dict, keys: list[str]) -> dict[str, str]:
+        """Current fingerprints of "context.<key>" / "output.<stage>" reads."""
+        fingerprints = {}
+        for key in keys:
+            kind, _, name = key.partition(".")
+            if kind == "context":
+                value = context.get(name)
+            else:
+                value = outputs.get(WorkflowStage(name))
+            fingerprints[key] = content_hash(value)
+        return fingerprints
+    
+    def _reads_unchanged(self, task: WorkflowTask, context: dict, outputs: dict) -> bool:
+        """Whether a previously completed stage would see the same inputs."""
+        if task.output_data is None or not task.read_fingerprints:
+            return False
+        current = self._fingerprint_reads(context, outputs, list(task.read_fingerprints))
+        return current == task.read_fingerprints
+    
     def _update_context(self, stage: WorkflowStage, output: ContractOutput, context: dict) -> None:
         """Update context with stage output."""
         if stage == WorkflowStage.REQUIREMENTS:
@@ -415,9 +1096,15 @@ class Orchestrator:
         self,
         topic: str,
         agents_involved: list[str],
-        evidence: list[dict]
+        evidence: list[dict],
+        workflow_id: Optional[str] = None
     ) -> ConflictRecord:
-        """Escalate a conflict for resolution."""
+        """
+        Escalate a conflict for resolution.
+        
+        The conflict belongs to workflow_id, or to the workflow whose stage
+        raised it when called during a workflow.
+        """
         # Determine decision owner based on authority
         max_authority = 0
         decision_owner = "ArchitectAgent"  # Default to highest
@@ -439,34 +1126,71 @@ class Orchestrator:
             decision_owner=decision_owner
         )
         
-        self._escalations.append(conflict)
+        self.retention.add_escalation(workflow_id or _current_workflow.get(), conflict)
+        await events.publish(
+            EventType.ESCALATION_RAISED,
+            conflict_id=conflict.conflict_id,
+            topic=topic,
+            agents_involved=agents_involved,
+            decision_owner=decision_owner
+        )
         
         self._log(f"Conflict escalated to {decision_owner}: {topic}")
         
         return conflict
     
-    async def resolve_conflict(self, conflict_id: str, resolution: dict) -> bool:
-        """Resolve an escalated conflict."""
-        for conflict in self._escalations:
-            if conflict.conflict_id == conflict_id:
-                conflict.resolution = resolution
-                conflict.resolved_at = datetime.now()
-                self._log(f"Conflict {conflict_id} resolved")
-                return True
-        return False
+    async def resolve_conflict(
+        self,
+        conflict_id: str,
+        resolution: dict,
+        workflow_id: Optional[str] = None
+    ) -> bool:
+        """
+        Resolve an escalated conflict.
+        
+        Pass workflow_id to resolve a conflict of an archived workflow.
+        """
+        conflict = self.retention.find_escalation(conflict_id)
+        if conflict is not None:
+            conflict.resolution = resolution
+            conflict.resolved_at = datetime.now()
+        elif not (workflow_id and self.retention.resolve_archived_escalation(
+            workflow_id, conflict_id, resolution
+        )):
+            return False
+        self._log(f"Conflict {conflict_id} resolved")
+        return True
     
     def get_workflow_status(self, workflow_id: str) -> Optional[dict]:
-        """Get status of a workflow."""
-        tasks = self._active_workflows.get(workflow_id)
-        if not tasks:
+        """
+        Get status of a workflow.
+        
+        Workflows evicted from memory are answered from the archive
+        ("archived": True, without queue information).
+        """
+        record = self.retention.get(workflow_id)
+        if record is None:
+            status = self.retention.get_archived(workflow_id)
+            if status is not None:
+                status.update(archived=True, queue=None)
+            return status
+        if not record.tasks:
             return None
         
         return {
-            "workflow_id": workflow_id,
-            "tasks": [t.to_dict() for t in tasks],
-            "progress": sum(1 for t in tasks if t.status == TaskStatus.COMPLETED) / len(tasks)
+            **record.status(),
+            "queue": self.scheduler.get_workflow_queue(workflow_id),
+            "archived": False
         }
     
+    def register_agent(self, agent: BaseAgent) -> None:
+        """Add or replace the agent that serves agent.name in workflows."""
+        self._agents[agent.name] = agent
+    
+    def get_queue_status(self) -> dict:
+        """Get scheduler queue depth, utilisation and wait times across workflows."""
+        return self.scheduler.get_status()
+    
     def get_agent_scorecards(self) -> dict:
         """Get performance scorecards for all agents."""
         return self.evaluation.get_all_scores()
@@ -0,0 +1,217 @@
+"""
+Worker processes for the durable work queue.
+
+A QueueWorker claims jobs from a WorkQueue, runs each with the agent
+named in the job (created through AgentRegistry), renews the lease while
+the agent runs, and writes the output or error back. Any number of
+workers, in any number of processes, can serve one queue file.
+
+Start workers with ``macds worker --queue PATH --workers N``, or from
+Python with start_workers().
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+import asyncio
+import importlib
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+
+from macds.core.work_queue import Job, WorkQueue
+
+
+class QueueWorker:
+    """Runs queued stages with AgentRegistry agents."""
+
+    def __init__(
+        self,
+        queue: Union[WorkQueue, Path],
+        worker_id: Optional[str] = None,
+        concurrency: int = 1,
+        lease_seconds: float = 30.0,
+        poll_interval: float = 0.1,
+        agent_names: Optional[list[str]] = None,
+        memory_store=None,
+        evaluation=None
+    ):
+        """
+        Args:
+            queue: WorkQueue, or path of its database
+            worker_id: Lease owner name (defaults to host:pid:object id)
+            concurrency: Jobs run at once by this worker
+            lease_seconds: Lease length; renewed every third of it
+            poll_interval: Sleep between claims when the queue is empty
+            agent_names: Only claim jobs for these agents
+            memory_store: MemoryStore for agents (defaults to the project's)
+            evaluation: EvaluationSystem for agents (defaults to the project's)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.queue = queue if isinstance(queue, WorkQueue) else WorkQueue(queue)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.agent_names = agent_names
+        self._memory_store = memory_store
+        self._evaluation = evaluation
+        self._agents: dict = {}
+
+        self.completed = 0
+        self.failed = 0
+
+    def _agent(self, name: str):
+        from macds.agents.base import AgentRegistry
+        from macds.core.evaluation import EvaluationSystem
+        from macds.core.memory import MemoryStore
+
+        if name not in self._agents:
+            if self._memory_store is None:
+                self._memory_store = MemoryStore()
+            if self._evaluation is None:
+                self._evaluation = EvaluationSystem(save_delay=1.0)
+            self._agents[name] = AgentRegistry.create(
+                name, memory_store=self._memory_store, evaluation=self._evaluation
+            )
+        return self._agents[name]
+
+    async def run(
+        self,
+        stop: Optional[asyncio.Event] = None,
+        max_jobs: Optional[int] = None
+    ) -> int:
+        """
+        Claim and run jobs until stop is set (or max_jobs were claimed).
+
+        Running jobs are finished before returning. If this coroutine is
+        cancelled, running jobs are released back to the queue instead.
+        Returns the number of jobs claimed.
+        """
+        stop = stop or asyncio.Event()
+        running: dict[asyncio.Task, Job] = {}
+        claimed = 0
+        try:
+            while not stop.is_set() and (max_jobs is None or claimed < max_jobs):
+                if len(running) < self.concurrency:
+                    job = self.queue.claim(self.worker_id, self.lease_seconds, self.agent_names)
+                    if job is not None:
+                        claimed += 1
+                        task = asyncio.create_task(self._execute(job))
+                        running[task] = job
+                        task.add_done_callback(lambda t: running.pop(t, None))
+                        continue
+                await asyncio.sleep(self.poll_interval)
+            if running:
+                await asyncio.gather(*running)
+        except asyncio.CancelledError:
+            for task, job in list(running.items()):
+                task.cancel()
+                self.queue.release(job.id, self.worker_id)
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        return claimed
+
+    async def _execute(self, job: Job) -> None:
+        """Run one job, renewing its lease, and record the outcome."""
+        agent = self._agent(job.agent_name)
+        if agent is None:
+            self.queue.fail(job.id, self.worker_id, f"Unknown agent: {job.agent_name}")
+            self.failed += 1
+            return
+
+        execution = asyncio.create_task(agent.execute(job.input_data))
+        heartbeat = asyncio.create_task(self._heartbeat(job, execution))
+        try:
+            output = await execution
+        except asyncio.CancelledError:
+            if heartbeat.done():
+                return  # Lease lost; another worker or the canceller owns the job
+            raise
+        except Exception as e:
+            self.queue.fail(job.id, self.worker_id, f"{type(e).__name__}: {e}")
+            self.failed += 1
+            return
+        finally:
+            heartbeat.cancel()
+
+        try:
+            stored = self.queue.complete(job.id, self.worker_id, output)
+        except Exception as e:  # e.g. the output cannot be pickled
+            stored = self.queue.fail(job.id, self.worker_id, f"Cannot store result: {e}")
+            self.failed += 1
+            return
+        if stored:
+            self.completed += 1
+
+    async def _heartbeat(self, job: Job, execution: asyncio.Task) -> None:
+        """Renew the lease; cancel the execution if the lease is lost."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not self.queue.heartbeat(job.id, self.worker_id, self.lease_seconds):
+                execution.cancel()
+                return
+
+
+def run_worker(
+    queue_path: Path,
+    concurrency: int = 1,
+    lease_seconds: float = 30.0,
+    imports: tuple = (),
+    max_jobs: Optional[int] = None,
+    storage_dir: Optional[Path] = None
+) -> int:
+    """
+    Process entry point: serve a queue until SIGTERM/SIGINT.
+
+    imports names modules to import first, so agents they register with
+    AgentRegistry can be served. The built-in agents are always available.
+    Agents keep memory and evaluation data under storage_dir (default:
+    the project's .macds directory).
+    """
+    import macds.agents  # noqa: F401 - registers the built-in agents
+
+    for module in imports:
+        importlib.import_module(module)
+
+    async def serve() -> int:
+        stop = asyncio.Event()
+        if sys.platform != "win32":
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, stop.set)
+        stores = {}
+        if storage_dir is not None:
+            from macds.core.evaluation import EvaluationSystem
+            from macds.core.memory import MemoryStore
+            stores = {
+                "memory_store": MemoryStore(Path(storage_dir) / "memory"),
+                "evaluation": EvaluationSystem(Path(storage_dir) / "evaluation", save_delay=1.0)
+            }
+        worker = QueueWorker(
+            queue_path, concurrency=concurrency, lease_seconds=lease_seconds, **stores
+        )
+        return await worker.run(stop, max_jobs=max_jobs)
+
+    return asyncio.run(serve())
+
+
+def start_workers(count: int, queue_path: Path, **kwargs) -> list[multiprocessing.Process]:
+    """
+    Start count worker processes serving queue_path.
+
+    kwargs are passed to run_worker. Stop the workers with
+    process.terminate() (they finish their running jobs first).
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for i in range(count):
+        process = context.Process(
+            target=run_worker, args=(Path(queue_path),), kwargs=kwargs,
+            name=f"macds-worker-{i}"
+        )
+        process.start()
+        processes.append(process)
+    return processes
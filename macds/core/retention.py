@@ -0,0 +1,297 @@
+"""
+Bounded retention of workflow state for MACDS.
+
+The orchestrator keeps each workflow's tasks (with their full contract
+inputs and outputs) and its escalations in memory while it runs. Once
+it finishes, the workflow is kept for ttl_seconds, and at most
+max_finished finished workflows are kept at all; the least recently
+used go first. An evicted workflow is written to a WorkflowArchive as
+its status summary (task states, errors, timings and escalations,
+without contract payloads), so get_workflow_status() can still answer
+for it. The archive itself keeps at most max_workflows files and drops
+files older than its ttl_seconds.
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+@dataclass
+class WorkflowRecord:
+    """In-memory state of a running or recently finished workflow."""
+    workflow_id: str
+    tasks: list  # WorkflowTask
+    escalations: list = field(default_factory=list)  # ConflictRecord
+    finished_at: Optional[float] = None  # time.monotonic()
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def status(self) -> dict:
+        """Status summary without contract payloads (what gets archived)."""
+        tasks = [t.to_dict() for t in self.tasks]
+        return {
+            "workflow_id": self.workflow_id,
+            "tasks": tasks,
+            "progress": sum(1 for t in tasks if t["status"] == "completed") / len(tasks) if tasks else 0.0,
+            "wait_seconds": sum(t.wait_seconds for t in self.tasks),
+            "escalations": [c.to_dict() for c in self.escalations]
+        }
+
+
+class WorkflowArchive:
+    """
+    One JSON status file per evicted workflow.
+
+    Saving prunes the oldest files beyond max_workflows and any older than
+    ttl_seconds (None disables either limit).
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(
+        self,
+        archive_dir: Optional[Path] = None,
+        max_workflows: Optional[int] = 1000,
+        ttl_seconds: Optional[float] = 30 * 86400.0
+    ):
+        if max_workflows is not None and max_workflows < 1:
+            raise ValueError("max_workflows must be at least 1")
+        self.archive_dir = Path(archive_dir or Path.cwd() / ".macds" / "workflows")
+        self.max_workflows = max_workflows
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+    def _path(self, workflow_id: str) -> Path:
+        return self.archive_dir / f"{workflow_id}{self.SUFFIX}"
+
+    def save(self, workflow_id: str, status: dict) -> None:
+        """Atomically write a workflow's status."""
+        data = json.dumps(status, default=str)
+        with self._lock:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.archive_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, self._path(workflow_id))
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        self.prune()
+
+    def load(self, workflow_id: str) -> Optional[dict]:
+        """A workflow's archived status, or None."""
+        try:
+            return json.loads(self._path(workflow_id).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, workflow_id: str) -> bool:
+        try:
+            self._path(workflow_id).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def list_workflows(self) -> list[str]:
+        """IDs of archived workflows."""
+        if not self.archive_dir.exists():
+            return []
+        return sorted(p.stem for p in self.archive_dir.glob(f"*{self.SUFFIX}"))
+
+    def prune(self) -> list[str]:
+        """Delete expired and excess archived workflows. Returns their IDs."""
+        if self.max_workflows is None and self.ttl_seconds is None:
+            return []
+        with self._lock:
+            files = []
+            for path in self.archive_dir.glob(f"*{self.SUFFIX}"):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    continue
+            files.sort()  # Oldest first
+
+            excess = len(files) - self.max_workflows if self.max_workflows is not None else 0
+            cutoff = time.time() - self.ttl_seconds if self.ttl_seconds is not None else None
+            removed = []
+            for i, (mtime, path) in enumerate(files):
+                if i >= excess and (cutoff is None or mtime >= cutoff):
+                    break
+                try:
+                    path.unlink()
+                    removed.append(path.stem)
+                except FileNotFoundError:
+                    pass
+            return removed
+
+
+class WorkflowRetention:
+    """
+    Keeps running workflows in memory and bounds finished ones.
+
+    Finished workflows leave memory when they are older than ttl_seconds
+    or when more than max_finished are held (least recently looked up
+    first). Evicted workflows go to the archive if there is one, and are
+    dropped otherwise. Eviction happens when workflows start or finish
+    and on lookup; there is no background timer.
+
+    Escalations raised outside any workflow are kept in a list of at most
+    max_finished entries.
+    """
+
+    def __init__(
+        self,
+        archive: Optional[WorkflowArchive] = None,
+        ttl_seconds: Optional[float] = 3600.0,
+        max_finished: int = 100
+    ):
+        if max_finished < 0:
+            raise ValueError("max_finished must not be negative")
+        self.archive = archive
+        self.ttl_seconds = ttl_seconds
+        self.max_finished = max_finished
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        self._running: dict[str, WorkflowRecord] = {}
+        self._finished: OrderedDict[str, WorkflowRecord] = OrderedDict()  # LRU first
+        self._unscoped: deque = deque(maxlen=max(1, max_finished))
+
+    def track(self, workflow_id: str, tasks: list) -> WorkflowRecord:
+        """Register a starting (or resumed) workflow."""
+        with self._lock:
+            previous = self._finished.pop(workflow_id, None) or self._running.get(workflow_id)
+            record = WorkflowRecord(
+                workflow_id=workflow_id,
+                tasks=tasks,
+                escalations=previous.escalations if previous else []
+            )
+            self._running[workflow_id] = record
+            self.prune()
+            return record
+
+    def finish(self, workflow_id: str) -> None:
+        """Mark a workflow finished; it now counts against the limits."""
+        with self._lock:
+            record = self._running.pop(workflow_id, None)
+            if record is None:
+                return
+            record.finished_at = time.monotonic()
+            self._finished[workflow_id] = record
+            self.prune()
+
+    def get(self, workflow_id: str) -> Optional[WorkflowRecord]:
+        """The in-memory record of a workflow (marks it recently used)."""
+        with self._lock:
+            record = self._running.get(workflow_id)
+            if record is not None:
+                return record
+            self.prune()
+            record = self._finished.get(workflow_id)
+            if record is not None:
+                self._finished.move_to_end(workflow_id)
+            return record
+
+    def get_archived(self, workflow_id: str) -> Optional[dict]:
+        if self.archive is None:
+            return None
+        return self.archive.load(workflow_id)
+
+    def add_escalation(self, workflow_id: Optional[str], conflict: Any) -> None:
+        """Attach an escalation to its workflow, in memory or archived (or the unscoped list)."""
+        with self._lock:
+            record = self._running.get(workflow_id) or self._finished.get(workflow_id)
+            if record is not None:
+                record.escalations.append(conflict)
+                return
+            status = self.get_archived(workflow_id) if workflow_id else None
+            if status is not None:
+                status.setdefault("escalations", []).append(conflict.to_dict())
+                self.archive.save(workflow_id, status)
+            else:
+                self._unscoped.append(conflict)
+
+    def escalations(self, workflow_id: Optional[str] = None) -> list:
+        """Escalations of a workflow in memory (unscoped ones for None)."""
+        with self._lock:
+            if workflow_id is None:
+                return list(self._unscoped)
+            record = self._running.get(workflow_id) or self._finished.get(workflow_id)
+            return list(record.escalations) if record else []
+
+    def find_escalation(self, conflict_id: str) -> Optional[Any]:
+        """An in-memory escalation by ID."""
+        with self._lock:
+            records = list(self._running.values()) + list(self._finished.values())
+            candidates = [c for r in records for c in r.escalations] + list(self._unscoped)
+            for conflict in candidates:
+                if conflict.conflict_id == conflict_id:
+                    return conflict
+            return None
+
+    def resolve_archived_escalation(self, workflow_id: str, conflict_id: str, resolution: dict) -> bool:
+        """Record the resolution of an escalation of an archived workflow."""
+        with self._lock:
+            status = self.get_archived(workflow_id)
+            if status is None:
+                return False
+            for conflict in status.get("escalations", []):
+                if conflict["conflict_id"] == conflict_id:
+                    conflict["resolution"] = resolution
+                    conflict["resolved_at"] = datetime.now().isoformat()
+                    self.archive.save(workflow_id, status)
+                    return True
+            return False
+
+    def prune(self) -> list[str]:
+        """Evict expired and excess finished workflows. Returns their IDs."""
+        with self._lock:
+            evicted = []
+            if self.ttl_seconds is not None:
+                cutoff = time.monotonic() - self.ttl_seconds
+                evicted += [
+                    wid for wid, record in self._finished.items()
+                    if record.finished_at <= cutoff
+                ]
+            excess = len(self._finished) - len(evicted) - self.max_finished
+            for wid in self._finished:
+                if excess <= 0:
+                    break
+                if wid not in evicted:
+                    evicted.append(wid)
+                    excess -= 1
+
+            for wid in evicted:
+                record = self._finished.pop(wid)
+                if self.archive is not None:
+                    self.archive.save(wid, record.status())
+                self.evictions += 1
+            return evicted
+
+    def __len__(self) -> int:
+        return len(self._running) + len(self._finished)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": len(self._running),
+                "finished": len(self._finished),
+                "max_finished": self.max_finished,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": self.evictions,
+                "unscoped_escalations": len(self._unscoped)
+            }
@@ -0,0 +1,199 @@
+"""
+Stage scheduler for MACDS.
+
+Bounds how many agents execute at once across every workflow running on
+an Orchestrator. Each stage acquires a slot before calling its agent;
+waiting stages are granted slots by priority class, then by tenant fair
+share, then in arrival order.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Optional
+import asyncio
+import itertools
+import time
+
+
+class Priority(IntEnum):
+    """Priority classes (lower value is served first)."""
+    INTERACTIVE = 0  # A user is waiting on the result
+    NORMAL = 1
+    BATCH = 2        # Background jobs
+
+
+@dataclass
+class SlotTicket:
+    """A stage's request for an execution slot."""
+    seq: int
+    agent_name: str
+    priority: Priority
+    tenant: str
+    workflow_id: Optional[str]
+    enqueued_at: float
+    future: asyncio.Future = field(repr=False)
+    granted_at: Optional[float] = None
+
+    @property
+    def wait_seconds(self) -> float:
+        """Time spent queued (so far, if not yet granted)."""
+        end = self.granted_at if self.granted_at is not None else time.monotonic()
+        return end - self.enqueued_at
+
+
+class StageScheduler:
+    """
+    Bounded worker pool shared by all workflows.
+
+    - ``max_workers`` caps concurrently executing stages overall.
+    - ``agent_limits`` caps concurrent executions per agent name; a
+      stage blocked by its agent's cap does not hold up others.
+    - Priority classes are served strictly in order, except that a
+      waiting stage is promoted one class per ``aging_seconds`` waited so
+      batch work cannot starve.
+    - Within a class the tenant with the fewest running stages relative
+      to its weight (``tenant_weights``, default 1) goes first.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        agent_limits: Optional[dict[str, int]] = None,
+        tenant_weights: Optional[dict[str, float]] = None,
+        aging_seconds: Optional[float] = 30.0,
+        wait_history: int = 1000
+    ):
+        self.max_workers = max_workers
+        self.agent_limits = dict(agent_limits or {})
+        self.tenant_weights = dict(tenant_weights or {})
+        self.aging_seconds = aging_seconds
+
+        self._queue: list[SlotTicket] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._running_by_agent: dict[str, int] = {}
+        self._running_by_tenant: dict[str, int] = {}
+        self._waits: deque[float] = deque(maxlen=wait_history)
+        self._granted = 0
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        agent_name: str,
+        priority: Priority = Priority.NORMAL,
+        tenant: str = "default",
+        workflow_id: Optional[str] = None
+    ) -> AsyncIterator[SlotTicket]:
+        """Hold an execution slot for the duration of the block."""
+        ticket = await self.acquire(agent_name, priority, tenant, workflow_id)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    async def acquire(
+        self,
+        agent_name: str,
+        priority: Priority = Priority.NORMAL,
+        tenant: str = "default",
+        workflow_id: Optional[str] = None
+    ) -> SlotTicket:
+        """Wait for an execution slot. Pair every call with release()."""
+        ticket = SlotTicket(
+            seq=next(self._seq),
+            agent_name=agent_name,
+            priority=Priority(priority),
+            tenant=tenant,
+            workflow_id=workflow_id,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future()
+        )
+        self._queue.append(ticket)
+        self._dispatch()
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.granted_at is not None:
+                self.release(ticket)
+            else:
+                self._queue.remove(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: SlotTicket) -> None:
+        """Return a granted slot and wake waiting stages."""
+        self._running -= 1
+        self._running_by_agent[ticket.agent_name] -= 1
+        self._running_by_tenant[ticket.tenant] -= 1
+        self._dispatch()
+
+    def _effective_priority(self, ticket: SlotTicket, now: float) -> int:
+        if not self.aging_seconds:
+            return ticket.priority
+        promoted = int((now - ticket.enqueued_at) / self.aging_seconds)
+        return max(0, ticket.priority - promoted)
+
+    def _tenant_load(self, tenant: str) -> float:
+        return self._running_by_tenant.get(tenant, 0) / self.tenant_weights.get(tenant, 1.0)
+
+    def _agent_available(self, agent_name: str) -> bool:
+        limit = self.agent_limits.get(agent_name)
+        return limit is None or self._running_by_agent.get(agent_name, 0) < limit
+
+    def _dispatch(self) -> None:
+        """Grant slots to the best eligible waiting stages."""
+        while self._queue and self._running < self.max_workers:
+            now = time.monotonic()
+            eligible = [t for t in self._queue if self._agent_available(t.agent_name)]
+            if not eligible:
+                return
+            ticket = min(eligible, key=lambda t: (
+                self._effective_priority(t, now), self._tenant_load(t.tenant), t.seq
+            ))
+            self._queue.remove(ticket)
+
+            ticket.granted_at = now
+            self._running += 1
+            self._running_by_agent[ticket.agent_name] = self._running_by_agent.get(ticket.agent_name, 0) + 1
+            self._running_by_tenant[ticket.tenant] = self._running_by_tenant.get(ticket.tenant, 0) + 1
+            self._waits.append(ticket.wait_seconds)
+            self._granted += 1
+            if not ticket.future.done():
+                ticket.future.set_result(None)
+
+    def get_workflow_queue(self, workflow_id: str) -> dict:
+        """Queue depth and longest current wait for one workflow."""
+        queued = [t for t in self._queue if t.workflow_id == workflow_id]
+        return {
+            "queued_stages": len(queued),
+            "longest_wait_seconds": max((t.wait_seconds for t in queued), default=0.0)
+        }
+
+    def get_status(self) -> dict:
+        """Pool utilisation, queue depth and recent wait times."""
+        by_priority: dict[str, int] = {}
+        by_tenant: dict[str, int] = {}
+        for ticket in self._queue:
+            name = ticket.priority.name.lower()
+            by_priority[name] = by_priority.get(name, 0) + 1
+            by_tenant[ticket.tenant] = by_tenant.get(ticket.tenant, 0) + 1
+
+        waits = sorted(self._waits)
+        return {
+            "max_workers": self.max_workers,
+            "running": self._running,
+            "running_by_agent": {k: v for k, v in self._running_by_agent.items() if v},
+            "running_by_tenant": {k: v for k, v in self._running_by_tenant.items() if v},
+            "queue_depth": len(self._queue),
+            "queued_by_priority": by_priority,
+            "queued_by_tenant": by_tenant,
+            "longest_wait_seconds": max((t.wait_seconds for t in self._queue), default=0.0),
+            "granted": self._granted,
+            "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+            "p95_wait_seconds": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+        }
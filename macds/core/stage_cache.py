@@ -0,0 +1,217 @@
+"""
+Stage result cache for MACDS workflows.
+
+Stage outputs are stored under a content hash of the agent name, the
+agent's configuration and the prepared ContractInput (excluding the
+per-run request_id and timestamp). Re-running a request, or a stage
+whose upstream outputs did not change, returns the stored ContractOutput
+instead of executing the agent again.
+
+Entries are pickled to one file each; the total size is bounded and the
+least recently used entries are evicted first. Recency survives restarts
+through file modification times.
+"""
+
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass, replace
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+
+
+# Bump when the key derivation or stored format changes
+CACHE_VERSION = 1
+
+# Per-run fields of ContractInput that never affect the result
+_VOLATILE_FIELDS = {"request_id", "timestamp"}
+
+
+def _canonical(value: Any) -> Any:
+    """Convert a value to a JSON-serializable form with a stable layout."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            "__type__": type(value).__qualname__,
+            **{f.name: _canonical(getattr(value, f.name)) for f in fields(value)
+               if f.name not in _VOLATILE_FIELDS}
+        }
+    if isinstance(value, Enum):
+        return _canonical(value.value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=repr)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Path):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def content_hash(value: Any) -> str:
+    """Stable hash of a value, ignoring per-run contract fields."""
+    payload = json.dumps(_canonical(value), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def stage_key(agent_name: str, agent_config: Any, input_data: Any) -> str:
+    """Stable hash identifying a stage execution."""
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "agent": agent_name,
+            "config": _canonical(agent_config),
+            "input": _canonical(input_data)
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class StageCache:
+    """
+    Size-bounded on-disk LRU cache of stage outputs.
+
+    Thread-safe; hits and misses are counted for the lifetime of the
+    instance (per-workflow counts are reported in WorkflowResult).
+    """
+
+    SUFFIX = ".pkl"
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir or Path.cwd() / ".macds" / "stage_cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU order from the files on disk."""
+        found = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached output for key, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    output = pickle.load(f)
+                os.utime(path)
+            except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+                # Unreadable or stale entry (e.g. contract class changed)
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return output
+
+    def put(self, key: str, output: Any) -> bool:
+        """Store an output. Returns False if it cannot be cached."""
+        try:
+            data = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+        if len(data) > self.max_bytes:
+            return False
+
+        with self._lock:
+            # Write to a temp file and rename so readers never see a partial entry
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self._path(key))
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                return False
+
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict()
+            return True
+
+    def lookup(self, agent_name: str, agent_config: Any, input_data: Any) -> tuple[str, Optional[Any]]:
+        """
+        Key a stage execution and fetch its cached output.
+
+        The output is returned with the current input's request_id.
+        """
+        key = stage_key(agent_name, agent_config, input_data)
+        output = self.get(key)
+        if output is not None and is_dataclass(output) and hasattr(output, "request_id"):
+            output = replace(output, request_id=input_data.request_id)
+        return key, output
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
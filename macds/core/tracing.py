@@ -0,0 +1,282 @@
+"""
+Tracing for MACDS.
+
+Code paths open nested spans with ``span(name, **attributes)``; each span
+records wall-clock timing, attributes and its parent, and is handed to
+the active tracer's exporters when it ends. Parent/child links follow
+contextvars, so spans opened in asyncio tasks nest under the span that
+created the task (workflow -> stage -> agent.execute -> ...).
+
+Tracing is off until set_tracer() installs a Tracer with exporters; a
+disabled span costs one attribute check.
+
+Exporters:
+- InMemoryExporter: keeps spans in a list (tests, ad-hoc inspection)
+- JSONLinesExporter: one JSON object per finished span
+- ChromeTraceExporter: trace-event JSON for chrome://tracing / Perfetto
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+import asyncio
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+
+
+@dataclass
+class Span:
+    """A timed operation."""
+    name: str
+    span_id: str
+    trace_id: str
+    parent_id: Optional[str] = None
+    start_time: float = 0.0  # Epoch seconds
+    end_time: Optional[float] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"  # ok, error, cancelled
+    lane: int = 0  # Thread or asyncio task the span ran on
+
+    @property
+    def duration(self) -> float:
+        """Seconds from start to end (so far, if still open)."""
+        end = self.end_time if self.end_time is not None else time.time()
+        return end - self.start_time
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "trace_id": self.trace_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "status": self.status,
+            "lane": self.lane
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("macds_current_span", default=None)
+
+
+class SpanExporter:
+    """Receives finished spans."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Collects finished spans in a list."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def find(self, name: str) -> list[Span]:
+        """Finished spans with the given name."""
+        return [s for s in self.spans if s.name == name]
+
+    def children(self, parent: Span) -> list[Span]:
+        """Direct children of a span."""
+        return [s for s in self.spans if s.parent_id == parent.span_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JSONLinesExporter(SpanExporter):
+    """Appends each finished span to a file as one JSON line."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ChromeTraceExporter(SpanExporter):
+    """
+    Writes spans in Chrome trace-event format.
+
+    Each span becomes a complete ("X") event; lanes map to thread IDs so
+    concurrent stages appear as parallel tracks. The file is written on
+    flush() and close().
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._events: list[dict] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        event = {
+            "name": span.name,
+            "cat": span.name.split(".")[0],
+            "ph": "X",
+            "ts": span.start_time * 1e6,
+            "dur": span.duration * 1e6,
+            "pid": os.getpid(),
+            "tid": span.lane,
+            "args": {**span.attributes, "status": span.status, "span_id": span.span_id}
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def flush(self) -> None:
+        with self._lock:
+            payload = {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def close(self) -> None:
+        self.flush()
+
+
+class Tracer:
+    """Creates spans and sends finished ones to its exporters."""
+
+    MAX_LANES = 10_000
+
+    def __init__(self, exporters: Optional[list[SpanExporter]] = None):
+        self.exporters: list[SpanExporter] = list(exporters or [])
+        self._lanes: dict[int, int] = {}
+        self._lane_ids = itertools.count(1)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def _lane(self) -> int:
+        """Small stable ID for the current asyncio task (or thread)."""
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        lane = self._lanes.get(key)
+        if lane is None:
+            if len(self._lanes) >= self.MAX_LANES:
+                self._lanes.clear()
+            lane = self._lanes[key] = next(self._lane_ids)
+        return lane
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Time the enclosed block as a child of the current span."""
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            span_id=uuid.uuid4().hex[:16],
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=attributes,
+            lane=self._lane()
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except asyncio.CancelledError:
+            span.status = "cancelled"
+            raise
+        except BaseException as e:
+            span.status = "error"
+            span.attributes["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_time = time.time()
+            _current_span.reset(token)
+            for exporter in self.exporters:
+                exporter.export(span)
+
+    def close(self) -> None:
+        for exporter in self.exporters:
+            exporter.close()
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """The active tracer."""
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Tracer:
+    """Install a tracer (None disables tracing). Returns the previous one."""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer or Tracer()
+    return previous
+
+
+def span(name: str, **attributes: Any):
+    """Open a span on the active tracer (no-op while tracing is disabled)."""
+    if not _tracer.exporters:
+        return _NOOP_SPAN
+    return _tracer.span(name, **attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator: run a (synchronous) function inside a span."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _tracer.exporters:
+                return fn(*args, **kwargs)
+            with _tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this context."""
+    return _current_span.get()
@@ -0,0 +1,281 @@
+"""
+Durable local work queue for MACDS.
+
+An Orchestrator given a WorkQueue does not call its agents directly:
+each stage is enqueued into a SQLite database and executed by worker
+processes (see macds.core.queue_worker) that share the database file.
+Workers claim jobs with a lease and renew it while the agent runs; a job
+whose worker died is claimed again once its lease expires, up to
+max_attempts times. Results are written back to the job row, where the
+orchestrator picks them up. No broker is needed; scaling out means
+starting more workers on the same machine (or shared disk).
+
+Contract inputs and outputs are pickled into the job rows.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class JobFailedError(Exception):
+    """A queued job failed, was cancelled or vanished."""
+
+
+@dataclass
+class Job:
+    """A claimed unit of work: run agent_name on input_data."""
+    id: str
+    agent_name: str
+    input_data: Any
+    workflow_id: str = ""
+    stage: str = ""
+    attempts: int = 0
+    max_attempts: int = 3
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None  # Epoch seconds
+
+
+class WorkQueue:
+    """
+    SQLite-backed job queue with leases.
+
+    Job states: pending -> leased -> done | failed, or cancelled. Every
+    state change is one IMMEDIATE transaction, so any number of processes
+    can enqueue, claim and complete jobs concurrently; WAL mode keeps
+    status polling from blocking writers.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            workflow_id TEXT NOT NULL DEFAULT '',
+            stage TEXT NOT NULL DEFAULT '',
+            agent_name TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            lease_owner TEXT,
+            lease_expires REAL,
+            result BLOB,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at);
+    """
+
+    FINISHED = ("done", "failed", "cancelled")
+
+    def __init__(self, db_path: Optional[Path] = None, busy_timeout: float = 30.0):
+        self.db_path = Path(db_path or Path.cwd() / ".macds" / "work_queue.db")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # Autocommit mode: transactions are opened explicitly in _write()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=busy_timeout, check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # executescript() manages its own transaction; IF NOT EXISTS makes it idempotent
+        self._conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one IMMEDIATE (write-locked) transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(
+        self,
+        agent_name: str,
+        input_data: Any,
+        workflow_id: str = "",
+        stage: str = "",
+        max_attempts: int = 3
+    ) -> str:
+        """Add a job; returns its ID."""
+        job_id = uuid.uuid4().hex
+        payload = pickle.dumps(input_data, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, workflow_id, stage, agent_name, payload, max_attempts, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, workflow_id, stage, agent_name, payload, max_attempts, now, now)
+            )
+        return job_id
+
+    def claim(
+        self,
+        worker_id: str,
+        lease_seconds: float = 30.0,
+        agent_names: Optional[list[str]] = None
+    ) -> Optional[Job]:
+        """
+        Lease the oldest runnable job (pending, or leased with an expired lease).
+
+        Jobs whose lease expired on their last attempt are failed instead.
+        agent_names restricts claims to jobs for those agents.
+        """
+        now = time.time()
+        agent_filter = ""
+        params: list = [now]
+        if agent_names:
+            agent_filter = f" AND agent_name IN ({', '.join('?' for _ in agent_names)})"
+            params += list(agent_names)
+
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', lease_owner = NULL, updated_at = ?, "
+                "error = 'Lease expired after ' || attempts || ' attempt(s)' "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now)
+            )
+            row = conn.execute(
+                "SELECT id, agent_name, payload, workflow_id, stage, attempts, max_attempts "
+                "FROM jobs WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))"
+                f"{agent_filter} ORDER BY created_at LIMIT 1",
+                params
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, agent_name, payload, workflow_id, stage, attempts, max_attempts = row
+            expires = now + lease_seconds
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, expires, now, job_id)
+            )
+
+        return Job(
+            id=job_id,
+            agent_name=agent_name,
+            input_data=pickle.loads(payload),
+            workflow_id=workflow_id,
+            stage=stage,
+            attempts=attempts + 1,
+            max_attempts=max_attempts,
+            lease_owner=worker_id,
+            lease_expires=expires
+        )
+
+    def _update_leased(self, job_id: str, worker_id: str, assignments: str, params: tuple) -> bool:
+        """Update a job only while worker_id holds its lease."""
+        with self._write() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (*params, time.time(), job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = 30.0) -> bool:
+        """Extend a lease. False if the lease was lost (expired and re-claimed, or cancelled)."""
+        return self._update_leased(
+            job_id, worker_id, "lease_expires = ?", (time.time() + lease_seconds,)
+        )
+
+    def complete(self, job_id: str, worker_id: str, output: Any) -> bool:
+        """Store a job's result. False if the lease was lost."""
+        result = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._update_leased(
+            job_id, worker_id, "status = 'done', result = ?, lease_owner = NULL", (result,)
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Mark a job failed (no retry). False if the lease was lost."""
+        return self._update_leased(
+            job_id, worker_id, "status = 'failed', error = ?, lease_owner = NULL", (error,)
+        )
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Give a job back unfinished (e.g. on worker shutdown); the attempt is not counted."""
+        return self._update_leased(
+            job_id, worker_id,
+            "status = 'pending', attempts = attempts - 1, lease_owner = NULL, lease_expires = NULL",
+            ()
+        )
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not finished."""
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND status IN ('pending', 'leased')",
+                (time.time(), job_id)
+            )
+            return cursor.rowcount == 1
+
+    def delete(self, job_id: str) -> bool:
+        with self._write() as conn:
+            return conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount == 1
+
+    def status(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def result(self, job_id: str) -> Any:
+        """
+        The output of a finished job.
+
+        Raises JobFailedError if the job failed, was cancelled or does not
+        exist, and ValueError if it has not finished.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise JobFailedError(f"Job not found: {job_id}")
+        status, result, error = row
+        if status == "done":
+            return pickle.loads(result)
+        if status in ("failed", "cancelled"):
+            raise JobFailedError(error or f"Job {job_id} {status}")
+        raise ValueError(f"Job {job_id} is still {status}")
+
+    async def wait(self, job_id: str, poll_interval: float = 0.05, max_interval: float = 0.5) -> Any:
+        """Poll until a job finishes and return its output (see result())."""
+        interval = poll_interval
+        while self.status(job_id) not in (*self.FINISHED, None):
+            await asyncio.sleep(interval)
+            interval = min(max_interval, interval * 1.5)
+        return self.result(job_id)
+
+    def purge(self, older_than_seconds: float = 3600.0) -> int:
+        """Delete finished jobs last updated before the cutoff."""
+        with self._write() as conn:
+            return conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' for _ in self.FINISHED)}) "
+                "AND updated_at < ?",
+                (*self.FINISHED, time.time() - older_than_seconds)
+            ).rowcount
+
+    def get_stats(self) -> dict:
+        """Job counts by status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in ("pending", "leased", *self.FINISHED)}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,3 +1,15 @@
+from macds.execution.process import (
+    CommandResult,
+    run_command,
+)
+
+from macds.execution.pool import (
+    configure_process_pool,
+    get_process_pool,
+    run_in_process,
+    shutdown_process_pool,
+)
+
 from macds.execution.build_runner import (
     BuildRunner,
     BuildResult,
@@ -26,6 +38,14 @@ from macds.execution.analyzers import (
 
 
 __all__ = [
+    # Processes
+    "CommandResult",
+    "run_command",
+    # Process pool
+    "configure_process_pool",
+    "get_process_pool",
+    "run_in_process",
+    "shutdown_process_pool",
     # Build
     "BuildRunner",
     "BuildResult",
@@ -1,4 +1,5 @@
 import subprocess
+import asyncio
 import os
 import json
 from pathlib import Path
@@ -7,6 +8,8 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from macds.execution.process import run_command
+
 
 class BuildSystem(str, Enum):
     """Supported build systems."""
@@ -103,30 +106,47 @@ class BuildRunner:
             )
             
             duration = (datetime.now() - start_time).total_seconds()
-            output = result.stdout + result.stderr
-            
-            errors = self._extract_errors(output, build_system)
-            warnings = self._extract_warnings(output, build_system)
-            artifacts = self._find_artifacts(build_system)
+            return self._make_result(build_system, result.returncode, result.stdout + result.stderr, duration)
             
+        except subprocess.TimeoutExpired:
+            duration = (datetime.now() - start_time).total_seconds()
             return BuildResult(
-                success=result.returncode == 0,
+                success=False,
                 build_system=build_system,
                 duration_seconds=duration,
-                output=output,
-                errors=errors,
-                warnings=warnings,
-                artifacts=artifacts
+                errors=[f"Build timed out after {self.timeout} seconds"]
             )
-            
-        except subprocess.TimeoutExpired:
+        except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
             return BuildResult(
                 success=False,
                 build_system=build_system,
                 duration_seconds=duration,
-                errors=[f"Build timed out after {self.timeout} seconds"]
+                errors=[str(e)]
             )
+    
+    async def run_async(
+        self,
+        command: Optional[str] = None,
+        build_system: Optional[BuildSystem] = None
+    ) -> BuildResult:
+        """
+        Execute a build without blocking the event loop.
+        
+        Cancelling the calling task kills the build's process group.
+        """
+        start_time = datetime.now()
+        
+        if build_system is None:
+            build_system = self.detect_build_system()
+        
+        if command is None:
+            command = self._get_default_command(build_system)
+        
+        try:
+            result = await run_command(command, cwd=self.project_root, timeout=self.timeout)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
             return BuildResult(
@@ -135,6 +155,34 @@ class BuildRunner:
                 duration_seconds=duration,
                 errors=[str(e)]
             )
+        
+        duration = (datetime.now() - start_time).total_seconds()
+        if result.timed_out:
+            return BuildResult(
+                success=False,
+                build_system=build_system,
+                duration_seconds=duration,
+                errors=[f"Build timed out after {self.timeout} seconds"]
+            )
+        return self._make_result(build_system, result.returncode, result.output, duration)
+    
+    def _make_result(
+        self,
+        build_system: BuildSystem,
+        returncode: int,
+        output: str,
+        duration: float
+    ) -> BuildResult:
+        """Build a BuildResult from a finished build process."""
+        return BuildResult(
+            success=returncode == 0,
+            build_system=build_system,
+            duration_seconds=duration,
+            output=output,
+            errors=self._extract_errors(output, build_system),
+            warnings=self._extract_warnings(output, build_system),
+            artifacts=self._find_artifacts(build_system)
+        )
     
     def _get_default_command(self, build_system: BuildSystem) -> str:
         """Get the default build command for a build system."""
@@ -0,0 +1,81 @@
+"""
+Shared process pool for CPU-bound agent work.
+
+Agents configured with execution_mode="process" run their CPU-heavy
+helpers here instead of on the event loop, so other workflows keep
+making progress during a large review. Workers are started with the
+"spawn" method: the parent runs background flush threads, which makes
+fork unsafe. Arguments and results are pickled across the boundary.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+import asyncio
+import atexit
+import functools
+import multiprocessing
+import os
+import threading
+
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_max_workers = max(1, min(4, os.cpu_count() or 1))
+
+
+def configure_process_pool(max_workers: int) -> None:
+    """Set the pool size; a running pool is replaced on next use."""
+    global _max_workers
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    with _lock:
+        _max_workers = max_workers
+    shutdown_process_pool(wait=False)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """The shared pool, started on first use."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """Stop the worker processes (a later call starts a fresh pool)."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+async def run_in_process(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run fn(*args, **kwargs) in the shared pool and await the result.
+
+    fn must be picklable (a module-level function, or a method of a
+    picklable object). If a worker dies the pool is discarded so the next
+    call gets a working one, and BrokenProcessPool is raised to this caller.
+    Cancelling the awaiting task does not interrupt a call already running
+    in a worker.
+    """
+    pool = get_process_pool()
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+    except BrokenProcessPool:
+        global _pool
+        with _lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+
+atexit.register(shutdown_process_pool, False)
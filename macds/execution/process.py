@@ -0,0 +1,101 @@
+import asyncio
+import os
+import signal
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+
+@dataclass
+class CommandResult:
+    """Result of a subprocess run by run_command."""
+    returncode: Optional[int]
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+
+    @property
+    def output(self) -> str:
+        return self.stdout + self.stderr
+
+
+async def run_command(
+    command: Union[str, list[str]],
+    cwd: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    kill_grace: float = 2.0
+) -> CommandResult:
+    """
+    Run a command without blocking the event loop.
+
+    The child runs in its own process group. If the timeout expires or the
+    calling task is cancelled (e.g. by a stage or workflow timeout), the
+    whole group is sent SIGTERM, then SIGKILL after kill_grace seconds, so
+    no build or test process outlives its stage. Cancellation is re-raised
+    after the process has exited.
+
+    Args:
+        command: Shell command string, or argv list (run without a shell)
+        cwd: Working directory
+        timeout: Seconds before the process is killed
+        kill_grace: Seconds between SIGTERM and SIGKILL
+    """
+    # Imported here: macds.core imports the agents, which import this module
+    from macds.core import tracing
+
+    kwargs = {
+        "cwd": str(cwd) if cwd else None,
+        "stdout": asyncio.subprocess.PIPE,
+        "stderr": asyncio.subprocess.PIPE,
+    }
+    if sys.platform != "win32":
+        kwargs["start_new_session"] = True
+
+    display = command if isinstance(command, str) else " ".join(command)
+    with tracing.span("subprocess", command=display[:200]) as span:
+        if isinstance(command, str):
+            process = await asyncio.create_subprocess_shell(command, **kwargs)
+        else:
+            process = await asyncio.create_subprocess_exec(*command, **kwargs)
+        span.set_attribute("pid", process.pid)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await _terminate(process, kill_grace)
+            span.set_attribute("timed_out", True)
+            return CommandResult(returncode=process.returncode, timed_out=True)
+        except asyncio.CancelledError:
+            await asyncio.shield(_terminate(process, kill_grace))
+            raise
+
+        span.set_attribute("returncode", process.returncode)
+        return CommandResult(
+            returncode=process.returncode,
+            stdout=stdout.decode(errors="replace"),
+            stderr=stderr.decode(errors="replace")
+        )
+
+
+async def _terminate(process: asyncio.subprocess.Process, grace: float) -> None:
+    """Stop a process and its children, escalating to SIGKILL."""
+    if process.returncode is not None:
+        return
+
+    for sig in (signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM)):
+        try:
+            if sys.platform != "win32":
+                os.killpg(process.pid, sig)
+            elif sig == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+            return
+        except asyncio.TimeoutError:
+            continue
+    await process.wait()
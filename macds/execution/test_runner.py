@@ -1,4 +1,5 @@
 import subprocess
+import asyncio
 import json
 import re
 from pathlib import Path
@@ -7,6 +8,8 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from macds.execution.process import run_command
+
 
 class TestFramework(str, Enum):
     """Supported test frameworks."""
@@ -142,33 +145,48 @@ class TestRunner:
             )
             
             duration = (datetime.now() - start_time).total_seconds()
-            output = result.stdout + result.stderr
-            
-            # Parse results based on framework
-            parsed = self._parse_output(output, framework)
+            return self._make_result(framework, result.returncode, result.stdout + result.stderr, duration)
             
+        except subprocess.TimeoutExpired:
+            duration = (datetime.now() - start_time).total_seconds()
             return TestResult(
-                success=result.returncode == 0,
+                success=False,
                 framework=framework,
-                total=parsed.get("total", 0),
-                passed=parsed.get("passed", 0),
-                failed=parsed.get("failed", 0),
-                skipped=parsed.get("skipped", 0),
-                errors=parsed.get("errors", 0),
                 duration_seconds=duration,
-                coverage_percent=parsed.get("coverage"),
-                test_cases=parsed.get("test_cases", []),
-                output=output
+                output=f"Tests timed out after {self.timeout} seconds"
             )
-            
-        except subprocess.TimeoutExpired:
+        except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
             return TestResult(
                 success=False,
                 framework=framework,
                 duration_seconds=duration,
-                output=f"Tests timed out after {self.timeout} seconds"
+                output=str(e)
             )
+    
+    async def run_async(
+        self,
+        command: Optional[str] = None,
+        framework: Optional[TestFramework] = None,
+        with_coverage: bool = True
+    ) -> TestResult:
+        """
+        Execute tests without blocking the event loop.
+        
+        Cancelling the calling task kills the test run's process group.
+        """
+        start_time = datetime.now()
+        
+        if framework is None:
+            framework = self.detect_framework()
+        
+        if command is None:
+            command = self._get_default_command(framework, with_coverage)
+        
+        try:
+            result = await run_command(command, cwd=self.project_root, timeout=self.timeout)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             duration = (datetime.now() - start_time).total_seconds()
             return TestResult(
@@ -177,6 +195,40 @@ class TestRunner:
                 duration_seconds=duration,
                 output=str(e)
             )
+        
+        duration = (datetime.now() - start_time).total_seconds()
+        if result.timed_out:
+            return TestResult(
+                success=False,
+                framework=framework,
+                duration_seconds=duration,
+                output=f"Tests timed out after {self.timeout} seconds"
+            )
+        return self._make_result(framework, result.returncode, result.output, duration)
+    
+    def _make_result(
+        self,
+        framework: TestFramework,
+        returncode: int,
+        output: str,
+        duration: float
+    ) -> TestResult:
+        """Build a TestResult from a finished test process."""
+        parsed = self._parse_output(output, framework)
+        
+        return TestResult(
+            success=returncode == 0,
+            framework=framework,
+            total=parsed.get("total", 0),
+            passed=parsed.get("passed", 0),
+            failed=parsed.get("failed", 0),
+            skipped=parsed.get("skipped", 0),
+            errors=parsed.get("errors", 0),
+            duration_seconds=duration,
+            coverage_percent=parsed.get("coverage"),
+            test_cases=parsed.get("test_cases", []),
+            output=output
+        )
     
     def _get_default_command(self, framework: TestFramework, with_coverage: bool) -> str:
         """Get the default test command for a framework."""
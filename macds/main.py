@@ -1,7 +1,7 @@
 import asyncio
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 # Ensure macds is importable
@@ -31,6 +31,12 @@ def run(
     request: str = typer.Argument(..., help="Development request in natural language"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
     quick: bool = typer.Option(False, "--quick", "-q", help="Skip review and testing"),
+    trace: Optional[Path] = typer.Option(
+        None, "--trace", help="Write a Chrome trace-event file (open in chrome://tracing or Perfetto)"
+    ),
+    queue: Optional[Path] = typer.Option(
+        None, "--queue", help="Run stages on workers serving this queue database (see 'macds worker')"
+    ),
 ):
     """
     Run a complete development workflow.
@@ -38,8 +44,18 @@ def run(
     Example:
         macds run "Create a REST API for user management"
     """
+    tracer = None
+    if trace:
+        from macds.core.tracing import Tracer, ChromeTraceExporter, set_tracer
+        tracer = Tracer([ChromeTraceExporter(trace)])
+        set_tracer(tracer)
+    
     async def execute():
-        orchestrator = Orchestrator(verbose=verbose)
+        work_queue = None
+        if queue:
+            from macds.core.work_queue import WorkQueue
+            work_queue = WorkQueue(queue)
+        orchestrator = Orchestrator(verbose=verbose, work_queue=work_queue)
         
         with Progress(
             SpinnerColumn(),
@@ -86,7 +102,12 @@ def run(
                 
                 console.print(table)
     
-    asyncio.run(execute())
+    try:
+        asyncio.run(execute())
+    finally:
+        if tracer:
+            tracer.close()
+            console.print(f"Trace written to {trace}")
 
 
 @app.command()
@@ -252,6 +273,117 @@ def example():
     asyncio.run(execute())
 
 
+@app.command()
+def worker(
+    queue: Path = typer.Option(Path(".macds/work_queue.db"), "--queue", help="Queue database"),
+    workers: int = typer.Option(1, "--workers", "-n", help="Worker processes to start"),
+    concurrency: int = typer.Option(1, "--concurrency", "-c", help="Jobs run at once per worker"),
+    lease: float = typer.Option(30.0, "--lease", help="Lease length in seconds"),
+    imports: Optional[List[str]] = typer.Option(
+        None, "--import", help="Module registering extra agents (repeatable)"
+    ),
+):
+    """
+    Serve queued workflow stages until interrupted.
+    
+    Example:
+        macds worker --workers 4 &
+        macds run --queue .macds/work_queue.db "Create a REST API"
+    """
+    from macds.core.queue_worker import run_worker, start_workers
+    
+    options = {"concurrency": concurrency, "lease_seconds": lease, "imports": tuple(imports or ())}
+    console.print(f"Serving {queue} with {workers} worker(s)...")
+    if workers == 1:
+        run_worker(queue, **options)
+        return
+    
+    processes = start_workers(workers, queue, **options)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+@app.command()
+def bench(
+    shape: Optional[List[str]] = typer.Option(
+        None, "--shape", "-s", help="DAG shape: chain, fanout or diamond (repeatable; default all)"
+    ),
+    size: int = typer.Option(0, "--size", help="Chain length / fan-out width (0 = maximum)"),
+    workflows: int = typer.Option(50, "--workflows", "-n", help="Workflows per scenario"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Workflows in flight"),
+    latency_ms: float = typer.Option(10.0, "--latency-ms", help="Awaited latency per stage"),
+    cpu_ms: float = typer.Option(0.0, "--cpu-ms", help="CPU burn per stage"),
+    output_kb: float = typer.Option(1.0, "--output-kb", help="Stage output size"),
+    max_parallelism: int = typer.Option(4, "--max-parallelism", help="Concurrent stages per workflow"),
+    max_workers: int = typer.Option(8, "--max-workers", help="Scheduler worker pool size"),
+    json_output: bool = typer.Option(False, "--json", help="Print JSON instead of a table"),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Also write JSON results to a file"),
+):
+    """
+    Benchmark orchestration overhead with stub agents.
+    
+    Example:
+        macds bench --shape fanout --workflows 200 --json
+    """
+    import json
+    from macds.bench import SHAPES, BenchmarkConfig, run_suite
+    
+    configs = [
+        BenchmarkConfig(
+            shape=s,
+            size=size,
+            workflows=workflows,
+            concurrency=concurrency,
+            latency_ms=latency_ms,
+            cpu_ms=cpu_ms,
+            output_bytes=int(output_kb * 1024),
+            max_parallelism=max_parallelism,
+            max_workers=max_workers
+        )
+        for s in (shape or SHAPES)
+    ]
+    try:
+        report = run_suite(configs)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    payload = json.dumps(report, indent=2)
+    if output:
+        output.write_text(payload)
+    if json_output:
+        print(payload)
+        return
+    
+    table = Table(title=f"Orchestration Benchmark ({workflows} workflows, concurrency {concurrency})")
+    table.add_column("Shape")
+    table.add_column("Stages")
+    table.add_column("Workflows/s")
+    table.add_column("p50 ms")
+    table.add_column("p99 ms")
+    table.add_column("Overhead p50 ms")
+    table.add_column("Per stage ms")
+    for result in report["results"]:
+        table.add_row(
+            result["config"]["shape"],
+            str(result["stages"]),
+            f"{result['throughput_wps']:.1f}",
+            f"{result['latency_ms']['p50']:.1f}",
+            f"{result['latency_ms']['p99']:.1f}",
+            f"{result['overhead_ms']['p50']:.1f}",
+            f"{result['overhead_per_stage_ms']:.2f}"
+        )
+    console.print(table)
+    if output:
+        console.print(f"Results written to {output}")
+
+
 def main():
     """Entry point."""
     app()
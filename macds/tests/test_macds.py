@@ -37,6 +37,46 @@ def artifact_store(temp_dir):
     return ArtifactStore(project_root=temp_dir)
 
 
+@pytest.fixture
+def make_orchestrator(temp_dir):
+    """Build orchestrators on temp_dir storage with the given agents registered."""
+    from macds.core.orchestrator import Orchestrator
+    from macds.core.memory import MemoryStore
+    from macds.core.evaluation import EvaluationSystem
+    from macds.core.artifacts import ArtifactStore
+    
+    def make(agents=(), **kwargs):
+        orchestrator = Orchestrator(
+            memory_store=MemoryStore(temp_dir / "memory"),
+            evaluation=EvaluationSystem(temp_dir / "evaluation"),
+            artifact_store=ArtifactStore(temp_dir),
+            **kwargs
+        )
+        for agent in agents:
+            orchestrator.register_agent(agent)
+        return orchestrator
+    
+    return make
+
+
+@pytest.fixture
+def tracer(temp_dir):
+    """Install a tracer with in-memory, JSON lines and Chrome exporters."""
+    from macds.core.tracing import (
+        Tracer, InMemoryExporter, JSONLinesExporter, ChromeTraceExporter, set_tracer
+    )
+    
+    tracer = Tracer([
+        InMemoryExporter(),
+        JSONLinesExporter(temp_dir / "trace.jsonl"),
+        ChromeTraceExporter(temp_dir / "trace.json")
+    ])
+    previous = set_tracer(tracer)
+    yield tracer
+    set_tracer(previous)
+    tracer.close()
+
+
 # ==================== Contract Tests ====================
 
 class TestContracts:
@@ -141,6 +181,39 @@ class TestMemory:
         decayed_strength = entry.get_current_strength()
         assert decayed_strength < initial_strength
     
+    def test_compact_entry_round_trip(self):
+        """Test the slotted entry keeps the dict format and attribute API."""
+        from macds.core.memory import MemoryEntry, MemoryScope, DecayPolicy
+        
+        data = {
+            "id": "abc",
+            "content": {"files": ["a.py"], "note": "caf\u00e9"},
+            "scope": "skill",
+            "source": "BuilderAgent",
+            "confidence": 0.8,
+            "decay_policy": "slow",
+            "created_at": "2026-01-02T03:04:05.678901",
+            "last_accessed": "2026-01-03T03:04:05.000001",
+            "access_count": 3,
+            "tags": ["build", "python"],
+            "related_entries": ["xyz"],
+            "occurrences": 2
+        }
+        entry = MemoryEntry.from_dict(data)
+        assert not hasattr(entry, "__dict__")
+        assert entry.scope == MemoryScope.SKILL
+        assert entry.decay_policy == DecayPolicy.SLOW
+        assert entry.created_at == datetime.fromisoformat(data["created_at"])
+        
+        result = entry.to_dict()
+        result.pop("current_strength")
+        assert result == data
+        
+        other = MemoryEntry.from_dict(dict(data, id="def"))
+        assert other._tags == entry._tags  # Interned
+        entry.tags = ["docs"]
+        assert entry.tags == ["docs"]
+    
     def test_memory_search(self, memory_store):
         """Test memory search."""
         from macds.core.memory import MemoryScope
@@ -154,6 +227,76 @@ class TestMemory:
         results = memory_store.search("hello", scope=MemoryScope.PROJECT)
         assert len(results) >= 1
     
+    def test_search_and_phrase_queries(self, memory_store):
+        """Test AND and phrase search over the token index."""
+        from macds.core.memory import MemoryScope
+        
+        a = memory_store.store({"reason": "build failed on timeout"}, MemoryScope.FAILURE, "A")
+        b = memory_store.store({"reason": "timeout while build was queued"}, MemoryScope.FAILURE, "A")
+        
+        both = {e.id for e in memory_store.search("build timeout")}
+        assert both == {a, b}
+        
+        phrase = {e.id for e in memory_store.search('"build failed"')}
+        assert phrase == {a}
+        
+        memory_store.forget(a)
+        assert {e.id for e in memory_store.search("timeout")} == {b}
+    
+    def test_retrieve_uses_consistent_indexes(self, memory_store):
+        """Test scope/source/tag filters stay consistent through forget."""
+        from macds.core.memory import MemoryScope
+        
+        a = memory_store.store({"n": 1}, MemoryScope.SKILL, "A", tags=["x"])
+        b = memory_store.store({"n": 2}, MemoryScope.SKILL, "B", tags=["x", "y"])
+        c = memory_store.store({"n": 3}, MemoryScope.FAILURE, "A", tags=["y"])
+        
+        assert {e.id for e in memory_store.retrieve(scope=MemoryScope.SKILL)} == {a, b}
+        assert {e.id for e in memory_store.retrieve(source="A")} == {a, c}
+        assert {e.id for e in memory_store.retrieve(tags=["y"])} == {b, c}
+        assert {e.id for e in memory_store.retrieve(source="A", tags=["x"])} == {a}
+        assert memory_store.retrieve(entry_id=a, source="B") == []
+        
+        memory_store.forget(b)
+        assert {e.id for e in memory_store.retrieve(tags=["x"])} == {a}
+        assert memory_store.get_stats()["by_source"] == {"A": 2}
+    
+    def test_retrieve_top_k_by_strength(self, memory_store):
+        """Test retrieve returns the strongest entries in order."""
+        from macds.core.memory import MemoryScope, DecayPolicy
+        
+        ids = [
+            memory_store.store({"n": i}, MemoryScope.PROJECT, "A",
+                               confidence=c, decay_policy=DecayPolicy.PERMANENT)
+            for i, c in enumerate([0.3, 0.9, 0.05, 0.6])
+        ]
+        
+        results = memory_store.retrieve(source="A", limit=2)
+        assert [e.id for e in results] == [ids[1], ids[3]]
+        assert all(e.access_count == 1 for e in results)
+        assert memory_store.retrieve(entry_id=ids[2]) == []  # Below min_strength
+    
+    def test_strength_columns_match_entries(self):
+        """Test columnar strengths agree with MemoryEntry.get_current_strength."""
+        from macds.core.memory import MemoryEntry, MemoryScope, DecayPolicy, DECAY_RATES
+        from macds.core.memory_scoring import StrengthColumns
+        
+        columns = StrengthColumns()
+        entries = []
+        for i, policy in enumerate(DecayPolicy):
+            entry = MemoryEntry(
+                id=f"e{i}", content=None, scope=MemoryScope.PROJECT, source="A",
+                confidence=0.8, decay_policy=policy, access_count=i,
+                last_accessed=datetime.now() - timedelta(hours=5)
+            )
+            entries.append(entry)
+            columns.set(entry.id, entry.last_accessed.timestamp(),
+                        DECAY_RATES[policy], entry.confidence, entry.access_count)
+        
+        strengths = columns.strengths([e.id for e in entries])
+        for entry, strength in zip(entries, strengths):
+            assert strength == pytest.approx(entry.get_current_strength(), rel=1e-6)
+    
     def test_agent_memory_interface(self, memory_store):
         """Test agent memory interface."""
         from macds.core.memory import AgentMemory, MemoryScope
@@ -171,6 +314,381 @@ class TestMemory:
         assert len(results) >= 1
 
 
+class TestMemoryBackends:
+    """Test memory storage backends."""
+    
+    def test_sqlite_persists_across_instances(self, temp_dir):
+        """Test entries survive reopening the store."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory")
+        entry_id = store.store({"key": "value"}, MemoryScope.PROJECT, "TestAgent")
+        store.close()
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory")
+        results = reopened.retrieve(entry_id=entry_id)
+        assert len(results) == 1
+        assert results[0].content == {"key": "value"}
+        assert (temp_dir / "memory" / "memories.db").exists()
+    
+    def test_forget_deletes_row(self, temp_dir):
+        """Test forget removes the persisted row only."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory")
+        keep = store.store({"n": 1}, MemoryScope.PROJECT, "TestAgent")
+        drop = store.store({"n": 2}, MemoryScope.PROJECT, "TestAgent")
+        assert store.forget(drop)
+        store.close()
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory")
+        assert reopened.retrieve(entry_id=keep)
+        assert not reopened.retrieve(entry_id=drop)
+    
+    def test_migrates_legacy_json(self, temp_dir):
+        """Test one-shot migration from memories.json."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        from macds.core.memory_backends import JSONMemoryBackend
+        
+        memory_dir = temp_dir / "memory"
+        memory_dir.mkdir()
+        legacy = MemoryStore(
+            storage_path=memory_dir,
+            backend=JSONMemoryBackend(memory_dir / "memories.json")
+        )
+        entry_id = legacy.store({"legacy": True}, MemoryScope.SKILL, "TestAgent")
+        
+        migrated = MemoryStore(storage_path=memory_dir)
+        assert migrated.retrieve(entry_id=entry_id)
+        assert not (memory_dir / "memories.json").exists()
+        assert (memory_dir / "memories.json.migrated").exists()
+
+
+class TestMemoryWriteBehind:
+    """Test buffered access tracking."""
+    
+    def test_reads_do_not_write_until_flush(self, temp_dir):
+        """Test access updates are buffered and persisted by flush()."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        entry_id = store.store({"k": 1}, MemoryScope.PROJECT, "A")
+        
+        backend = store._backend
+        with patch.object(backend, "record_access", wraps=backend.record_access) as record:
+            store.retrieve(entry_id=entry_id)
+            store.retrieve(entry_id=entry_id)
+            assert record.call_count == 0
+            assert store.flush() == 1
+            assert record.call_count == 1
+        store.close()
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        assert reopened._entries[entry_id].access_count == 2
+    
+    def test_threshold_and_context_manager(self, temp_dir):
+        """Test the size threshold and with-block both persist updates."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        with MemoryStore(storage_path=temp_dir / "memory",
+                         flush_interval=None, flush_threshold=2) as store:
+            a = store.store({"k": 1}, MemoryScope.PROJECT, "A")
+            b = store.store({"k": 2}, MemoryScope.PROJECT, "A")
+            store.retrieve(source="A")
+            assert len(store._dirty) == 2  # Reads never flush
+            store.store({"k": 3}, MemoryScope.PROJECT, "B")
+            assert not store._dirty  # Threshold reached, flushed by the write
+            store.retrieve(entry_id=a)
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        assert reopened._entries[a].access_count == 2
+        assert reopened._entries[b].access_count == 1
+    
+    def test_forget_is_not_resurrected_by_flush(self, temp_dir):
+        """Test a pending access update does not restore a forgotten entry."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        entry_id = store.store({"k": 1}, MemoryScope.PROJECT, "A")
+        store.retrieve(entry_id=entry_id)
+        store.forget(entry_id)
+        store.close()
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        assert entry_id not in reopened._entries
+    
+    def test_concurrent_reads_and_writes_with_inline_flush(self, temp_dir):
+        """Test threshold flushes from readers do not deadlock with store()."""
+        import threading
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory",
+                            flush_interval=None, flush_threshold=1)
+        entry_id = store.store({"k": 0}, MemoryScope.PROJECT, "A")
+        
+        def read():
+            for _ in range(200):
+                store.retrieve(entry_id=entry_id)
+        
+        def write(n):
+            for i in range(200):
+                store.store({"k": n, "i": i}, MemoryScope.PROJECT, "A")
+        
+        threads = [threading.Thread(target=read, daemon=True) for _ in range(2)]
+        threads += [threading.Thread(target=write, args=(n,), daemon=True) for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        
+        assert not any(thread.is_alive() for thread in threads)
+        store.close()
+
+
+def _store_worker(storage_path, worker, count):
+    """Store count entries from a separate process."""
+    from macds.core.memory import MemoryStore, MemoryScope
+    
+    with MemoryStore(storage_path=storage_path, flush_interval=None) as store:
+        for i in range(count):
+            entry_id = store.store({"worker": worker, "i": i}, MemoryScope.PROJECT, f"w{worker}")
+            store.retrieve(entry_id=entry_id)
+        store.retrieve(source="shared")
+
+
+class TestMemoryMultiProcess:
+    """Test sharing one memory directory between processes."""
+    
+    def test_concurrent_processes_lose_no_writes(self, temp_dir):
+        """Test N processes storing concurrently, seen by a live store via sync()."""
+        import multiprocessing
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        path = temp_dir / "memory"
+        observer = MemoryStore(storage_path=path, flush_interval=None)
+        shared = observer.store({"shared": True}, MemoryScope.PROJECT, "shared")
+        
+        workers, count = 4, 50
+        procs = [
+            multiprocessing.Process(target=_store_worker, args=(path, w, count))
+            for w in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(timeout=60)
+            assert proc.exitcode == 0
+        
+        # New entries, plus the shared entry with the workers' accesses merged in
+        assert observer.sync() == workers * count + 1
+        assert observer._entries[shared].access_count == workers
+        assert len(observer.retrieve(source="w0", limit=1000)) == count
+        assert observer.get_stats()["total_entries"] == workers * count + 1
+        observer.retrieve(entry_id=shared)
+        observer.close()
+        
+        reopened = MemoryStore(storage_path=path, flush_interval=None)
+        assert reopened.get_stats()["total_entries"] == workers * count + 1
+        # Access increments from every process add up
+        assert reopened._entries[shared].access_count == workers + 1
+    
+    def test_sync_applies_remote_forget(self, temp_dir):
+        """Test deletions by another store propagate through the change log."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        path = temp_dir / "memory"
+        a = MemoryStore(storage_path=path, flush_interval=None)
+        b = MemoryStore(storage_path=path, flush_interval=None)
+        
+        entry_id = a.store({"k": 1}, MemoryScope.PROJECT, "A")
+        assert b.sync() == 1
+        assert b.retrieve(entry_id=entry_id)
+        
+        a.forget(entry_id)
+        assert b.sync() == 1
+        assert entry_id not in b._entries
+        assert b.sync() == 0  # No foreign commit since
+
+
+class TestMemoryConsolidation:
+    """Test near-duplicate consolidation."""
+    
+    def test_merges_records_differing_in_volatile_values(self, temp_dir):
+        """Test failure records differing by timestamp/task ID are merged."""
+        from macds.core.memory import MemoryStore, MemoryScope, AgentMemory
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        memory = AgentMemory("BuilderAgent", store)
+        for i in range(5):
+            memory.learn_from_failure({
+                "error": "ImportError: no module named requests",
+                "task_id": f"task-{1000 + i}",
+                "timestamp": f"2026-03-0{i + 1}T10:00:00"
+            })
+        other = memory.learn_from_failure({"error": "SyntaxError in parser.py"})
+        memory.remember({"error": "ImportError: no module named requests"},
+                        scope=MemoryScope.PROJECT)  # Different scope, kept
+        
+        assert store.consolidate() == 4
+        assert store.get_stats()["total_entries"] == 3
+        survivor = next(e for e in store.retrieve(scope=MemoryScope.FAILURE)
+                        if e.id != other)
+        assert survivor.occurrences == 5
+        assert store.get_stats()["consolidated_by_scope"] == {"failure": 4}
+        
+        # Incremental: only the new duplicate is examined
+        memory.learn_from_failure({
+            "error": "ImportError: no module named requests",
+            "task_id": "task-2000",
+            "timestamp": "2026-04-01T10:00:00"
+        })
+        assert store.get_stats()["pending_consolidation"] == 1
+        assert store.consolidate() == 1
+        store.close()
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        assert reopened._entries[survivor.id].occurrences == 6
+        assert reopened.consolidate() == 0
+    
+    def test_near_duplicates_by_similarity(self, temp_dir):
+        """Test fuzzy matching merges reworded content but not unrelated content."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None,
+                            consolidate_similarity=0.6)
+        base = "use dependency injection for the database session in service layer classes"
+        store.store(base, MemoryScope.SKILL, "ArchitectAgent", confidence=0.5)
+        store.store(base + " always", MemoryScope.SKILL, "ArchitectAgent", confidence=0.5)
+        store.store("cache compiled regex patterns at module level",
+                    MemoryScope.SKILL, "ArchitectAgent")
+        
+        assert store.consolidate() == 1
+        merged = store.search("dependency injection")
+        assert len(merged) == 1
+        assert merged[0].confidence == 0.75
+        assert merged[0].occurrences == 2
+
+
+class TestMemoryExpiry:
+    """Test background decay expiry."""
+    
+    def test_expire_due_evicts_by_projected_time(self, temp_dir):
+        """Test entries are evicted once their projected expiry passes."""
+        from macds.core.memory import MemoryStore, MemoryScope, DecayPolicy
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        working = store.store({"n": 1}, MemoryScope.WORKING, "A")
+        skill = store.store({"n": 2}, MemoryScope.SKILL, "A")
+        store.store({"n": 3}, MemoryScope.PROJECT, "A", decay_policy=DecayPolicy.PERMANENT)
+        
+        now = datetime.now().timestamp()
+        assert store.expire_due(now=now) == 0
+        
+        # FAST half-life is 1 hour: strength 1.0 drops below 0.1 after ~3.3 hours
+        assert store.expire_due(now=now + 4 * 3600) == 1
+        assert working not in store._entries
+        assert skill in store._entries
+        
+        stats = store.get_stats()
+        assert stats["evictions_by_scope"] == {"working": 1}
+        assert stats["pending_expiries"] == 1  # Permanent entry is never scheduled
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        assert working not in reopened._entries
+    
+    def test_access_postpones_expiry(self, temp_dir):
+        """Test an access pushes the projected expiry time out."""
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        entry_id = store.store({"n": 1}, MemoryScope.WORKING, "A")
+        before = store._expiry.next_due()
+        store.retrieve(entry_id=entry_id)
+        assert store._expiry.next_due() > before
+
+
+class TestMemoryBudget:
+    """Test memory budgets and eviction."""
+    
+    def test_steady_state_under_sustained_workload(self, temp_dir):
+        """Test entry count and bytes stay bounded under a synthetic workload."""
+        from macds.core.memory import MemoryStore, MemoryScope, MemoryBudget, AgentMemory
+        
+        budget = MemoryBudget(
+            max_entries={MemoryScope.FAILURE: 200, MemoryScope.WORKING: 100},
+            max_bytes={MemoryScope.FAILURE: 200 * 1024}
+        )
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None, budget=budget)
+        memory = AgentMemory("LoadAgent", store)
+        
+        peak_failures = 0
+        for i in range(3000):
+            memory.learn_from_failure({"task_id": f"t{i}", "reason": "timeout " * (i % 20)})
+            memory.remember({"task_id": f"t{i}"}, scope=MemoryScope.WORKING)
+            stats = store.get_stats()
+            peak_failures = max(peak_failures, stats["by_scope"]["failure"])
+            assert stats["bytes_by_scope"]["failure"] <= 200 * 1024
+            assert stats["by_scope"]["working"] <= 100
+        
+        assert peak_failures <= 200
+        stats = store.get_stats()
+        assert stats["budget_evictions_by_scope"]["failure"] >= 2800
+        assert stats["budget_evictions_by_scope"]["working"] >= 2900
+        store.close()
+        
+        reopened = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None, budget=budget)
+        assert reopened.get_stats()["total_entries"] <= 300
+    
+    def test_total_cap_prefers_skill_over_working(self, temp_dir):
+        """Test scope priority decides victims under a total cap."""
+        from macds.core.memory import MemoryStore, MemoryScope, MemoryBudget
+        
+        budget = MemoryBudget.unbounded()
+        budget.total_max_entries = 10
+        store = MemoryStore(storage_path=temp_dir / "memory", flush_interval=None, budget=budget)
+        
+        skills = [store.store({"skill": i}, MemoryScope.SKILL, "A") for i in range(5)]
+        for i in range(20):
+            store.store({"scratch": i}, MemoryScope.WORKING, "A")
+        
+        assert all(eid in store._entries for eid in skills)
+        assert store.get_stats()["total_entries"] <= 10
+
+
+class TestSemanticMemory:
+    """Test local semantic recall."""
+    
+    def test_semantic_search_and_persistence(self, temp_dir):
+        """Test semantic ranking and reuse of the saved index."""
+        pytest.importorskip("numpy")
+        from macds.core.memory import MemoryStore, MemoryScope
+        
+        store = MemoryStore(storage_path=temp_dir / "memory", semantic=True)
+        notes = [
+            "build failed because pytest timed out",
+            "database migration added user table",
+            "authentication tokens expire after one hour",
+        ]
+        for note in notes:
+            store.store({"note": note}, MemoryScope.PROJECT, "A")
+        
+        results = store.semantic_search("auth token expiry", limit=1)
+        assert results[0].content["note"] == notes[2]
+        store.close()
+        
+        assert (temp_dir / "memory" / "semantic_index.npz").exists()
+        reopened = MemoryStore(storage_path=temp_dir / "memory", semantic=True)
+        assert len(reopened._semantic) == 3
+        assert not reopened._semantic.dirty  # Loaded, not rebuilt
+    
+    def test_semantic_search_falls_back_to_keywords(self, memory_store):
+        """Test semantic_search without an index uses keyword search."""
+        from macds.core.memory import MemoryScope
+        
+        memory_store.store({"message": "hello world"}, MemoryScope.PROJECT, "A")
+        assert len(memory_store.semantic_search("hello")) == 1
+
+
 # ==================== Evaluation Tests ====================
 
 class TestEvaluation:
@@ -214,6 +732,125 @@ class TestEvaluation:
         scorecard = evaluation_system.get_scorecard("GoodAgent")
         # Autonomy should be high after good performance
         assert scorecard.autonomy_level >= 1.0
+    
+    def test_score_history_survives_restart(self, temp_dir):
+        """Test scores are replayed from the log into history and aggregates."""
+        from macds.core.evaluation import EvaluationSystem, ScoreCategory
+        
+        evaluation = EvaluationSystem(storage_path=temp_dir / "evaluation")
+        evaluation.record_task_result("A", True, {ScoreCategory.CORRECTNESS: 80.0})
+        evaluation.record_task_result("A", False, {ScoreCategory.CORRECTNESS: 40.0})
+        evaluation.record_review_result("R", "A", violations=1, severity_score=0.0)
+        
+        reopened = EvaluationSystem(storage_path=temp_dir / "evaluation")
+        card = reopened.get_scorecard("A")
+        assert len(card.scores["correctness"]) == 2
+        assert card.get_average(ScoreCategory.CORRECTNESS) == 60.0
+        assert card.get_average(ScoreCategory.COMPLIANCE) == 90.0
+        assert card.total_tasks == 2
+        assert reopened.get_leaderboard()[0][0] == "R"
+    
+    def test_coalesced_saves(self, temp_dir):
+        """Test delayed saves coalesce writes and flush() persists them atomically."""
+        import os
+        from macds.core.evaluation import EvaluationSystem, ScoreCategory
+        
+        path = temp_dir / "evaluation"
+        evaluation = EvaluationSystem(storage_path=path, save_delay=60.0)
+        with patch("macds.core.evaluation.os.replace", wraps=os.replace) as replace:
+            for _ in range(20):
+                evaluation.record_task_result("A", True, {ScoreCategory.CORRECTNESS: 90.0})
+            assert replace.call_count == 0
+            assert not (path / "scorecards.json").exists()
+            
+            evaluation.flush()
+            assert replace.call_count == 1
+        assert not (path / "scorecards.json.tmp").exists()
+        
+        evaluation.record_task_result("A", False, {ScoreCategory.CORRECTNESS: 0.0})
+        evaluation.close()
+        
+        reopened = EvaluationSystem(storage_path=path)
+        card = reopened.get_scorecard("A")
+        assert card.total_tasks == 21
+        assert len(card.scores["correctness"]) == 21
+    
+    def test_torn_log_line_does_not_swallow_next_append(self, temp_dir):
+        """Test scores appended after a torn line are kept."""
+        from macds.core.evaluation import EvaluationSystem, ScoreCategory
+        
+        path = temp_dir / "evaluation"
+        evaluation = EvaluationSystem(storage_path=path)
+        evaluation.record_task_result("A", True, {ScoreCategory.CORRECTNESS: 80.0})
+        with open(path / "scores.jsonl", "a") as f:
+            f.write('{"agent": "A", "categ')  # Crash mid-append
+        evaluation.record_task_result("A", True, {ScoreCategory.CORRECTNESS: 40.0})
+        
+        (path / "scorecards.json").unlink()  # Force a full log replay
+        card = EvaluationSystem(storage_path=path).get_scorecard("A")
+        assert card.get_average(ScoreCategory.CORRECTNESS) == 60.0
+    
+    def test_snapshot_bounds_history_and_replay(self, temp_dir):
+        """Test only recent scores stay in memory and restarts skip the logged past."""
+        from macds.core.evaluation import EvaluationSystem, ScoreCategory, ScoreEntry, RECENT_SCORES
+        
+        path = temp_dir / "evaluation"
+        evaluation = EvaluationSystem(storage_path=path, save_delay=60.0)
+        for i in range(RECENT_SCORES + 50):
+            evaluation.record_task_result("A", True, {ScoreCategory.CORRECTNESS: float(i % 2) * 100})
+        evaluation.close()
+        assert len(evaluation.get_scorecard("A").scores["correctness"]) == RECENT_SCORES
+        
+        with patch.object(ScoreEntry, "from_dict", wraps=ScoreEntry.from_dict) as parsed:
+            card = EvaluationSystem(storage_path=path).get_scorecard("A")
+            assert parsed.call_count == RECENT_SCORES  # Recent scores only, no log replay
+        assert len(card.scores["correctness"]) == RECENT_SCORES
+        assert card.get_average(ScoreCategory.CORRECTNESS) == 50.0
+    
+    def test_exit_flush_tracks_open_instances(self, temp_dir):
+        """Test closed stores leave the shared exit hook and reopen on new changes."""
+        from macds.core import evaluation as ev, memory as mem
+        
+        evaluation = ev.EvaluationSystem(storage_path=temp_dir / "evaluation", save_delay=60.0)
+        store = mem.MemoryStore(storage_path=temp_dir / "memory", flush_interval=None)
+        assert evaluation in ev._open_systems and store in mem._open_stores
+        
+        evaluation.close()
+        store.close()
+        assert evaluation not in ev._open_systems and store not in mem._open_stores
+        
+        evaluation.record_task_result("A", True, {ev.ScoreCategory.CORRECTNESS: 90.0})
+        assert evaluation in ev._open_systems
+        evaluation.close()
+    
+    def test_delayed_save_fires(self, temp_dir):
+        """Test the scheduled save runs without an explicit flush."""
+        import time
+        from macds.core.evaluation import EvaluationSystem, ScoreCategory
+        
+        path = temp_dir / "evaluation"
+        evaluation = EvaluationSystem(storage_path=path, save_delay=0.05)
+        evaluation.record_task_result("A", True, {ScoreCategory.CORRECTNESS: 90.0})
+        deadline = time.time() + 5
+        while not (path / "scorecards.json").exists() and time.time() < deadline:
+            time.sleep(0.01)
+        assert (path / "scorecards.json").exists()
+    
+    def test_average_uses_daily_window(self):
+        """Test the rolling average only counts buckets inside the window."""
+        from macds.core.evaluation import AgentScorecard, ScoreEntry, ScoreCategory
+        
+        card = AgentScorecard(agent_name="A")
+        card.add_score(ScoreCategory.EFFICIENCY, 90.0)
+        card.add_entry(ScoreEntry(
+            category=ScoreCategory.EFFICIENCY,
+            score=10.0,
+            timestamp=datetime.now() - timedelta(days=45)
+        ))
+        
+        assert card.get_average(ScoreCategory.EFFICIENCY) == 90.0
+        assert card.get_average(ScoreCategory.EFFICIENCY, days=60) == 50.0
+        assert card.get_average(ScoreCategory.STABILITY) == 50.0
 
 
 # ==================== Artifact Tests ====================
@@ -423,6 +1060,1043 @@ class TestOrchestrator:
         assert conflict.decision_owner == "ArchitectAgent"
 
 
+class StubAgent:
+    """Agent stand-in that sleeps and returns a canned output."""
+    
+    def __init__(self, name, delay=0.05, fail_times=0, output=None):
+        self.name = name
+        self.delay = delay
+        self.fail_times = fail_times
+        self.output = output
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.authority_level = 1
+    
+    async def execute(self, input_data):
+        from types import SimpleNamespace
+        
+        self.calls += 1
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.calls <= self.fail_times:
+                raise RuntimeError(f"{self.name} failed")
+            return self.output or SimpleNamespace(
+                requirements=[], constraints=[], files_created=[],
+                verdict=None, build_success=True, components=[], invariants=[],
+                api_contracts=[]
+            )
+        finally:
+            self.running -= 1
+
+
+class TestParallelWorkflow:
+    """Test ready-set DAG scheduling."""
+    
+    @pytest.mark.asyncio
+    async def test_independent_branches_run_concurrently(self, make_orchestrator):
+        """Test stages with completed dependencies are launched together."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        shared = StubAgent("Shared", delay=0.1)
+        orchestrator = make_orchestrator([shared])
+        result = await orchestrator.run_workflow("x", workflow=[
+            (S.REQUIREMENTS, "Shared", []),
+            (S.REVIEW, "Shared", [S.REQUIREMENTS]),
+            (S.BUILD_TEST, "Shared", [S.REQUIREMENTS]),
+            (S.INTEGRATION, "Shared", [S.REVIEW, S.BUILD_TEST])
+        ])
+        
+        assert result.success
+        assert shared.max_running == 2
+        assert result.stages_completed[0] == S.REQUIREMENTS
+        assert result.stages_completed[-1] == S.INTEGRATION
+        assert result.duration_seconds < 0.38  # Critical path is 3 x 0.1 s
+    
+    @pytest.mark.asyncio
+    async def test_max_parallelism(self, make_orchestrator):
+        """Test the concurrency limit is respected."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        shared = StubAgent("Shared")
+        orchestrator = make_orchestrator([shared], max_parallelism=1)
+        result = await orchestrator.run_workflow("x", workflow=[
+            (S.REVIEW, "Shared", []),
+            (S.BUILD_TEST, "Shared", [])
+        ])
+        
+        assert result.success
+        assert shared.max_running == 1
+    
+    @pytest.mark.asyncio
+    async def test_failure_routing_reruns_downstream(self, make_orchestrator):
+        """Test a routed failure re-executes the target and its dependents."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        impl = StubAgent("Impl")
+        review = StubAgent("Review", fail_times=1)
+        orchestrator = make_orchestrator([impl, review])
+        result = await orchestrator.run_workflow("x", workflow=[
+            (S.IMPLEMENTATION, "Impl", []),
+            (S.REVIEW, "Review", [S.IMPLEMENTATION])
+        ])
+        
+        assert result.success
+        assert (impl.calls, review.calls) == (2, 2)
+        assert result.stages_completed == [S.IMPLEMENTATION, S.REVIEW]
+    
+    @pytest.mark.asyncio
+    async def test_unrecoverable_failure_stops(self, make_orchestrator):
+        """Test failures without routing stop the workflow."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        failing = StubAgent("Req", fail_times=5)
+        after = StubAgent("After")
+        orchestrator = make_orchestrator([failing, after])
+        result = await orchestrator.run_workflow("x", workflow=[
+            (S.REQUIREMENTS, "Req", []),
+            (S.ARCHITECTURE, "After", [S.REQUIREMENTS])
+        ])
+        
+        assert not result.success
+        assert result.stages_failed == [S.REQUIREMENTS]
+        assert after.calls == 0
+
+
+class TestStageScheduler:
+    """Test the shared worker pool."""
+    
+    async def _hold(self, scheduler, order, label, agent="A", duration=0.02, **kwargs):
+        async with scheduler.slot(agent, **kwargs):
+            order.append(label)
+            await asyncio.sleep(duration)
+    
+    @pytest.mark.asyncio
+    async def test_priority_classes(self):
+        """Test waiting stages are served by priority, then arrival."""
+        from macds.core.scheduler import StageScheduler, Priority
+        
+        scheduler = StageScheduler(max_workers=1)
+        order = []
+        blocker = asyncio.create_task(self._hold(scheduler, order, "first"))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(self._hold(scheduler, order, "batch", priority=Priority.BATCH)),
+            asyncio.create_task(self._hold(scheduler, order, "normal", priority=Priority.NORMAL)),
+            asyncio.create_task(self._hold(scheduler, order, "interactive", priority=Priority.INTERACTIVE))
+        ]
+        await asyncio.sleep(0)
+        
+        status = scheduler.get_status()
+        assert status["queue_depth"] == 3
+        assert status["queued_by_priority"] == {"batch": 1, "normal": 1, "interactive": 1}
+        
+        await asyncio.gather(blocker, *waiting)
+        assert order == ["first", "interactive", "normal", "batch"]
+        assert scheduler.get_status()["running"] == 0
+        assert scheduler.get_status()["avg_wait_seconds"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_agent_cap_does_not_block_other_agents(self):
+        """Test per-agent caps leave free workers to other agents."""
+        from macds.core.scheduler import StageScheduler
+        
+        scheduler = StageScheduler(max_workers=4, agent_limits={"Builder": 1})
+        order = []
+        tasks = [
+            asyncio.create_task(self._hold(scheduler, order, f"build-{i}", agent="Builder", duration=0.05))
+            for i in range(3)
+        ]
+        tasks.append(asyncio.create_task(self._hold(scheduler, order, "review", agent="Reviewer")))
+        await asyncio.sleep(0.01)
+        
+        status = scheduler.get_status()
+        assert status["running_by_agent"] == {"Builder": 1, "Reviewer": 1}
+        assert status["queue_depth"] == 2
+        
+        await asyncio.gather(*tasks)
+        assert order[:2] == ["build-0", "review"]
+    
+    @pytest.mark.asyncio
+    async def test_tenants_share_fairly(self):
+        """Test a tenant with a deep backlog does not monopolise the pool."""
+        from macds.core.scheduler import StageScheduler
+        
+        scheduler = StageScheduler(max_workers=2)
+        order = []
+        tasks = [
+            asyncio.create_task(self._hold(scheduler, order, f"a{i}", tenant="a"))
+            for i in range(6)
+        ]
+        await asyncio.sleep(0)
+        tasks += [
+            asyncio.create_task(self._hold(scheduler, order, f"b{i}", tenant="b"))
+            for i in range(2)
+        ]
+        await asyncio.gather(*tasks)
+        
+        # Tenant b arrived behind a's backlog but gets every other slot
+        assert order.index("b1") < order.index("a4")
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test cancelling a queued stage frees its place."""
+        from macds.core.scheduler import StageScheduler
+        
+        scheduler = StageScheduler(max_workers=1)
+        order = []
+        blocker = asyncio.create_task(self._hold(scheduler, order, "first"))
+        waiter = asyncio.create_task(self._hold(scheduler, order, "cancelled"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await blocker
+        
+        assert order == ["first"]
+        assert scheduler.get_status()["queue_depth"] == 0
+        assert scheduler.get_status()["running"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_workflows_share_orchestrator_pool(self, make_orchestrator):
+        """Test concurrent workflows are bounded by the shared pool."""
+        from macds.core.orchestrator import WorkflowStage as S
+        from macds.core.scheduler import StageScheduler
+        
+        shared = StubAgent("Shared")
+        orchestrator = make_orchestrator([shared], scheduler=StageScheduler(max_workers=2))
+        workflow = [(S.REVIEW, "Shared", []), (S.BUILD_TEST, "Shared", [])]
+        results = await asyncio.gather(*[
+            orchestrator.run_workflow("x", workflow=workflow, tenant=f"t{i}")
+            for i in range(3)
+        ])
+        
+        assert all(r.success for r in results)
+        assert shared.max_running == 2
+        status = orchestrator.get_workflow_status(results[-1].workflow_id)
+        assert status["queue"]["queued_stages"] == 0
+        assert status["wait_seconds"] > 0
+        assert orchestrator.get_queue_status()["granted"] == 6
+
+
+class TestStageCache:
+    """Test content-addressed stage result caching."""
+    
+    @pytest.mark.asyncio
+    async def test_repeat_request_uses_cache(self, temp_dir, make_orchestrator):
+        """Test identical stages are served from the cache."""
+        from macds.core.orchestrator import WorkflowStage as S
+        from macds.core.stage_cache import StageCache
+        
+        req = StubAgent("Req")
+        arch = StubAgent("Arch")
+        cache = StageCache(temp_dir / "cache")
+        orchestrator = make_orchestrator([req, arch], stage_cache=cache)
+        workflow = [(S.REQUIREMENTS, "Req", []), (S.ARCHITECTURE, "Arch", [S.REQUIREMENTS])]
+        
+        first = await orchestrator.run_workflow("build a parser", workflow=workflow)
+        second = await orchestrator.run_workflow("build a parser", workflow=workflow)
+        third = await orchestrator.run_workflow("build a lexer", workflow=workflow)
+        
+        assert (first.cache_hits, first.cache_misses) == (0, 2)
+        assert (second.cache_hits, second.cache_misses) == (2, 0)
+        assert second.success and second.stages_completed == [S.REQUIREMENTS, S.ARCHITECTURE]
+        # Requirements input changed; architecture input (upstream output) did not
+        assert (third.cache_hits, third.cache_misses) == (1, 1)
+        assert (req.calls, arch.calls) == (2, 1)
+        
+        # Entries survive a restart
+        assert len(StageCache(temp_dir / "cache")) == 3
+    
+    def test_key_ignores_request_id_and_timestamp(self):
+        """Test per-run fields do not change the key."""
+        from macds.core.stage_cache import stage_key
+        from macds.agents.base import AgentConfig
+        from macds.core.contracts import BuildTestInput
+        
+        config = AgentConfig(name="BuildTestAgent", authority_level=5)
+        a = BuildTestInput(request_id="a", source_files=["x.py"], test_files=[])
+        b = BuildTestInput(request_id="b", source_files=["x.py"], test_files=[])
+        c = BuildTestInput(request_id="c", source_files=["y.py"], test_files=[])
+        
+        assert stage_key("BuildTestAgent", config, a) == stage_key("BuildTestAgent", config, b)
+        assert stage_key("BuildTestAgent", config, a) != stage_key("BuildTestAgent", config, c)
+        hotter = AgentConfig(name="BuildTestAgent", authority_level=5, temperature=1.0)
+        assert stage_key("BuildTestAgent", config, a) != stage_key("BuildTestAgent", hotter, a)
+    
+    def test_lru_eviction(self, temp_dir):
+        """Test the size bound evicts the least recently used entries."""
+        from macds.core.stage_cache import StageCache
+        
+        cache = StageCache(temp_dir / "cache", max_bytes=3000)
+        for key in ("a", "b", "c"):
+            cache.put(key, "x" * 900)
+        cache.get("a")
+        cache.put("d", "x" * 900)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 900
+        assert cache.get_stats()["evictions"] == 1
+        assert sorted(p.stem for p in (temp_dir / "cache").glob("*.pkl")) == ["a", "c", "d"]
+
+
+class SimulatedCrash(BaseException):
+    """Stands in for the process dying mid-stage."""
+
+
+class CrashingAgent(StubAgent):
+    """Stub agent that takes the whole process down on its first call."""
+    
+    async def execute(self, input_data):
+        if self.calls == 0:
+            self.calls += 1
+            raise SimulatedCrash()
+        return await super().execute(input_data)
+
+
+class TestCheckpointing:
+    """Test workflow checkpoints and resume."""
+    
+    def _workflow(self):
+        from macds.core.orchestrator import WorkflowStage as S
+        return [
+            (S.REQUIREMENTS, "Req", []),
+            (S.ARCHITECTURE, "Arch", [S.REQUIREMENTS]),
+            (S.IMPLEMENTATION, "Impl", [S.ARCHITECTURE])
+        ]
+    
+    def _checkpoints(self, temp_dir):
+        from macds.core.checkpoint import CheckpointStore
+        return CheckpointStore(temp_dir / "checkpoints")
+    
+    @pytest.mark.asyncio
+    async def test_resume_after_crash_skips_completed_stages(self, temp_dir, make_orchestrator):
+        """Test a crash mid-workflow resumes from the first unfinished stage."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        req, arch = StubAgent("Req"), CrashingAgent("Arch")
+        crashed = make_orchestrator(
+            [req, arch, StubAgent("Impl")],
+            checkpoints=self._checkpoints(temp_dir)
+        )
+        with pytest.raises(SimulatedCrash):
+            await crashed.run_workflow("x", workflow=self._workflow())
+        
+        # A fresh orchestrator (new process) finds the interrupted workflow
+        agents = [StubAgent(name) for name in ("Req", "Arch", "Impl")]
+        orchestrator = make_orchestrator(agents, checkpoints=self._checkpoints(temp_dir))
+        pending = orchestrator.checkpoints.list_workflows()
+        assert len(pending) == 1
+        
+        result = await orchestrator.resume_workflow(pending[0])
+        
+        assert result.success
+        assert result.workflow_id == pending[0]
+        assert result.stages_completed == [S.REQUIREMENTS, S.ARCHITECTURE, S.IMPLEMENTATION]
+        assert [a.calls for a in agents] == [0, 1, 1]
+        assert "requirements" in result.outputs
+        assert orchestrator.checkpoints.list_workflows() == []
+    
+    @pytest.mark.asyncio
+    async def test_resume_failed_workflow_retries_failed_stage(self, temp_dir, make_orchestrator):
+        """Test resuming a failed workflow keeps completed outputs."""
+        req, impl = StubAgent("Req"), StubAgent("Impl")
+        failing = StubAgent("Arch", fail_times=5)
+        orchestrator = make_orchestrator(
+            [req, failing, impl],
+            checkpoints=self._checkpoints(temp_dir)
+        )
+        failed = await orchestrator.run_workflow("x", workflow=self._workflow())
+        assert not failed.success
+        
+        orchestrator.register_agent(StubAgent("Arch"))
+        result = await orchestrator.resume_workflow(failed.workflow_id)
+        
+        assert result.success
+        assert (req.calls, impl.calls) == (1, 1)
+    
+    @pytest.mark.asyncio
+    async def test_resume_unknown_workflow(self, temp_dir, make_orchestrator):
+        """Test resuming without a checkpoint raises."""
+        orchestrator = make_orchestrator(checkpoints=self._checkpoints(temp_dir))
+        with pytest.raises(ValueError):
+            await orchestrator.resume_workflow("missing")
+    
+    @pytest.mark.asyncio
+    async def test_finished_checkpoints_are_capped(self, temp_dir, make_orchestrator):
+        """Test only the newest finished checkpoints are kept."""
+        from macds.core.checkpoint import CheckpointStore
+        
+        orchestrator = make_orchestrator(
+            [StubAgent(n) for n in ("Req", "Arch", "Impl")],
+            checkpoints=CheckpointStore(temp_dir / "checkpoints", max_finished=2)
+        )
+        results = [await orchestrator.run_workflow("x", workflow=self._workflow()) for _ in range(3)]
+        
+        store = orchestrator.checkpoints
+        assert store.list_workflows() == []
+        assert store.list_workflows(include_finished=True) == sorted(r.workflow_id for r in results[1:])
+        assert store.load(results[0].workflow_id) is None
+        assert store.load(results[2].workflow_id).finished
+
+
+class TestIncrementalRerun:
+    """Test dependency-tracked invalidation of completed stages."""
+    
+    @pytest.mark.asyncio
+    async def test_routed_failure_skips_unaffected_downstream(self, make_orchestrator):
+        """Test stages whose reads did not change reuse their outputs."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        impl = StubAgent("Impl")
+        review = StubAgent("Review", delay=0.01)
+        build = StubAgent("Build", fail_times=1, delay=0.05)
+        orchestrator = make_orchestrator([impl, review, build])
+        result = await orchestrator.run_workflow("x", workflow=[
+            (S.IMPLEMENTATION, "Impl", []),
+            (S.REVIEW, "Review", [S.IMPLEMENTATION]),
+            (S.BUILD_TEST, "Build", [S.IMPLEMENTATION])
+        ])
+        
+        # Implementation re-ran with identical output, so review is reused
+        assert result.success
+        assert (impl.calls, review.calls, build.calls) == (2, 1, 2)
+        assert result.stages_reused == [S.REVIEW]
+    
+    @pytest.mark.asyncio
+    async def test_revised_request_reruns_affected_subgraph(self, temp_dir, make_orchestrator):
+        """Test a changed request only re-executes stages that read it."""
+        from types import SimpleNamespace
+        from macds.core.orchestrator import WorkflowStage as S
+        from macds.core.checkpoint import CheckpointStore
+        
+        canned = SimpleNamespace(
+            requirements=[{"id": "R1", "description": "parse"}], constraints=[],
+            components=[], invariants=[], api_contracts=[], files_created=[]
+        )
+        agents = [StubAgent(name, output=canned) for name in ("Req", "Arch", "Impl", "Review")]
+        orchestrator = make_orchestrator(
+            agents, checkpoints=CheckpointStore(temp_dir / "checkpoints")
+        )
+        first = await orchestrator.run_workflow("build a parser", workflow=[
+            (S.REQUIREMENTS, "Req", []),
+            (S.ARCHITECTURE, "Arch", [S.REQUIREMENTS]),
+            (S.IMPLEMENTATION, "Impl", [S.ARCHITECTURE]),
+            (S.REVIEW, "Review", [S.IMPLEMENTATION])
+        ])
+        
+        revised = await orchestrator.revise_workflow(first.workflow_id, "build a fast parser")
+        
+        # Requirements and implementation read the request; their outputs are
+        # unchanged so architecture and review are reused
+        assert revised.success
+        assert [a.calls for a in agents] == [2, 1, 2, 1]
+        assert revised.stages_reused == [S.ARCHITECTURE, S.REVIEW]
+        assert len(revised.stages_completed) == 4
+
+
+class SubprocessAgent(StubAgent):
+    """Stub agent whose work is a long-running child process."""
+    
+    def __init__(self, name, pid_file):
+        super().__init__(name)
+        self.pid_file = pid_file
+    
+    async def execute(self, input_data):
+        from macds.execution.process import run_command
+        
+        self.calls += 1
+        await run_command(f"echo $$ > {self.pid_file}; exec sleep 30")
+
+
+class TestWorkflowTimeouts:
+    """Test stage/workflow time budgets and cancellation."""
+    
+    @pytest.mark.asyncio
+    async def test_stage_timeout_fails_stage(self, make_orchestrator):
+        """Test a hung stage fails once its budget is spent."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        hung = StubAgent("Req", delay=30)
+        orchestrator = make_orchestrator([hung], stage_timeouts={S.REQUIREMENTS: 0.1})
+        result = await orchestrator.run_workflow("x", workflow=[(S.REQUIREMENTS, "Req", [])])
+        
+        assert not result.success
+        assert result.stages_failed == [S.REQUIREMENTS]
+        assert "timed out" in orchestrator.get_workflow_status(result.workflow_id)["tasks"][0]["error"]
+        assert result.duration_seconds < 1
+    
+    @pytest.mark.asyncio
+    async def test_workflow_timeout_records_partial_result(self, make_orchestrator):
+        """Test the workflow budget cancels remaining stages."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        quick = StubAgent("Req", delay=0.01)
+        slow = StubAgent("Arch", delay=30)
+        orchestrator = make_orchestrator([quick, slow])
+        result = await orchestrator.run_workflow("x", timeout=0.2, workflow=[
+            (S.REQUIREMENTS, "Req", []),
+            (S.ARCHITECTURE, "Arch", [S.REQUIREMENTS]),
+            (S.IMPLEMENTATION, "Arch", [S.ARCHITECTURE])
+        ])
+        
+        assert not result.success
+        assert result.cancel_reason.startswith("Workflow timed out")
+        assert result.stages_completed == [S.REQUIREMENTS]
+        assert result.stages_cancelled == [S.ARCHITECTURE, S.IMPLEMENTATION]
+        assert "requirements" in result.outputs
+        assert slow.running == 0
+        assert orchestrator.get_queue_status()["running"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancel_workflow_kills_subprocess(self, temp_dir, make_orchestrator):
+        """Test cancel_workflow stops running stages and their processes."""
+        import os
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        pid_file = temp_dir / "child.pid"
+        orchestrator = make_orchestrator([SubprocessAgent("Build", pid_file)])
+        run = asyncio.create_task(
+            orchestrator.run_workflow("x", workflow=[(S.BUILD_TEST, "Build", [])])
+        )
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if pid_file.exists() and pid_file.read_text().strip():
+                break
+        workflow_id = next(iter(orchestrator._controls))
+        pid = int(pid_file.read_text())
+        
+        partial = await orchestrator.cancel_workflow(workflow_id)
+        
+        assert partial.cancel_reason == "Cancelled by request"
+        assert partial.stages_cancelled == [S.BUILD_TEST]
+        assert (await run).workflow_id == workflow_id
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+        assert await orchestrator.cancel_workflow(workflow_id) is None
+
+
+class TestTracing:
+    """Test nested spans and exporters."""
+    
+    def _agent(self, temp_dir):
+        import sys
+        from macds.agents.base import BaseAgent
+        from macds.core.contracts import RequirementsInput, RequirementsOutput
+        from macds.core.memory import MemoryStore
+        from macds.core.evaluation import EvaluationSystem
+        from macds.execution.process import run_command
+        
+        class CompileAgent(BaseAgent):
+            name = "CompileAgent"
+            system_prompt = ""
+            input_contract = RequirementsInput
+            output_contract = RequirementsOutput
+            
+            async def _execute_impl(self, input_data):
+                await run_command([sys.executable, "-c", "pass"])
+                return RequirementsOutput(
+                    request_id=input_data.request_id,
+                    requirements=[{"id": "R1", "description": "compile"}],
+                    acceptance_criteria=[],
+                    constraints=[]
+                )
+        
+        return CompileAgent(
+            memory_store=MemoryStore(temp_dir / "memory"),
+            evaluation=EvaluationSystem(temp_dir / "evaluation")
+        )
+    
+    @pytest.mark.asyncio
+    async def test_workflow_spans_nest(self, temp_dir, tracer, make_orchestrator):
+        """Test workflow -> stage -> agent.execute -> operation spans."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        collector = tracer.exporters[0]
+        orchestrator = make_orchestrator([self._agent(temp_dir)])
+        result = await orchestrator.run_workflow("x", workflow=[(S.REQUIREMENTS, "CompileAgent", [])])
+        assert result.success
+        
+        [workflow] = collector.find("workflow")
+        [stage] = [s for s in collector.children(workflow) if s.name == "stage"]
+        [execute] = collector.children(stage)
+        assert workflow.parent_id is None
+        assert workflow.attributes["workflow_id"] == result.workflow_id
+        assert workflow.attributes["success"] is True
+        assert (stage.name, stage.attributes["stage"]) == ("stage", "requirements")
+        assert execute.name == "agent.execute"
+        
+        operations = [s.name for s in collector.children(execute)]
+        assert operations.count("contract.validate") == 2
+        assert "memory.store" in operations
+        assert "subprocess" in operations
+        subtree = [stage, execute, *collector.children(execute)]
+        assert all(s.trace_id == workflow.trace_id for s in subtree)
+        assert stage.start_time >= workflow.start_time and stage.end_time <= workflow.end_time
+    
+    def test_exporters_write_files(self, temp_dir, tracer):
+        """Test JSON lines and Chrome trace-event output."""
+        from macds.core.tracing import span
+        
+        with span("outer", size=3):
+            with pytest.raises(ValueError):
+                with span("inner"):
+                    raise ValueError("boom")
+        tracer.close()
+        
+        lines = [json.loads(l) for l in (temp_dir / "trace.jsonl").read_text().splitlines()]
+        assert [l["name"] for l in lines] == ["inner", "outer"]
+        assert lines[0]["status"] == "error"
+        assert lines[0]["parent_id"] == lines[1]["span_id"]
+        
+        events = json.loads((temp_dir / "trace.json").read_text())["traceEvents"]
+        assert {e["name"] for e in events} == {"inner", "outer"}
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+        assert next(e for e in events if e["name"] == "outer")["args"]["size"] == 3
+    
+    def test_disabled_tracing_is_noop(self):
+        """Test spans without an installed tracer record nothing."""
+        from macds.core.tracing import span, current_span, get_tracer
+        
+        assert not get_tracer().enabled
+        with span("ignored") as s:
+            s.set_attribute("k", 1)
+            assert current_span() is None
+
+
+class TestWorkflowEvents:
+    """Test streaming workflow progress events."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_stage_events(self, make_orchestrator):
+        """Test a streamed workflow reports every stage and ends with the result."""
+        from macds.core.events import EventType
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        orchestrator = make_orchestrator([StubAgent("A", delay=0.01)])
+        received = [
+            event async for event in orchestrator.stream_workflow("x", workflow=[
+                (S.REQUIREMENTS, "A", []),
+                (S.ARCHITECTURE, "A", [S.REQUIREMENTS])
+            ])
+        ]
+        
+        assert [(e.type, e.stage) for e in received] == [
+            (EventType.WORKFLOW_STARTED, None),
+            (EventType.STAGE_STARTED, "requirements"),
+            (EventType.STAGE_COMPLETED, "requirements"),
+            (EventType.STAGE_STARTED, "architecture"),
+            (EventType.STAGE_COMPLETED, "architecture"),
+            (EventType.WORKFLOW_FINISHED, None)
+        ]
+        assert received[-1].result.success
+        json.dumps([e.to_dict() for e in received])
+    
+    @pytest.mark.asyncio
+    async def test_failure_retry_and_artifact_events(self, make_orchestrator):
+        """Test failures, routed retries and artifact writes are reported."""
+        from macds.core.artifacts import ArtifactType
+        from macds.core.events import EventType
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        class WritingAgent(StubAgent):
+            async def execute(self, input_data):
+                orchestrator.artifact_store.create(
+                    f"impl-{self.calls}.py", "pass", ArtifactType.SOURCE_CODE, self.name
+                )
+                return await super().execute(input_data)
+        
+        impl = WritingAgent("Impl", delay=0.01)
+        review = StubAgent("Review", delay=0.01, fail_times=1)
+        orchestrator = make_orchestrator([impl, review])
+        received = [
+            event async for event in orchestrator.stream_workflow("x", workflow=[
+                (S.IMPLEMENTATION, "Impl", []),
+                (S.REVIEW, "Review", [S.IMPLEMENTATION])
+            ])
+        ]
+        
+        def by_type(event_type):
+            return [e for e in received if e.type == event_type]
+        
+        assert [e.stage for e in by_type(EventType.STAGE_FAILED)] == ["review"]
+        retry = by_type(EventType.RETRY_SCHEDULED)[0]
+        assert (retry.stage, retry.data["target"]) == ("review", "implementation")
+        artifacts = by_type(EventType.ARTIFACT_WRITTEN)
+        assert [e.stage for e in artifacts] == ["implementation", "implementation"]
+        assert artifacts[0].data["artifact"] == "impl-0.py"
+        assert received[-1].result.success
+    
+    @pytest.mark.asyncio
+    async def test_slow_consumer_applies_backpressure(self, make_orchestrator):
+        """Test a full channel pauses the workflow until the consumer reads."""
+        from macds.core.events import EventType
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        agent = StubAgent("A", delay=0)
+        orchestrator = make_orchestrator([agent])
+        stream = orchestrator.stream_workflow("x", max_buffered=1, workflow=[
+            (S.REQUIREMENTS, "A", []),
+            (S.ARCHITECTURE, "A", [S.REQUIREMENTS]),
+            (S.IMPLEMENTATION, "A", [S.ARCHITECTURE])
+        ])
+        
+        first = await stream.__anext__()
+        await asyncio.sleep(0.2)
+        assert first.type == EventType.WORKFLOW_STARTED
+        assert agent.calls < 3
+        
+        rest = [event async for event in stream]
+        assert agent.calls == 3
+        assert rest[-1].result.success
+    
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_workflow(self, make_orchestrator):
+        """Test abandoning the stream cancels the workflow it started."""
+        from macds.core.events import EventType
+        from macds.core.orchestrator import WorkflowStage as S, TaskStatus
+        
+        orchestrator = make_orchestrator([StubAgent("A", delay=0.5)])
+        stream = orchestrator.stream_workflow("x", workflow=[(S.REQUIREMENTS, "A", [])])
+        
+        started = await stream.__anext__()
+        await stream.aclose()
+        
+        assert started.type == EventType.WORKFLOW_STARTED
+        status = orchestrator.get_workflow_status(started.workflow_id)
+        assert status["tasks"][0]["status"] == TaskStatus.CANCELLED.value
+        assert not orchestrator._event_buses
+
+
+class TestWorkflowRetention:
+    """Test bounded retention and archiving of finished workflows."""
+    
+    def _retention(self, temp_dir, **kwargs):
+        from macds.core.retention import WorkflowArchive, WorkflowRetention
+        
+        return WorkflowRetention(archive=WorkflowArchive(temp_dir / "archive"), **kwargs)
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction_archives_workflow(self, temp_dir, make_orchestrator):
+        """Test workflows beyond max_finished are archived and still queryable."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        orchestrator = make_orchestrator(
+            [StubAgent("A", delay=0)],
+            retention=self._retention(temp_dir, max_finished=2)
+        )
+        workflow = [(S.REQUIREMENTS, "A", [])]
+        first = await orchestrator.run_workflow("x", workflow=workflow)
+        second = await orchestrator.run_workflow("x", workflow=workflow)
+        orchestrator.get_workflow_status(first.workflow_id)  # Now most recently used
+        third = await orchestrator.run_workflow("x", workflow=workflow)
+        
+        assert orchestrator.retention.get_stats()["finished"] == 2
+        assert orchestrator.retention.get(second.workflow_id) is None
+        
+        status = orchestrator.get_workflow_status(second.workflow_id)
+        assert status["archived"]
+        assert status["progress"] == 1.0
+        assert status["tasks"][0]["status"] == "completed"
+        assert not orchestrator.get_workflow_status(third.workflow_id)["archived"]
+    
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, temp_dir, make_orchestrator):
+        """Test finished workflows leave memory after the TTL."""
+        from macds.core.orchestrator import WorkflowStage as S
+        from macds.core.retention import WorkflowRetention
+        
+        orchestrator = make_orchestrator(
+            [StubAgent("A", delay=0)],
+            retention=self._retention(temp_dir, ttl_seconds=0)
+        )
+        result = await orchestrator.run_workflow("x", workflow=[(S.REQUIREMENTS, "A", [])])
+        
+        assert orchestrator.retention.get(result.workflow_id) is None
+        assert orchestrator.get_workflow_status(result.workflow_id)["archived"]
+        
+        # Without an archive, evicted workflows are forgotten
+        orchestrator.retention = WorkflowRetention(ttl_seconds=0)
+        result = await orchestrator.run_workflow("x", workflow=[(S.REQUIREMENTS, "A", [])])
+        assert orchestrator.get_workflow_status(result.workflow_id) is None
+    
+    @pytest.mark.asyncio
+    async def test_escalations_scoped_per_workflow(self, temp_dir, make_orchestrator):
+        """Test a workflow reports only its own escalations, even once archived."""
+        from macds.core.orchestrator import WorkflowStage as S
+        
+        class EscalatingAgent(StubAgent):
+            async def execute(self, input_data):
+                await orchestrator.escalate_conflict(f"topic {self.calls}", [self.name], [])
+                return await super().execute(input_data)
+        
+        orchestrator = make_orchestrator(
+            [EscalatingAgent("A", delay=0)],
+            retention=self._retention(temp_dir, max_finished=1)
+        )
+        workflow = [(S.REQUIREMENTS, "A", [])]
+        first = await orchestrator.run_workflow("x", workflow=workflow)
+        second = await orchestrator.run_workflow("x", workflow=workflow)
+        
+        assert [e["topic"] for e in first.escalations] == ["topic 0"]
+        assert [e["topic"] for e in second.escalations] == ["topic 1"]
+        
+        conflict_id = first.escalations[0]["conflict_id"]
+        assert not await orchestrator.resolve_conflict(conflict_id, {"decision": "keep"})
+        assert await orchestrator.resolve_conflict(
+            conflict_id, {"decision": "keep"}, workflow_id=first.workflow_id
+        )
+        archived = orchestrator.get_workflow_status(first.workflow_id)
+        assert archived["escalations"][0]["resolution"] == {"decision": "keep"}
+        
+        # Late escalations of an archived workflow go to its archived status
+        await orchestrator.escalate_conflict("late", ["A"], [], workflow_id=first.workflow_id)
+        archived = orchestrator.get_workflow_status(first.workflow_id)
+        assert [e["topic"] for e in archived["escalations"]] == ["topic 0", "late"]
+        assert orchestrator.retention.escalations() == []
+    
+    def test_archive_is_capped(self, temp_dir):
+        """Test the archive keeps only the newest max_workflows files."""
+        import os
+        from macds.core.retention import WorkflowArchive
+        
+        archive = WorkflowArchive(temp_dir / "archive", max_workflows=2, ttl_seconds=None)
+        for i, workflow_id in enumerate(["a", "b", "c"]):
+            archive.save(workflow_id, {"workflow_id": workflow_id})
+            os.utime(archive._path(workflow_id), (i, i))  # Distinct ages
+        archive.save("d", {"workflow_id": "d"})
+        assert archive.list_workflows() == ["c", "d"]
+        
+        archive.ttl_seconds = 0
+        archive.prune()
+        assert archive.list_workflows() == []
+
+
+class TestWorkQueue:
+    """Test the SQLite work queue and queue workers."""
+    
+    def _input(self, n=0):
+        from macds.core.contracts import RequirementsInput
+        
+        return RequirementsInput(request_id=f"job-{n}", user_request="Build a user API")
+    
+    def test_claim_complete_result(self, temp_dir):
+        """Test a job's lifecycle from enqueue to result."""
+        from macds.core.work_queue import WorkQueue
+        
+        queue = WorkQueue(temp_dir / "queue.db")
+        job_id = queue.enqueue("ProductAgent", self._input(), stage="requirements")
+        
+        job = queue.claim("w1")
+        assert (job.id, job.attempts, job.input_data.request_id) == (job_id, 1, "job-0")
+        assert queue.claim("w2") is None
+        assert not queue.complete(job_id, "w2", "stolen")
+        assert queue.complete(job_id, "w1", {"ok": True})
+        assert queue.result(job_id) == {"ok": True}
+        assert queue.get_stats()["done"] == 1
+    
+    def test_expired_lease_is_retried_then_failed(self, temp_dir):
+        """Test jobs of dead workers are re-claimed until attempts run out."""
+        from macds.core.work_queue import WorkQueue, JobFailedError
+        
+        queue = WorkQueue(temp_dir / "queue.db")
+        job_id = queue.enqueue("ProductAgent", self._input(), max_attempts=2)
+        
+        assert queue.claim("w1", lease_seconds=0).attempts == 1
+        retried = queue.claim("w2", lease_seconds=0)
+        assert (retried.id, retried.attempts) == (job_id, 2)
+        assert not queue.heartbeat(job_id, "w1")  # w1 lost its lease
+        
+        assert queue.claim("w3") is None
+        with pytest.raises(JobFailedError, match="Lease expired"):
+            queue.result(job_id)
+    
+    @pytest.mark.asyncio
+    async def test_workflow_runs_on_queue_worker(self, temp_dir, memory_store, evaluation_system):
+        """Test an orchestrator executes stages through a worker."""
+        from macds.agents.product import ProductAgent  # noqa: F401 - registers the agent
+        from macds.agents.architect import ArchitectAgent  # noqa: F401
+        from macds.core.orchestrator import Orchestrator, WorkflowStage as S
+        from macds.core.artifacts import ArtifactStore
+        from macds.core.queue_worker import QueueWorker
+        from macds.core.work_queue import WorkQueue
+        
+        queue = WorkQueue(temp_dir / "queue.db")
+        orchestrator = Orchestrator(
+            memory_store=memory_store,
+            evaluation=evaluation_system,
+            artifact_store=ArtifactStore(temp_dir),
+            work_queue=queue
+        )
+        orchestrator.register_agent(StubAgent("ProductAgent", fail_times=9))  # Fails if run locally
+        worker = QueueWorker(
+            temp_dir / "queue.db", memory_store=memory_store, evaluation=evaluation_system,
+            poll_interval=0.01
+        )
+        stop = asyncio.Event()
+        serving = asyncio.create_task(worker.run(stop))
+        
+        result = await orchestrator.run_workflow("Build a user API", workflow=[
+            (S.REQUIREMENTS, "ProductAgent", []),
+            (S.ARCHITECTURE, "ArchitectAgent", [S.REQUIREMENTS])
+        ])
+        stop.set()
+        await serving
+        
+        assert result.success
+        assert worker.completed == 2
+        assert len(result.outputs["architecture"].components) > 0
+        assert queue.get_stats() == {s: 0 for s in ("pending", "leased", "done", "failed", "cancelled")}
+    
+    def test_worker_processes(self, temp_dir):
+        """Test separate worker processes drain a shared queue."""
+        from macds.core.queue_worker import start_workers
+        from macds.core.work_queue import WorkQueue
+        
+        queue = WorkQueue(temp_dir / "queue.db")
+        job_ids = [queue.enqueue("ProductAgent", self._input(n)) for n in range(6)]
+        
+        async def wait_all():
+            return await asyncio.gather(*(queue.wait(job_id) for job_id in job_ids))
+        
+        processes = start_workers(2, temp_dir / "queue.db", storage_dir=temp_dir)
+        try:
+            outputs = asyncio.run(asyncio.wait_for(wait_all(), timeout=60))
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join(timeout=30)
+        
+        assert [o.request_id for o in outputs] == [f"job-{n}" for n in range(6)]
+        assert all(process.exitcode == 0 for process in processes)
+
+
+class TestProcessOffload:
+    """Test running CPU-bound agent helpers in the process pool."""
+    
+    def _review_input(self):
+        from macds.core.contracts import CodeReviewInput
+        
+        return CodeReviewInput(
+            request_id="offload-001",
+            code_diff="+def hello():\n+    print('hello')\n+    password = 'x'\n" * 50,
+            architecture_constraints=["No circular dependencies"],
+            coding_standards="PEP 8"
+        )
+    
+    @pytest.mark.asyncio
+    async def test_process_mode_matches_inline(self, memory_store, evaluation_system):
+        """Test a review gives the same result in both execution modes."""
+        from macds.agents.base import AgentConfig
+        from macds.agents.reviewer import ReviewerAgent
+        from macds.execution.pool import shutdown_process_pool
+        
+        inline = ReviewerAgent(memory_store=memory_store, evaluation=evaluation_system)
+        offloaded = ReviewerAgent(
+            config=AgentConfig(name="ReviewerAgent", authority_level=7, execution_mode="process"),
+            memory_store=memory_store,
+            evaluation=evaluation_system
+        )
+        
+        expected = await inline.execute(self._review_input())
+        try:
+            output = await offloaded.execute(self._review_input())
+        finally:
+            shutdown_process_pool()
+        
+        assert output.verdict == expected.verdict
+        assert output.violations == expected.violations
+        assert output.security_concerns == expected.security_concerns
+        assert output.quality_score == expected.quality_score
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, memory_store, evaluation_system):
+        """Test the loop keeps running while an offloaded helper burns CPU."""
+        import asyncio
+        from macds.agents.base import AgentConfig
+        from macds.agents.reviewer import ReviewerAgent
+        from macds.execution.pool import run_in_process, shutdown_process_pool
+        
+        agent = ReviewerAgent(
+            config=AgentConfig(name="ReviewerAgent", authority_level=7, execution_mode="process"),
+            memory_store=memory_store,
+            evaluation=evaluation_system
+        )
+        review = self._review_input()
+        review.code_diff *= 2000
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        try:
+            await run_in_process(len, "warm up")
+            task = asyncio.create_task(ticker())
+            start = asyncio.get_running_loop().time()
+            await agent.run_cpu_bound(agent._review_diff, review)
+            elapsed = asyncio.get_running_loop().time() - start
+            task.cancel()
+        finally:
+            shutdown_process_pool()
+        
+        assert ticks >= elapsed / 0.01 * 0.5
+    
+    def test_unknown_execution_mode(self, memory_store, evaluation_system):
+        """Test an unknown execution mode is rejected."""
+        from macds.agents.base import AgentConfig
+        from macds.agents.reviewer import ReviewerAgent
+        
+        with pytest.raises(ValueError):
+            ReviewerAgent(
+                config=AgentConfig(name="ReviewerAgent", authority_level=7, execution_mode="gpu"),
+                memory_store=memory_store,
+                evaluation=evaluation_system
+            )
+
+
+class TestBenchmark:
+    """Test the orchestration benchmark package."""
+    
+    def test_dag_shapes(self):
+        """Test generated DAGs have the expected depth."""
+        from macds.bench import build_workflow, critical_path_length
+        
+        assert critical_path_length(build_workflow("chain")) == 7
+        assert critical_path_length(build_workflow("chain", 3)) == 3
+        assert critical_path_length(build_workflow("fanout")) == 3
+        assert critical_path_length(build_workflow("diamond")) == 5
+        with pytest.raises(ValueError):
+            build_workflow("ring")
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        from macds.bench import percentile
+        
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_run_benchmark(self, temp_dir):
+        """Test a small scenario reports throughput, latency and overhead."""
+        from macds.bench import BenchmarkConfig, run_benchmark
+        
+        config = BenchmarkConfig(shape="diamond", workflows=4, concurrency=2, latency_ms=1, warmup=1)
+        result = await run_benchmark(config, work_dir=temp_dir)
+        
+        assert result["failures"] == 0
+        assert result["stages"] == 7
+        assert result["throughput_wps"] > 0
+        assert result["latency_ms"]["p99"] >= result["latency_ms"]["p50"] >= result["ideal_latency_ms"]
+        assert set(result["overhead_ms"]) == {"mean", "p50", "p90", "p99", "max"}
+        json.dumps(result)
+
+
 # ==================== Integration Tests ====================
 
 class TestIntegration: